@@ -0,0 +1,53 @@
+"""Added composite and partial indexes on threat_logs
+
+Revision ID: 5c8d2e7f1a36
+Revises: e41b0ce89ba3
+Create Date: 2026-10-18 10:12:41.582307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c8d2e7f1a36'
+down_revision: Union[str, None] = 'e41b0ce89ba3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    # ✅ e41b0ce89ba3 dropped threat_logs while the model still uses it; recreate it if missing
+    if not inspector.has_table('threat_logs'):
+        op.create_table('threat_logs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('severity', sa.String(), nullable=False),
+        sa.Column('source_ip', sa.String(), nullable=False),
+        sa.Column('is_alert', sa.Boolean(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('resolved', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_threat_logs_id', 'threat_logs', ['id'], unique=False)
+    elif 'resolved' not in {column['name'] for column in inspector.get_columns('threat_logs')}:
+        op.add_column('threat_logs', sa.Column('resolved', sa.Boolean(), nullable=True))
+
+    op.create_index('ix_threat_logs_timestamp_severity', 'threat_logs', ['timestamp', 'severity'], unique=False)
+    op.create_index('ix_threat_logs_type_timestamp', 'threat_logs', ['type', 'timestamp'], unique=False)
+    op.create_index('ix_threat_logs_timestamp_id', 'threat_logs', ['timestamp', 'id'], unique=False)
+    op.create_index(
+        'ix_threat_logs_active_alerts', 'threat_logs', ['timestamp'], unique=False,
+        postgresql_where=sa.text('is_alert'), sqlite_where=sa.text('is_alert'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_threat_logs_active_alerts', table_name='threat_logs')
+    op.drop_index('ix_threat_logs_timestamp_id', table_name='threat_logs')
+    op.drop_index('ix_threat_logs_type_timestamp', table_name='threat_logs')
+    op.drop_index('ix_threat_logs_timestamp_severity', table_name='threat_logs')
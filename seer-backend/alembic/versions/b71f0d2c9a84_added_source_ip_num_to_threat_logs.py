@@ -0,0 +1,43 @@
+"""Added integer source_ip_num to threat_logs
+
+Revision ID: b71f0d2c9a84
+Revises: 9e4b7a1c3d58
+Create Date: 2026-10-18 12:26:05.918442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71f0d2c9a84'
+down_revision: Union[str, None] = '9e4b7a1c3d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('threat_logs', sa.Column('source_ip_num', sa.BigInteger(), nullable=True))
+    # ✅ Backfill IPv4 rows; inet - '0.0.0.0' yields the address as a bigint
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        octet = '(25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])'
+        op.execute(
+            "UPDATE threat_logs SET source_ip_num = source_ip::inet - '0.0.0.0'::inet "
+            f"WHERE source_ip ~ '^({octet}\\.){{3}}{octet}$'"
+        )
+    else:
+        from app.core.ipv4 import ip_to_int
+        rows = bind.execute(sa.text('SELECT id, source_ip FROM threat_logs')).all()
+        updates = [{'id': row_id, 'num': ip_to_int(ip)} for row_id, ip in rows]
+        updates = [update for update in updates if update['num'] is not None]
+        if updates:
+            bind.execute(sa.text('UPDATE threat_logs SET source_ip_num = :num WHERE id = :id'), updates)
+    op.create_index(op.f('ix_threat_logs_source_ip_num'), 'threat_logs', ['source_ip_num'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_threat_logs_source_ip_num'), table_name='threat_logs')
+    op.drop_column('threat_logs', 'source_ip_num')
@@ -0,0 +1,67 @@
+"""Create audit_logs if missing and null its targets on delete
+
+Revision ID: f5a2c7d9e413
+Revises: d3a6f8e2b190
+Create Date: 2026-10-18 16:05:27.914036
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a2c7d9e413'
+down_revision: Union[str, None] = 'd3a6f8e2b190'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TARGET_FOREIGN_KEYS = (
+    ('target_user_id', 'users'),
+    ('target_role_id', 'roles'),
+    ('target_permission_id', 'permissions'),
+)
+
+
+def _reset_target_foreign_keys(ondelete: Union[str, None]) -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = {
+        tuple(fk['constrained_columns']): fk['name'] for fk in inspector.get_foreign_keys('audit_logs')
+    }
+    with op.batch_alter_table('audit_logs') as batch_op:
+        for column, table in TARGET_FOREIGN_KEYS:
+            name = f'audit_logs_{column}_fkey'
+            if existing.get((column,)):
+                batch_op.drop_constraint(existing[(column,)], type_='foreignkey')
+            batch_op.create_foreign_key(name, table, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    # ✅ No earlier revision creates audit_logs; create it with the final foreign keys
+    if not inspector.has_table('audit_logs'):
+        op.create_table('audit_logs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('admin_id', sa.Integer(), nullable=False),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('target_user_id', sa.Integer(), nullable=True),
+        sa.Column('target_role_id', sa.Integer(), nullable=True),
+        sa.Column('target_permission_id', sa.Integer(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['admin_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['target_user_id'], ['users.id'], name='audit_logs_target_user_id_fkey', ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['target_role_id'], ['roles.id'], name='audit_logs_target_role_id_fkey', ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['target_permission_id'], ['permissions.id'], name='audit_logs_target_permission_id_fkey', ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_audit_logs_id', 'audit_logs', ['id'], unique=False)
+        return
+
+    # ✅ Audited roles, users and permissions must stay deletable
+    _reset_target_foreign_keys('SET NULL')
+
+
+def downgrade() -> None:
+    _reset_target_foreign_keys(None)
@@ -15,6 +15,98 @@ class Settings:
     ALGORITHM = os.getenv("ALGORITHM", "HS256")  # JWT Algorithm
     ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))  # Token expiry in minutes
 
+    # SQLAlchemy connection pool (ignored for SQLite)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))  # Seconds to wait for a connection
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+    # Async database path (SQLAlchemy asyncio + asyncpg) for the threat and auth routes
+    DB_ASYNC_ENABLED = os.getenv("DB_ASYNC_ENABLED", "false").lower() == "true"
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")  # Derived from DATABASE_URL when unset
+
+    # Streaming threat detector: CRITICAL/HIGH thresholds apply over this sliding window
+    ALERT_WINDOW_SECONDS = int(os.getenv("ALERT_WINDOW_SECONDS", 600))
+
+    # Role → permission-set cache used by require_permission (seconds)
+    PERMISSION_CACHE_TTL = float(os.getenv("PERMISSION_CACHE_TTL", 60))
+
+    # Password hashing: bcrypt cost and the dedicated, bounded hashing pool
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))  # Changing this rehashes passwords on next login
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+    PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", 16))  # Waiting jobs before 429
+
+    # Stateless JWT fast path: recently validated users are trusted for this long (seconds)
+    AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", 10000))
+    AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", 60))
+
+    # Threat risk-scoring model (trained once, then reused across requests)
+    THREAT_MODEL_PATH = os.getenv("THREAT_MODEL_PATH", str(BASE_DIR / "ml_models" / "threat_model.joblib"))
+    # "background" loads it on a thread at startup, "eager" blocks startup, "lazy" waits for the first score
+    THREAT_MODEL_PRELOAD = os.getenv("THREAT_MODEL_PRELOAD", "background").lower()
+
+    # Buffered threat ingestion (rows are flushed by size or time)
+    INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", 500))
+    INGEST_FLUSH_INTERVAL = float(os.getenv("INGEST_FLUSH_INTERVAL", 1.0))  # Seconds
+    INGEST_MAX_BUFFER = int(os.getenv("INGEST_MAX_BUFFER", 10000))  # Producers block past this
+    INGEST_SUBMIT_TIMEOUT = float(os.getenv("INGEST_SUBMIT_TIMEOUT", 0.5))  # Seconds before rejecting
+    INGEST_MAX_RETRIES = int(os.getenv("INGEST_MAX_RETRIES", 5))  # Failed flushes before a batch is dead-lettered
+    INGEST_DEAD_LETTER_PATH = os.getenv("INGEST_DEAD_LETTER_PATH", str(BASE_DIR / "ingest_dead_letter.jsonl"))
+
+    # Large list responses: projected rows serialized with orjson instead of per-row Pydantic models
+    JSON_FAST_PATH = os.getenv("JSON_FAST_PATH", "true").lower() == "true"
+
+    # Prometheus-style /metrics (per-route latency, SQL statements per request)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # Buffered audit log writer (entries spill to the fallback file while the DB is unavailable)
+    AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", 100))
+    AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", 1.0))  # Seconds
+    AUDIT_MAX_QUEUE = int(os.getenv("AUDIT_MAX_QUEUE", 10000))  # Spills straight to the file past this
+    AUDIT_FALLBACK_PATH = os.getenv("AUDIT_FALLBACK_PATH", str(BASE_DIR / "audit_fallback.jsonl"))
+
+    # Incremental /threats/stats counters
+    STATS_BUCKET_HOURS = int(os.getenv("STATS_BUCKET_HOURS", 24))  # Hourly buckets kept in memory
+    STATS_RECONCILE_INTERVAL = float(os.getenv("STATS_RECONCILE_INTERVAL", 60))  # Seconds between DB reconciles
+
+    # External threat-intelligence feeds, synced in the background and served from a disk cache
+    THREAT_FEEDS = [url.strip() for url in os.getenv(
+        "THREAT_FEEDS",
+        "https://www.virustotal.com/api/v3/intelligence,https://otx.alienvault.com/api/v1/pulses",
+    ).split(",") if url.strip()]
+    FEED_CACHE_DIR = os.getenv("FEED_CACHE_DIR", str(BASE_DIR / "feed_cache"))
+    FEED_SYNC_INTERVAL = float(os.getenv("FEED_SYNC_INTERVAL", 300))  # Seconds between syncs
+    FEED_TIMEOUT = float(os.getenv("FEED_TIMEOUT", 10))  # Per-feed request timeout (seconds)
+    FEED_MAX_CONNECTIONS = int(os.getenv("FEED_MAX_CONNECTIONS", 10))
+
+    INDICATOR_BLOOM_ERROR_RATE = float(os.getenv("INDICATOR_BLOOM_ERROR_RATE", 0.001))  # IOC pre-check
+
+    # In-memory source IP prefix index behind /threats/sources
+    IP_INDEX_WINDOW_HOURS = int(os.getenv("IP_INDEX_WINDOW_HOURS", 24))
+    IP_INDEX_RELOAD_INTERVAL = float(os.getenv("IP_INDEX_RELOAD_INTERVAL", 300))  # Seconds between DB reloads
+
+    # Read-through response cache for hot read endpoints ("memory" or "redis")
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory").lower()
+    RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 30))  # Seconds
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+    STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", 2))  # /threats/stats changes with every ingest
+
+    # Server-Sent Events push channel (/threats/stream)
+    STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", 100))  # Per-client messages before dropping the oldest
+    STREAM_MAX_CLIENTS = int(os.getenv("STREAM_MAX_CLIENTS", 100))
+    STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", 15))
+
+    # Time-bucketed threat rollups behind /threats/timeseries
+    ROLLUP_FLUSH_INTERVAL = float(os.getenv("ROLLUP_FLUSH_INTERVAL", 5))  # Seconds between upserts
+    ROLLUP_MINUTE_RETENTION_DAYS = int(os.getenv("ROLLUP_MINUTE_RETENTION_DAYS", 2))
+    ROLLUP_HOUR_RETENTION_DAYS = int(os.getenv("ROLLUP_HOUR_RETENTION_DAYS", 90))  # Day buckets are kept
+
+    # threat_logs retention (drops whole monthly partitions once the table is partitioned)
+    THREAT_LOG_RETENTION_DAYS = int(os.getenv("THREAT_LOG_RETENTION_DAYS", 90))
+    THREAT_LOG_PARTITIONS_AHEAD = int(os.getenv("THREAT_LOG_PARTITIONS_AHEAD", 2))  # Future months pre-created
+
     if not DATABASE_URL:
         raise ValueError("❌ DATABASE_URL is not set! Check your .env file.")
 
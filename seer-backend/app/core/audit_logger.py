@@ -1,16 +1,218 @@
+import json
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DataError, IntegrityError
 from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.database.database import engine
 from app.models.audit_log import AuditLog
 
+logger = logging.getLogger(__name__)
+
+# Errors caused by the entry itself: retrying can never succeed, so these go
+# to the dead-letter file instead of blocking the queue
+PERMANENT_ERRORS = (IntegrityError, DataError)
+
+
+class AuditWriter:
+    """Buffers audit entries and bulk-inserts them from a background thread.
+
+    Callers only append to an in-memory queue, so an admin mutation no longer
+    pays for a second commit. When the database is unavailable (or the queue
+    holds ``max_queue`` entries) entries are appended to ``fallback_path`` as
+    JSON lines and replayed once the database accepts writes again. Entries
+    the database rejects (e.g. a foreign key violation) are isolated one by
+    one and moved to ``<fallback_path>.dead`` so they cannot block the rest.
+    ``stop`` flushes everything that is still queued.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        fallback_path: str,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+    ):
+        self.engine = engine
+        self.fallback_path = fallback_path
+        self.dead_letter_path = f"{fallback_path}.dead"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._file_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.stats = {"queued": 0, "written": 0, "spilled": 0, "replayed": 0, "dead_lettered": 0, "failed_flushes": 0}
+
+    # ✅ Lifecycle
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the writer thread and flush what is still queued (to the fallback file if need be)."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    # ✅ Producers
+    def log(self, entry: Dict):
+        """Queue one audit entry; never blocks on the database."""
+        entry = dict(entry, timestamp=entry.get("timestamp") or datetime.utcnow())
+        with self._cond:
+            if len(self._queue) < self.max_queue:
+                self._queue.append(entry)
+                self.stats["queued"] += 1
+                if len(self._queue) >= self.batch_size:
+                    self._cond.notify_all()
+                return
+        self._spill([entry])  # ✅ Queue full: keep the entry durable rather than dropping it
+
+    def flush(self) -> bool:
+        """Write the fallback file and the queue to the database; returns False if the DB is down."""
+        if not self._replay_fallback():
+            self._spill(self._take_batch(len(self._queue)))  # ✅ DB still down: make the queue durable too
+            return False
+        while True:
+            batch = self._take_batch(self.batch_size)
+            if not batch:
+                return True
+            if not self._write_batch(batch):
+                return False
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    # ✅ Internals
+    def _take_batch(self, size: int) -> List[Dict]:
+        with self._cond:
+            return [self._queue.popleft() for _ in range(min(size, len(self._queue)))]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._running and len(self._queue) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                if not self._running:
+                    return
+            self.flush()
+
+    def _write_batch(self, batch: List[Dict]) -> bool:
+        unwritten = self._insert(batch)
+        if unwritten:
+            logger.error("❌ Database unavailable, spilling audit entries to %s", self.fallback_path)
+            self.stats["failed_flushes"] += 1
+            self._spill(unwritten + self._take_batch(len(self._queue)))
+            return False
+        return True
+
+    def _insert(self, entries: List[Dict]) -> List[Dict]:
+        """Insert ``entries``; returns the ones left unwritten because the database is unavailable."""
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(AuditLog.__table__), entries)
+        except PERMANENT_ERRORS:
+            if len(entries) == 1:
+                logger.exception("❌ Audit entry rejected by the database, moving it to %s", self.dead_letter_path)
+                self._append(self.dead_letter_path, entries)
+                self.stats["dead_lettered"] += 1
+                return []
+            # ✅ Isolate the bad entry: retry the batch one row at a time
+            for index, entry in enumerate(entries):
+                unwritten = self._insert([entry])
+                if unwritten:
+                    return unwritten + entries[index + 1:]
+            return []
+        except Exception:
+            logger.exception("❌ Failed to write %d audit entries", len(entries))
+            return entries
+        self.stats["written"] += len(entries)
+        return []
+
+    def _spill(self, entries: List[Dict]):
+        if not entries:
+            return
+        with self._file_lock:
+            self._append(self.fallback_path, entries)
+        self.stats["spilled"] += len(entries)
+
+    @staticmethod
+    def _append(path: str, entries: List[Dict]):
+        with open(path, "a") as output:
+            for entry in entries:
+                output.write(json.dumps(entry, default=lambda value: value.isoformat()) + "\n")
+            output.flush()
+            os.fsync(output.fileno())
+
+    def _replay_fallback(self) -> bool:
+        """Move spilled entries into the database; whatever cannot be written stays in the file."""
+        with self._file_lock:
+            try:
+                with open(self.fallback_path) as fallback:
+                    lines = [line for line in fallback if line.strip()]
+            except FileNotFoundError:
+                return True
+            entries = []
+            for line in lines:
+                try:
+                    entry = json.loads(line)
+                    entry["timestamp"] = datetime.fromisoformat(entry["timestamp"])
+                except (ValueError, KeyError, TypeError):
+                    logger.warning("⚠️ Skipping unreadable audit fallback line: %r", line[:200])
+                    continue
+                entries.append(entry)
+            unwritten = self._insert(entries) if entries else []
+            if unwritten:
+                logger.warning("⚠️ Database still unavailable, keeping %d spilled audit entries", len(unwritten))
+                self.stats["failed_flushes"] += 1
+                tmp_path = f"{self.fallback_path}.tmp"
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                self._append(tmp_path, unwritten)
+                os.replace(tmp_path, self.fallback_path)  # ✅ Drop the entries that did get written
+                return False
+            os.remove(self.fallback_path)
+        self.stats["replayed"] += len(entries)
+        return True
+
+
+audit_writer = AuditWriter(
+    engine,
+    settings.AUDIT_FALLBACK_PATH,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL,
+    max_queue=settings.AUDIT_MAX_QUEUE,
+)
+
+
 def log_audit_action(
-    db: Session, admin_id: int, action: str, target_user_id=None, target_role_id=None, target_permission_id=None
+    db: Optional[Session], admin_id: int, action: str, target_user_id=None, target_role_id=None, target_permission_id=None
 ):
-    """Logs IAM actions performed by admins."""
-    log_entry = AuditLog(
-        admin_id=admin_id,
-        action=action,
-        target_user_id=target_user_id,
-        target_role_id=target_role_id,
-        target_permission_id=target_permission_id,
-    )
-    db.add(log_entry)
-    db.commit()
+    """Logs IAM actions performed by admins (queued; ``db`` is kept for older callers)."""
+    audit_writer.log({
+        "admin_id": admin_id,
+        "action": action,
+        "target_user_id": target_user_id,
+        "target_role_id": target_role_id,
+        "target_permission_id": target_permission_id,
+    })
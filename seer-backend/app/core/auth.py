@@ -1,13 +1,22 @@
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Union
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Union, NamedTuple
+from collections import OrderedDict
+import threading
+import time
+import uuid
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends, Security
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.config.settings import settings
-from app.database.database import SessionLocal
+from app.database.database import get_db
+from app.database.async_database import get_async_db
 from app.models.user import User, Role
+from app.core.permission_cache import permission_cache
+from app.core.worker_pool import BoundedExecutor, PoolSaturated
 
 # ✅ JWT Configuration
 SECRET_KEY = settings.SECRET_KEY
@@ -15,16 +24,33 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 # ✅ Password Hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min/max to the configured cost makes verify_and_update flag hashes made
+# with any other cost, so they are transparently rehashed on the next login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+# ✅ bcrypt runs here, not in request threads, so a login storm can't starve other endpoints
+password_executor = BoundedExecutor(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE, "bcrypt")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-# ✅ Dependency: Get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# ✅ Stateless auth state (per process). The epoch makes permission versions from
+# other workers or earlier boots never match, so those tokens revalidate once.
+_PROCESS_EPOCH = uuid.uuid4().hex[:8]
+_validated_users: "OrderedDict[int, tuple]" = OrderedDict()
+_claims_not_before: Dict[int, float] = {}
+_revoked_before: Dict[int, float] = {}
+_auth_cache_lock = threading.Lock()
+
+class AuthenticatedUser(NamedTuple):
+    """Lightweight user snapshot built from trusted token claims or a DB lookup."""
+    id: int
+    email: str
+    role_id: int
+    role_name: str
 
 # ✅ Hash password using bcrypt
 def hash_password(password: str) -> str:
@@ -34,11 +60,35 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+# ✅ Verify and return a new hash when the stored one uses an outdated cost
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def _password_pool_busy():
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many concurrent authentication requests, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+# ✅ Run a hashing job on the bounded pool; 429 immediately when it is saturated
+def run_password_job(fn, *args):
+    try:
+        return password_executor.run(fn, *args)
+    except PoolSaturated:
+        raise _password_pool_busy()
+
+async def run_password_job_async(fn, *args):
+    try:
+        return await password_executor.run_async(fn, *args)
+    except PoolSaturated:
+        raise _password_pool_busy()
+
 # ✅ Generate JWT access token
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": time.time(), "pv": current_permission_version()})
     
     try:
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
@@ -75,8 +125,120 @@ def get_current_user(token: str = Security(oauth2_scheme), db: Session = Depends
     print(f"✅ Authenticated User: {user.email} | Role: {role.name}")
     user.role_name = role.name  # ✅ Attach role name
 
+    _check_not_revoked(user.id, payload, user.tokens_valid_after)
+    _remember_user(AuthenticatedUser(user.id, user.email, user.role_id, role.name))
+    return user
+
+# ✅ Get the current user (async path: user and role in one query)
+async def get_current_user_async(token: str = Security(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    payload = decode_access_token(token)
+    if not payload or "sub" not in payload:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+
+    row = (await db.execute(
+        select(User, Role.name).outerjoin(Role, Role.id == User.role_id).where(User.email == payload["sub"])
+    )).first()
+    if not row:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+
+    user, role_name = row
+    if role_name is None:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="User role not found")
+
+    _check_not_revoked(user.id, payload, user.tokens_valid_after)
+    user.role_name = role_name  # ✅ Attach role name
+    _remember_user(AuthenticatedUser(user.id, user.email, user.role_id, role_name))
     return user
 
+# ✅ Permission version embedded in tokens as the `pv` claim
+def current_permission_version() -> str:
+    return f"{_PROCESS_EPOCH}.{permission_cache.version}"
+
+# ✅ Force the next request of `user_id` to revalidate against the DB (e.g. after a role change)
+def invalidate_user(user_id: int):
+    with _auth_cache_lock:
+        _validated_users.pop(user_id, None)
+        _claims_not_before[user_id] = time.time()
+        _prune_expired_marks()
+
+# ✅ Reject every token issued to `user_id` up to `revoked_at` in this process
+# (callers persist `User.tokens_valid_after` so other workers and restarts agree)
+def revoke_user_tokens(user_id: int, revoked_at: Optional[float] = None):
+    with _auth_cache_lock:
+        _validated_users.pop(user_id, None)
+        _revoked_before[user_id] = revoked_at or time.time()
+        _prune_expired_marks()
+
+def _prune_expired_marks():
+    # Tokens issued before the cutoff have expired anyway, so older marks are never needed
+    cutoff = time.time() - ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    for marks in (_claims_not_before, _revoked_before):
+        for user_id in [user_id for user_id, marked_at in marks.items() if marked_at < cutoff]:
+            del marks[user_id]
+
+def _check_not_revoked(user_id: int, payload: Dict, tokens_valid_after: Optional[datetime] = None):
+    revoked_before = _revoked_before.get(user_id)
+    if tokens_valid_after is not None:
+        persisted = tokens_valid_after.replace(tzinfo=timezone.utc).timestamp()
+        revoked_before = max(revoked_before or 0, persisted)
+    if revoked_before is not None and payload.get("iat", 0) <= revoked_before:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+
+def _remember_user(user: AuthenticatedUser):
+    expires_at = time.monotonic() + settings.AUTH_USER_CACHE_TTL
+    with _auth_cache_lock:
+        _validated_users[user.id] = (user, current_permission_version(), expires_at)
+        _validated_users.move_to_end(user.id)
+        while len(_validated_users) > settings.AUTH_USER_CACHE_SIZE:
+            _validated_users.popitem(last=False)
+
+def _recently_validated(user_id: int) -> Optional[AuthenticatedUser]:
+    with _auth_cache_lock:
+        entry = _validated_users.get(user_id)
+        if not entry:
+            return None
+        user, version, expires_at = entry
+        if version != current_permission_version() or expires_at <= time.monotonic():
+            del _validated_users[user_id]
+            return None
+        _validated_users.move_to_end(user_id)
+        return user
+
+# ✅ Stateless fast path for read endpoints: trust signed claims, fall back to the DB
+def get_current_user_stateless(token: str = Security(oauth2_scheme), db: Session = Depends(get_db)) -> AuthenticatedUser:
+    """Authenticate without touching Postgres when the token or a recent lookup can be trusted.
+
+    Claims are trusted only if the token carries `uid`/`rid`, its permission
+    version matches this process and it is newer than any pending invalidation
+    of the user. Otherwise the user is loaded once via `get_current_user` and
+    kept in a small LRU for `AUTH_USER_CACHE_TTL` seconds.
+    """
+    payload = decode_access_token(token)
+    if not payload or "sub" not in payload:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+
+    user_id, role_id = payload.get("uid"), payload.get("rid")
+    if user_id is not None:
+        _check_not_revoked(user_id, payload)
+
+        cached = _recently_validated(user_id)
+        if cached:
+            return cached
+
+        issued_at = payload.get("iat", 0)
+        if (
+            role_id is not None
+            and payload.get("pv") == current_permission_version()
+            and issued_at > _claims_not_before.get(user_id, 0)
+            and time.time() - issued_at < settings.AUTH_USER_CACHE_TTL
+        ):
+            user = AuthenticatedUser(user_id, payload["sub"], role_id, payload.get("role"))
+            _remember_user(user)
+            return user
+
+    user = get_current_user(token, db)
+    return AuthenticatedUser(user.id, user.email, user.role_id, user.role_name)
+
 # ✅ Middleware: Ensure Admin Access
 def admin_required(user: User = Depends(get_current_user)):
     if user.role_name != "ADMIN":
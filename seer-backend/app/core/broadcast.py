@@ -0,0 +1,147 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Subscriber:
+    """One connected dashboard client: its filters and a bounded send queue."""
+
+    def __init__(self, severities: Optional[Set[str]], types: Optional[Set[str]], queue_size: int):
+        self.severities = severities
+        self.types = types
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def wants(self, event: Dict) -> bool:
+        if self.severities and event["severity"] not in self.severities:
+            return False
+        if self.types and event["type"] not in self.types:
+            return False
+        return True
+
+    def offer(self, message: str):
+        """Queue a message; a full queue drops its oldest message instead of waiting."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+
+def format_sse(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class ThreatBroadcaster:
+    """Fans newly ingested threats and stats deltas out to Server-Sent Events clients.
+
+    ``publish`` is an ingest listener and may be called from any thread: it
+    only serializes the batch and hands it to the event loop with
+    ``call_soon_threadsafe``. Each client has its own bounded queue, so a slow
+    client loses its oldest messages but never blocks ingestion or other
+    clients.
+    """
+
+    def __init__(self, queue_size: int = 100, max_clients: int = 100):
+        self.queue_size = queue_size
+        self.max_clients = max_clients
+        self._subscribers: List[Subscriber] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        """Bind to the event loop that serves the streaming responses."""
+        self._loop = loop
+
+    @property
+    def client_count(self) -> int:
+        return len(self._subscribers)
+
+    # ✅ Subscriptions (called on the event loop)
+    def subscribe(self, severities: Optional[Set[str]] = None, types: Optional[Set[str]] = None) -> Optional[Subscriber]:
+        """Register a client; returns ``None`` when ``max_clients`` are already connected."""
+        with self._lock:
+            if len(self._subscribers) >= self.max_clients:
+                return None
+            subscriber = Subscriber(severities, types, self.queue_size)
+            self._subscribers = self._subscribers + [subscriber]
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            self._subscribers = [other for other in self._subscribers if other is not subscriber]
+
+    # ✅ Publishing (safe from any thread)
+    def publish(self, rows: List[Dict]):
+        """Ingest listener: push the new threats and the resulting stats delta."""
+        if not self._subscribers or self._loop is None:
+            return
+        events = [
+            {
+                "type": row["type"],
+                "severity": row["severity"],
+                "source_ip": row["source_ip"],
+                "is_alert": row.get("is_alert"),
+                "indicator_match": row.get("indicator_match", False),
+                "timestamp": (row.get("timestamp") or datetime.utcnow()).isoformat(),
+            }
+            for row in rows
+        ]
+        delta = {
+            "total_threats": len(rows),
+            "active_alerts": sum(1 for row in rows if row.get("is_alert")),
+            "severity_distribution": dict(Counter(row["severity"] for row in rows)),
+            "type_distribution": dict(Counter(row["type"] for row in rows)),
+        }
+        self._call_in_loop(self._fan_out, events, delta)
+
+    def publish_stats(self, delta: Dict):
+        """Push a stats-only delta (e.g. ``{"active_alerts": -1}`` after a resolve)."""
+        if self._subscribers and self._loop is not None:
+            self._call_in_loop(self._fan_out, [], delta)
+
+    def _call_in_loop(self, callback, *args):
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # Loop already closed (shutdown)
+
+    def _fan_out(self, events: List[Dict], delta: Dict):
+        messages = [(event, format_sse("threat", event)) for event in events]
+        stats_message = format_sse("stats", delta)
+        for subscriber in self._subscribers:
+            for event, message in messages:
+                if subscriber.wants(event):
+                    subscriber.offer(message)
+            subscriber.offer(stats_message)
+
+    # ✅ Streaming
+    async def stream(self, subscriber: Subscriber, is_disconnected, heartbeat: float = 15.0):
+        """Yield SSE messages for ``subscriber`` until the client goes away."""
+        try:
+            yield "retry: 3000\n\n"
+            while not await is_disconnected():
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if subscriber.dropped:
+                    yield format_sse("dropped", {"count": subscriber.dropped})
+                    subscriber.dropped = 0
+                yield message
+        finally:
+            self.unsubscribe(subscriber)
+
+
+threat_broadcaster = ThreatBroadcaster(
+    queue_size=settings.STREAM_QUEUE_SIZE,
+    max_clients=settings.STREAM_MAX_CLIENTS,
+)
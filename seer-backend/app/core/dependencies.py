@@ -2,21 +2,13 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from jose import JWTError, jwt
-from app.database.database import SessionLocal
+from app.database.database import get_db
 from app.models.user import User
 from app.core.auth import SECRET_KEY, ALGORITHM
 from typing import Dict
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-# ✅ Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # ✅ Get the current logged-in user
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
     """Extracts user from JWT token and verifies authentication"""
@@ -0,0 +1,191 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+from app.config.settings import settings
+
+if TYPE_CHECKING:
+    import httpx  # Imported when the first sync runs
+
+logger = logging.getLogger(__name__)
+
+
+class FeedSync:
+    """Background sync of external threat-intelligence feeds.
+
+    Every ``interval`` seconds all feeds are fetched concurrently over one
+    pooled ``httpx.AsyncClient`` with a per-feed timeout. Conditional requests
+    (ETag / Last-Modified) avoid re-downloading unchanged feeds, and each
+    feed's last good payload is kept in ``cache_dir`` so API requests never
+    wait on a remote server.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        cache_dir: str,
+        interval: float = 300.0,
+        timeout: float = 10.0,
+        max_connections: int = 10,
+    ):
+        self.urls = urls
+        self.cache_dir = cache_dir
+        self.interval = interval
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._feeds: Dict[str, Dict] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._listeners: List[Callable[[Dict[str, object]], None]] = []
+
+    def add_listener(self, listener: Callable[[Dict[str, object]], None]):
+        """Register a callback receiving ``{url: payload}`` for feeds with new data (run in a thread)."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    # ✅ On-disk cache
+    def _cache_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest()[:16] + ".json")
+
+    def load_cache(self):
+        """Load every feed's last good payload from disk."""
+        for url in self.urls:
+            try:
+                with open(self._cache_path(url)) as cache_file:
+                    self._feeds[url] = json.load(cache_file)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError):
+                logger.warning("⚠️ Ignoring unreadable feed cache for %s", url)
+
+    def _save(self, url: str, entry: Dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as cache_file:
+            json.dump(entry, cache_file)
+        os.replace(tmp_path, self._cache_path(url))  # ✅ Readers never see a partial file
+
+    # ✅ Fetching
+    def _new_client(self) -> "httpx.AsyncClient":
+        import httpx
+
+        return httpx.AsyncClient(limits=httpx.Limits(max_connections=self.max_connections), timeout=self.timeout)
+
+    async def fetch_feed(self, client: "httpx.AsyncClient", url: str) -> bool:
+        """Refresh one feed; returns True when new data was downloaded."""
+        import httpx
+
+        entry = self._feeds.get(url, {"url": url, "data": []})
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        entry = dict(entry, checked_at=datetime.utcnow().isoformat())
+        try:
+            response = await client.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304:
+                entry["error"] = None
+            elif response.status_code == 200:
+                entry.update(
+                    data=response.json(),
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    fetched_at=entry["checked_at"],
+                    error=None,
+                )
+                await asyncio.to_thread(self._save, url, entry)
+            else:
+                entry["error"] = f"HTTP {response.status_code}"
+        except (httpx.HTTPError, ValueError) as e:
+            entry["error"] = f"{type(e).__name__}: {e}"
+        if entry["error"]:
+            print(f"Failed to fetch data from {url}: {entry['error']}")
+        self._feeds[url] = entry
+        return entry.get("fetched_at") == entry["checked_at"]
+
+    async def sync_once(self, notify_all: bool = False) -> List[str]:
+        """Fetch every feed concurrently; a slow or failing feed only affects itself.
+
+        Returns the URLs that changed. Listeners get the changed feeds, or every
+        cached feed when ``notify_all`` is set.
+        """
+        client = self._client or self._new_client()
+        try:
+            changed = await asyncio.gather(*(self.fetch_feed(client, url) for url in self.urls))
+        finally:
+            if client is not self._client:
+                await client.aclose()
+
+        changed = [url for url, updated in zip(self.urls, changed) if updated]
+        notify = [url for url in self.urls if url in self._feeds] if notify_all else changed
+        if notify:
+            payloads = {url: self._feeds[url].get("data") for url in notify}
+            for listener in self._listeners:
+                try:
+                    await asyncio.to_thread(listener, payloads)
+                except Exception:
+                    logger.exception("Threat feed listener %r failed", listener)
+        return changed
+
+    # ✅ Background loop
+    def start(self):
+        """Load the disk cache and start syncing (call from inside the event loop)."""
+        if self._task and not self._task.done():
+            return
+        self.load_cache()
+        self._client = self._new_client()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self):
+        first = True
+        while True:
+            try:
+                await self.sync_once(notify_all=first)  # ✅ First pass also replays the disk cache
+                first = False
+            except Exception:
+                logger.exception("❌ Threat feed sync failed")
+            await asyncio.sleep(self.interval)
+
+    # ✅ Reads (served from the cache)
+    def cached_threats(self) -> List:
+        threats = []
+        for url in self.urls:
+            data = self._feeds.get(url, {}).get("data")
+            if isinstance(data, list):
+                threats.extend(data)
+            elif data:
+                threats.append(data)
+        return threats
+
+    def status(self) -> List[Dict]:
+        return [
+            {key: value for key, value in self._feeds.get(url, {"url": url}).items() if key != "data"}
+            for url in self.urls
+        ]
+
+
+feed_sync = FeedSync(
+    settings.THREAT_FEEDS,
+    settings.FEED_CACHE_DIR,
+    interval=settings.FEED_SYNC_INTERVAL,
+    timeout=settings.FEED_TIMEOUT,
+    max_connections=settings.FEED_MAX_CONNECTIONS,
+)
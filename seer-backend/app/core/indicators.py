@@ -0,0 +1,148 @@
+import bisect
+import hashlib
+import ipaddress
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.config.settings import settings
+from app.database.database import SessionLocal
+from app.models.threat_indicator import ThreatIndicator
+
+# JSON keys that commonly hold an indicator value in feed payloads
+INDICATOR_KEYS = {"indicator", "ip", "ip_address", "ipv4", "value", "address"}
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter (no false negatives, ~``error_rate`` false positives)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, value: str):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+def normalize_ip(value) -> Optional[str]:
+    try:
+        return str(ipaddress.ip_address(str(value).strip()))
+    except ValueError:
+        return None
+
+
+def extract_indicators(data) -> Set[str]:
+    """Collect IP indicators from an arbitrary feed payload (lists, dicts, plain strings)."""
+    found, stack = set(), [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            for key, value in item.items():
+                if isinstance(value, (dict, list)):
+                    stack.append(value)
+                elif isinstance(value, str) and key.lower() in INDICATOR_KEYS:
+                    stack.append(value)
+        elif isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, str):
+            ip = normalize_ip(item)
+            if ip:
+                found.add(ip)
+    return found
+
+
+class IndicatorStore:
+    """Known-bad indicators, matched against ingested threats without touching the database.
+
+    A Bloom filter answers the common "not an indicator" case in a few bit
+    probes; hits are confirmed against a sorted array of the indicator values.
+    The pair is rebuilt from ``threat_indicators`` and swapped in atomically.
+    """
+
+    def __init__(self, error_rate: float = 0.001):
+        self.error_rate = error_rate
+        self._snapshot = (BloomFilter(1, error_rate), [])  # (bloom, sorted values), swapped as one
+        self.loaded_at: Optional[datetime] = None
+
+    def __len__(self):
+        return len(self._snapshot[1])
+
+    def build(self, values: Iterable[str]):
+        values = sorted(set(values))
+        bloom = BloomFilter(len(values), self.error_rate)
+        for value in values:
+            bloom.add(value)
+        self._snapshot = (bloom, values)
+        self.loaded_at = datetime.utcnow()
+
+    def load(self, db: Session):
+        """Rebuild the in-memory filter from the ``threat_indicators`` table."""
+        self.build(value for (value,) in db.query(ThreatIndicator.value))
+
+    def matches(self, value: str) -> bool:
+        if not value:
+            return False
+        bloom, values = self._snapshot
+        ip = normalize_ip(value) or value
+        if ip not in bloom:
+            return False
+        index = bisect.bisect_left(values, ip)
+        return index < len(values) and values[index] == ip
+
+    def enrich(self, rows: List[Dict]):
+        """Ingest enricher: flag rows whose source IP is a known indicator."""
+        for row in rows:
+            row["indicator_match"] = self.matches(row.get("source_ip"))
+
+    def store_feeds(self, db: Session, feeds: Dict[str, object]) -> int:
+        """Upsert the indicators found in ``{feed_url: payload}`` and reload the filter."""
+        now = datetime.utcnow()
+        rows = list({
+            value: {"value": value, "source": url, "first_seen": now, "last_seen": now}
+            for url, data in feeds.items()
+            for value in extract_indicators(data)
+        }.values())
+        if rows:
+            dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(db.get_bind().dialect.name)
+            if dialect is None:
+                existing = {value for (value,) in db.query(ThreatIndicator.value)}
+                new_rows = [row for row in rows if row["value"] not in existing]
+                if new_rows:
+                    db.execute(insert(ThreatIndicator.__table__), new_rows)
+            else:
+                statement = dialect.insert(ThreatIndicator.__table__)
+                statement = statement.on_conflict_do_update(
+                    index_elements=["value"],
+                    set_={"last_seen": statement.excluded.last_seen, "source": statement.excluded.source},
+                )
+                db.execute(statement, rows)
+            db.commit()
+        self.load(db)
+        return len(rows)
+
+
+indicator_store = IndicatorStore(error_rate=settings.INDICATOR_BLOOM_ERROR_RATE)
+
+
+def store_feed_indicators(feeds: Dict[str, object]):
+    """Feed-sync listener: persist new indicators and refresh the in-memory filter."""
+    db = SessionLocal()
+    try:
+        indicator_store.store_feeds(db, feeds)
+    finally:
+        db.close()
+    print(f"✅ Threat indicator store refreshed ({len(indicator_store)} indicators)")
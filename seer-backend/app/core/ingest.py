@@ -0,0 +1,312 @@
+import csv
+import io
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.config.settings import settings
+from app.core.ipv4 import ip_to_int
+from app.database.database import engine
+from app.models.threat_log import ThreatLog
+
+logger = logging.getLogger(__name__)
+
+# Columns written by the ingest path, in COPY order
+INGEST_COLUMNS = ["type", "severity", "source_ip", "source_ip_num", "is_alert", "timestamp", "resolved", "indicator_match"]
+
+# Errors caused by the rows themselves: retrying the same batch can never succeed
+PERMANENT_ERRORS = (IntegrityError, DataError)
+
+
+class IngestBufferFull(Exception):
+    """Raised when the ingest buffer stays full for longer than the submit timeout."""
+
+
+class ThreatIngestor:
+    """Buffers ``ThreatLog`` rows and writes them in batches.
+
+    Rows are flushed by a background thread once ``batch_size`` rows are
+    pending or ``flush_interval`` seconds have passed, using Postgres ``COPY``
+    when available and a single ``executemany`` insert otherwise. When
+    ``max_buffer`` rows are pending, producers block (backpressure) and then
+    get ``IngestBufferFull``.
+
+    A batch the database rejects is split until the bad rows are isolated;
+    those go to ``dead_letter_path`` as JSON lines. A batch that keeps failing
+    for other reasons is retried ``max_retries`` times and then dead-lettered
+    too, as are rows still buffered when ``stop`` cannot write them. Listeners
+    only see rows once they are stored.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffer: int = 10000,
+        max_retries: int = 5,
+        dead_letter_path: Optional[str] = None,
+    ):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.max_retries = max_retries
+        self.dead_letter_path = dead_letter_path
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._file_lock = threading.Lock()
+        self._failures = 0  # Consecutive failed flushes of the batch at the head of the buffer
+        self._listeners: List[Callable[[List[Dict]], None]] = []
+        self._enrichers: List[Callable[[List[Dict]], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.stats = {"submitted": 0, "written": 0, "flushes": 0, "rejected": 0, "failed_flushes": 0, "dead_lettered": 0}
+
+    # ✅ Lifecycle
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="threat-ingestor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the flusher thread and write whatever is still buffered (dead-lettering what cannot be)."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+        with self._cond:
+            unwritten = list(self._buffer)
+            self._buffer.clear()
+        if unwritten:
+            logger.error("❌ %d threat logs could not be written before shutdown", len(unwritten))
+            self._dead_letter(unwritten)
+
+    def add_listener(self, listener: Callable[[List[Dict]], None]):
+        """Register a callback that receives every batch of rows once it is written."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def add_enricher(self, enricher: Callable[[List[Dict]], None]):
+        """Register a callback that may modify rows in place before they are buffered."""
+        if enricher not in self._enrichers:
+            self._enrichers.append(enricher)
+
+    # ✅ Producers
+    def submit(self, event: Dict, timeout: Optional[float] = None):
+        self.submit_many([event], timeout)
+
+    def submit_many(self, events: Iterable[Dict], timeout: Optional[float] = None):
+        """Queue rows for the next flush, waiting up to ``timeout`` seconds for space."""
+        rows = self._prepare_all(events)
+        if not rows:
+            return
+        if len(rows) > self.max_buffer:
+            raise IngestBufferFull(f"Batch of {len(rows)} exceeds ingest buffer size {self.max_buffer}")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while len(self._buffer) + len(rows) > self.max_buffer:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self.stats["rejected"] += len(rows)
+                    raise IngestBufferFull("Threat ingest buffer is full, retry later")
+                self._cond.wait(remaining)
+            self._buffer.extend(rows)
+            self.stats["submitted"] += len(rows)
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify_all()
+
+    def write_rows(self, events: Iterable[Dict]) -> int:
+        """Write rows immediately (bypassing the buffer) in one COPY/executemany."""
+        rows = self._prepare_all(events)
+        if rows:
+            self._write(rows)
+            with self._cond:
+                self.stats["submitted"] += len(rows)
+                self.stats["written"] += len(rows)
+            self._notify(rows)
+        return len(rows)
+
+    def flush(self) -> int:
+        """Synchronously write everything that is currently buffered."""
+        written = 0
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return written
+            batch_written = self._write_batch(batch)
+            if batch_written is None:
+                return written
+            written += batch_written
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    # ✅ Internals
+    def _prepare(self, event: Dict) -> Dict:
+        row = {
+            "type": event["type"],
+            "severity": event["severity"],
+            "source_ip": event["source_ip"],
+            "source_ip_num": ip_to_int(event["source_ip"]),
+            "is_alert": event.get("is_alert", True),
+            "timestamp": event.get("timestamp") or datetime.utcnow(),
+            "resolved": event.get("resolved", False),
+            "indicator_match": event.get("indicator_match", False),
+        }
+        return row
+
+    def _prepare_all(self, events: Iterable[Dict]) -> List[Dict]:
+        rows = [self._prepare(event) for event in events]
+        for enricher in self._enrichers:
+            enricher(rows)
+        return rows
+
+    def _notify(self, rows: List[Dict]):
+        if not rows:
+            return
+        for listener in self._listeners:
+            try:
+                listener(rows)
+            except Exception:
+                logger.exception("Threat ingest listener %r failed", listener)
+
+    def _take_batch(self) -> List[Dict]:
+        with self._cond:
+            size = min(self.batch_size, len(self._buffer))
+            batch = [self._buffer.popleft() for _ in range(size)]
+            if batch:
+                self._cond.notify_all()
+            return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._running and len(self._buffer) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                if not self._running:
+                    return
+            batch = self._take_batch()
+            if batch and self._write_batch(batch) is None:
+                time.sleep(self.flush_interval)
+
+    def _write_batch(self, batch: List[Dict]) -> Optional[int]:
+        """Write one batch; returns the number of rows stored, or None if it has to be retried."""
+        written, rejected = [], []
+        try:
+            self._write_isolating(batch, written, rejected)
+        except Exception:
+            handled = {id(row) for row in written + rejected}
+            remaining = [row for row in batch if id(row) not in handled]
+            with self._cond:
+                self.stats["failed_flushes"] += 1
+                self._failures += 1
+                retry = self._failures <= self.max_retries
+                if retry:
+                    self._buffer.extendleft(reversed(remaining))
+                else:
+                    self._failures = 0
+            if retry:
+                logger.exception("❌ Failed to flush %d threat logs, requeueing", len(remaining))
+            else:
+                logger.exception("❌ Failed to flush %d threat logs %d times, giving up", len(remaining), self.max_retries + 1)
+                self._dead_letter(remaining)
+            self._notify(written)
+            return None
+        with self._cond:
+            self._failures = 0
+            self.stats["written"] += len(written)
+            self.stats["flushes"] += 1
+        self._notify(written)
+        return len(written)
+
+    def _write_isolating(self, rows: List[Dict], written: List[Dict], rejected: List[Dict]):
+        """Write ``rows``, splitting batches the database rejects until the bad rows are dead-lettered."""
+        try:
+            self._write(rows)
+        except Exception as exc:
+            if not self._is_permanent(exc):
+                raise
+            if len(rows) == 1:
+                logger.error("❌ Threat log rejected by the database: %s", exc)
+                self._dead_letter(rows)
+                rejected.extend(rows)
+                return
+            middle = len(rows) // 2
+            self._write_isolating(rows[:middle], written, rejected)
+            self._write_isolating(rows[middle:], written, rejected)
+            return
+        written.extend(rows)
+
+    def _is_permanent(self, exc: Exception) -> bool:
+        # COPY runs on the raw DBAPI connection, so its errors are not wrapped by SQLAlchemy
+        dbapi = getattr(self.engine.dialect, "loaded_dbapi", None)
+        dbapi_errors = tuple(getattr(dbapi, name) for name in ("IntegrityError", "DataError") if hasattr(dbapi, name))
+        return isinstance(exc, PERMANENT_ERRORS + dbapi_errors)
+
+    def _dead_letter(self, rows: List[Dict]):
+        if not rows:
+            return
+        with self._cond:
+            self.stats["dead_lettered"] += len(rows)
+        if not self.dead_letter_path:
+            logger.error("❌ Dropping %d threat logs (no dead-letter file configured)", len(rows))
+            return
+        with self._file_lock:
+            with open(self.dead_letter_path, "a") as dead_letter:
+                for row in rows:
+                    dead_letter.write(json.dumps(row, default=lambda value: value.isoformat()) + "\n")
+                dead_letter.flush()
+                os.fsync(dead_letter.fileno())
+
+    def _write(self, rows: List[Dict]):
+        if self.engine.dialect.name == "postgresql":
+            self._copy(rows)
+        else:
+            with self.engine.begin() as conn:
+                conn.execute(insert(ThreatLog.__table__), rows)
+
+    def _copy(self, rows: List[Dict]):
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in rows:
+            writer.writerow([row[column] for column in INGEST_COLUMNS])
+        buf.seek(0)
+
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            cursor.copy_expert(
+                f"COPY {ThreatLog.__tablename__} ({', '.join(INGEST_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buf,
+            )
+            raw.commit()
+        finally:
+            raw.close()
+
+
+threat_ingestor = ThreatIngestor(
+    engine,
+    batch_size=settings.INGEST_BATCH_SIZE,
+    flush_interval=settings.INGEST_FLUSH_INTERVAL,
+    max_buffer=settings.INGEST_MAX_BUFFER,
+    max_retries=settings.INGEST_MAX_RETRIES,
+    dead_letter_path=settings.INGEST_DEAD_LETTER_PATH,
+)
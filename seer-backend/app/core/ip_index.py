@@ -0,0 +1,216 @@
+import heapq
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config.settings import settings
+from app.core.ipv4 import ip_to_int, int_to_ip, cidr_to_range
+from app.database.database import SessionLocal
+from app.models.threat_log import ThreatLog
+
+logger = logging.getLogger(__name__)
+
+
+def _hour_bucket(timestamp: datetime) -> datetime:
+    return timestamp.replace(minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+class PrefixTrie:
+    """Binary radix trie over IPv4 addresses.
+
+    Each node is ``[count, zero_child, one_child]`` and carries the number of
+    events in its subtree, so CIDR counts cost one walk of ``prefix_len`` bits.
+    """
+
+    def __init__(self):
+        self.root = [0, None, None]
+
+    @property
+    def total(self) -> int:
+        return self.root[0]
+
+    def add(self, ip: int, count: int = 1):
+        node = self.root
+        node[0] += count
+        for shift in range(31, -1, -1):
+            slot = 1 + ((ip >> shift) & 1)
+            child = node[slot]
+            if child is None:
+                child = node[slot] = [0, None, None]
+            child[0] += count
+            node = child
+
+    def remove(self, ip: int, count: int = 1):
+        node = self.root
+        node[0] -= count
+        for shift in range(31, -1, -1):
+            slot = 1 + ((ip >> shift) & 1)
+            child = node[slot]
+            if child is None:
+                return
+            child[0] -= count
+            if child[0] <= 0:
+                node[slot] = None  # Drop the now-empty subtree
+                return
+            node = child
+
+    def count(self, prefix: int, prefix_len: int) -> int:
+        node = self.root
+        for shift in range(31, 31 - prefix_len, -1):
+            node = node[1 + ((prefix >> shift) & 1)]
+            if node is None:
+                return 0
+        return node[0]
+
+    def top_prefixes(self, prefix_len: int, n: int, within: int = 0, within_len: int = 0) -> List[tuple]:
+        """The ``n`` busiest ``/prefix_len`` networks as ``(prefix, count)``, busiest first.
+
+        Best-first search: a node's count bounds every prefix below it, so the
+        first ``n`` nodes popped at ``prefix_len`` depth are the exact top N.
+        """
+        start = self.root
+        for shift in range(31, 31 - within_len, -1):
+            start = start[1 + ((within >> shift) & 1)]
+            if start is None:
+                return []
+
+        heap = [(-start[0], within_len, within, start)]
+        results = []
+        while heap and len(results) < n:
+            negative_count, depth, prefix, node = heapq.heappop(heap)
+            if depth == prefix_len:
+                results.append((prefix, -negative_count))
+                continue
+            for bit in (0, 1):
+                child = node[1 + bit]
+                if child is not None and child[0] > 0:
+                    heapq.heappush(heap, (-child[0], depth + 1, prefix | (bit << (31 - depth)), child))
+        return results
+
+
+class SourceIPIndex:
+    """In-memory index of source IPs seen over the last ``window_hours``.
+
+    Fed by the ingest path; hourly generations are subtracted from the trie
+    as they age out. ``reload`` rebuilds it from ``threat_logs`` so the view
+    also covers rows written by other API processes.
+    """
+
+    def __init__(self, window_hours: int = 24):
+        self.window_hours = window_hours
+        self._trie = PrefixTrie()
+        self._hours: Dict[datetime, Counter] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.reloaded_at: Optional[datetime] = None
+
+    # ✅ Updates
+    def record(self, rows: List[Dict]):
+        """Ingest listener: count each row's IPv4 source."""
+        oldest = self._oldest_hour()
+        with self._lock:
+            for row in rows:
+                ip = row.get("source_ip_num")
+                if ip is None:
+                    ip = ip_to_int(row.get("source_ip"))
+                hour = _hour_bucket(row.get("timestamp") or datetime.utcnow())
+                if ip is None or hour < oldest:
+                    continue
+                self._hours.setdefault(hour, Counter())[ip] += 1
+                self._trie.add(ip)
+            self._expire(oldest)
+
+    def reload(self, db: Session):
+        """Rebuild the index from the database."""
+        oldest = self._oldest_hour()
+        if db.get_bind().dialect.name == "postgresql":
+            hour_column = func.date_trunc("hour", ThreatLog.timestamp)
+        else:
+            hour_column = func.strftime("%Y-%m-%d %H:00:00", ThreatLog.timestamp)
+        rows = (
+            db.query(hour_column, ThreatLog.source_ip_num, func.count(ThreatLog.id))
+            .filter(ThreatLog.timestamp >= oldest, ThreatLog.source_ip_num.isnot(None))
+            .group_by(hour_column, ThreatLog.source_ip_num)
+            .all()
+        )
+
+        trie, hours = PrefixTrie(), {}
+        for hour, ip, count in rows:
+            if isinstance(hour, str):
+                hour = datetime.fromisoformat(hour)
+            hours.setdefault(_hour_bucket(hour), Counter())[ip] += count
+            trie.add(ip, count)
+        with self._lock:
+            self._trie, self._hours = trie, hours
+            self.reloaded_at = datetime.utcnow()
+
+    def _oldest_hour(self) -> datetime:
+        return _hour_bucket(datetime.utcnow()) - timedelta(hours=self.window_hours - 1)
+
+    def _expire(self, oldest: datetime):
+        for hour in [hour for hour in self._hours if hour < oldest]:
+            for ip, count in self._hours.pop(hour).items():
+                self._trie.remove(ip, count)
+
+    # ✅ Lookups
+    def count(self, cidr: str) -> int:
+        """Events from ``cidr`` (a single IP is a /32); raises ``ValueError`` for bad input."""
+        first, _, prefix_len = cidr_to_range(cidr)
+        with self._lock:
+            self._expire(self._oldest_hour())
+            return self._trie.count(first, prefix_len)
+
+    def top_prefixes(self, prefix_len: int = 24, n: int = 10, cidr: str = None) -> List[Dict]:
+        """Busiest ``/prefix_len`` networks, optionally only inside ``cidr``."""
+        within, within_len = 0, 0
+        if cidr:
+            within, _, within_len = cidr_to_range(cidr)
+            if within_len > prefix_len:
+                raise ValueError("prefix_len must be at least the CIDR filter's prefix length")
+        with self._lock:
+            self._expire(self._oldest_hour())
+            top = self._trie.top_prefixes(prefix_len, n, within, within_len)
+        return [
+            {"prefix": int_to_ip(prefix) if prefix_len == 32 else f"{int_to_ip(prefix)}/{prefix_len}", "count": count}
+            for prefix, count in top
+        ]
+
+    def ensure_loaded(self):
+        if self.reloaded_at is not None:
+            return
+        db = SessionLocal()
+        try:
+            self.reload(db)
+        finally:
+            db.close()
+
+    # ✅ Periodic reload
+    def start_reloader(self, interval: float):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="source-ip-index", daemon=True)
+        self._thread.start()
+
+    def stop_reloader(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self, interval: float):
+        while not self._stop.wait(interval):
+            db = SessionLocal()
+            try:
+                self.reload(db)
+            except Exception:
+                logger.exception("❌ Source IP index reload failed")
+            finally:
+                db.close()
+
+
+source_ip_index = SourceIPIndex(window_hours=settings.IP_INDEX_WINDOW_HOURS)
@@ -0,0 +1,20 @@
+import ipaddress
+from typing import Optional, Tuple
+
+def ip_to_int(ip: str) -> Optional[int]:
+    """Integer form of an IPv4 address (``None`` for IPv6 or malformed input)."""
+    try:
+        address = ipaddress.ip_address(ip.strip())
+    except (AttributeError, ValueError):
+        return None
+    return int(address) if address.version == 4 else None
+
+def int_to_ip(value: int) -> str:
+    return str(ipaddress.IPv4Address(value))
+
+def cidr_to_range(cidr: str) -> Tuple[int, int, int]:
+    """``(first, last, prefix_len)`` integer bounds of an IPv4 network; raises ``ValueError``."""
+    network = ipaddress.ip_network(cidr.strip(), strict=False)
+    if network.version != 4:
+        raise ValueError("Only IPv4 networks are supported")
+    return int(network.network_address), int(network.broadcast_address), network.prefixlen
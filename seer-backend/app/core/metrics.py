@@ -0,0 +1,224 @@
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Default latency buckets (seconds), roughly Prometheus client defaults
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for label_values, value in values:
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by label values."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List] = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return series[-1] if series else 0
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            series_items = [(labels, list(series)) for labels, series in self._series.items()]
+        for label_values, series in series_items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, series):
+                cumulative += bucket_count
+                le = _format_labels(self.labels, label_values, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            le = _format_labels(self.labels, label_values, 'le="+Inf"')
+            yield f"{self.name}_bucket{le} {series[-1]}"
+            yield f"{self.name}_sum{_format_labels(self.labels, label_values)} {_format_value(series[-2])}"
+            yield f"{self.name}_count{_format_labels(self.labels, label_values)} {series[-1]}"
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text exposition format.
+
+    Collectors are callables returning ``(name, kind, help, value)`` tuples for
+    values that already live elsewhere (ingest stats, pool metrics); they are
+    read at scrape time.
+    """
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, float]]]] = []
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, help_text, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, help_text, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, float]]]):
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for collector in self._collectors:
+            for name, kind, help_text, value in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "seer_http_requests_total", "HTTP requests by route template and status.", ["method", "route", "status"])
+http_latency = registry.histogram(
+    "seer_http_request_duration_seconds", "HTTP request latency by route template.", ["method", "route"])
+request_statements = registry.histogram(
+    "seer_http_request_db_statements", "SQL statements issued per HTTP request.", ["method", "route"],
+    buckets=STATEMENT_COUNT_BUCKETS)
+request_db_time = registry.histogram(
+    "seer_http_request_db_seconds", "Time spent in SQL statements per HTTP request.", ["method", "route"])
+db_statements = registry.counter("seer_db_statements_total", "SQL statements executed (all callers).")
+db_statement_latency = registry.histogram("seer_db_statement_duration_seconds", "SQL statement latency.")
+risk_scoring_latency = registry.histogram(
+    "seer_risk_scoring_duration_seconds", "Risk-scoring model latency per scoring call.")
+risk_scored = registry.counter("seer_risk_scored_threats_total", "Threats scored by the risk model.")
+
+# [statement count, seconds] for the request being served; the list is shared
+# by reference with the threadpool workers that run sync endpoints
+_request_sql: ContextVar[Optional[List]] = ContextVar("request_sql", default=None)
+
+
+# ✅ SQL instrumentation
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    db_statements.inc()
+    db_statement_latency.observe(elapsed)
+    current = _request_sql.get()
+    if current is not None:
+        current[0] += 1
+        current[1] += elapsed
+
+
+def instrument_engine(engine: Engine):
+    """Count and time every statement executed on ``engine`` (sync or the sync side of an async engine)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ✅ Request instrumentation
+class MetricsMiddleware:
+    """ASGI middleware recording latency and SQL usage per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        sql = [0, 0.0]
+        token = _request_sql.set(sql)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_sql.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"  # ✅ Raw paths would explode label cardinality
+            method = scope["method"]
+            http_requests.inc(method, route_path, str(status["code"]))
+            http_latency.observe(elapsed, method, route_path)
+            request_statements.observe(sql[0], method, route_path)
+            request_db_time.observe(sql[1], method, route_path)
+
+
+def observe_risk_scoring(seconds: float, count: int):
+    risk_scoring_latency.observe(seconds)
+    risk_scored.inc(amount=count)
@@ -0,0 +1,18 @@
+import base64
+from datetime import datetime
+from typing import Tuple
+from fastapi import HTTPException
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Encode a ``(timestamp, id)`` keyset position as an opaque cursor."""
+    raw = f"{timestamp.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by ``encode_cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
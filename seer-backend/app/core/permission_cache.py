@@ -0,0 +1,66 @@
+import threading
+import time
+from typing import Dict, FrozenSet, NamedTuple, Optional
+from sqlalchemy.orm import Session
+from app.config.settings import settings
+from app.models.user import Role, Permission, role_permissions
+
+
+class RolePermissions(NamedTuple):
+    role_name: str
+    permissions: FrozenSet[str]
+
+
+class PermissionCache:
+    """In-process role → permission-set cache with a TTL.
+
+    Entries are loaded with a single query and dropped after ``ttl`` seconds
+    or as soon as an admin/IAM mutation calls ``invalidate``.
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._entries: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Bumped on every invalidation; lets callers detect permission changes."""
+        return self._version
+
+    def get(self, db: Session, role_id: int) -> Optional[RolePermissions]:
+        """Return the role name and permission names for ``role_id`` (``None`` if missing)."""
+        entry = self._entries.get(role_id)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        version = self._version
+        rows = (
+            db.query(Role.name, Permission.name)
+            .outerjoin(role_permissions, role_permissions.c.role_id == Role.id)
+            .outerjoin(Permission, Permission.id == role_permissions.c.permission_id)
+            .filter(Role.id == role_id)
+            .all()
+        )
+        if not rows:
+            return None
+
+        value = RolePermissions(rows[0][0], frozenset(name for _, name in rows if name is not None))
+        with self._lock:
+            # ✅ Don't cache data read before a concurrent invalidation
+            if version == self._version:
+                self._entries[role_id] = (time.monotonic() + self.ttl, value)
+        return value
+
+    def invalidate(self, role_id: Optional[int] = None):
+        """Drop one role's entry, or every entry when ``role_id`` is omitted."""
+        with self._lock:
+            self._version += 1
+            if role_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(role_id, None)
+
+
+permission_cache = PermissionCache(ttl=settings.PERMISSION_CACHE_TTL)
@@ -1,16 +1,9 @@
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.database.database import SessionLocal
-from app.models.user import User, Role, Permission, role_permissions
-from app.core.auth import get_current_user
-
-def get_db():
-    """Dependency to get DB session."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from app.database.database import get_db
+from app.models.user import User
+from app.core.auth import get_current_user, get_current_user_stateless
+from app.core.permission_cache import permission_cache
 
 def require_role(required_role: str):
     """Dependency to restrict route access based on user role."""
@@ -18,7 +11,7 @@ def require_role(required_role: str):
         current_user: User = Depends(get_current_user), 
         db: Session = Depends(get_db)
     ):
-        user_role = db.query(Role).filter(Role.id == current_user.role_id).first()
+        user_role = permission_cache.get(db, current_user.role_id)
 
         if not user_role:
             raise HTTPException(
@@ -27,24 +20,31 @@ def require_role(required_role: str):
             )
 
         # ✅ Ensure the user has the correct role
-        if user_role.name.lower() != required_role.lower():
+        if user_role.role_name.lower() != required_role.lower():
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Required role: {required_role}, but user has role: {user_role.name}"
+                detail=f"Access denied. Required role: {required_role}, but user has role: {user_role.role_name}"
             )
 
-        print(f"✅ Access granted: {current_user.email} has role '{user_role.name}'")  
+        print(f"✅ Access granted: {current_user.email} has role '{user_role.role_name}'")  
         return current_user
 
     return role_dependency
 
-def require_permission(permission_name: str):
-    """Dependency to restrict route access based on user permissions."""
+def require_permission(permission_name: str, stateless: bool = False):
+    """Dependency to restrict route access based on user permissions.
+
+    With `stateless=True` the caller is authenticated from signed token claims
+    (see `get_current_user_stateless`), which suits hot read endpoints.
+    """
+    user_dependency = get_current_user_stateless if stateless else get_current_user
+
     def permission_dependency(
-        current_user: User = Depends(get_current_user), 
+        current_user: User = Depends(user_dependency), 
         db: Session = Depends(get_db)
     ):
-        user_role = db.query(Role).filter(Role.id == current_user.role_id).first()
+        # ✅ Cached role → permission set; hits the DB only on a miss or after invalidation
+        user_role = permission_cache.get(db, current_user.role_id)
 
         if not user_role:
             raise HTTPException(
@@ -52,22 +52,13 @@ def require_permission(permission_name: str):
                 detail="User role not found"
             )
 
-        # ✅ FIX: Join `role_permissions` correctly to check if the role has the required permission
-        permission_exists = (
-            db.query(Permission)
-            .join(role_permissions)  # ✅ Correct join with the association table
-            .join(Role)
-            .filter(Role.id == user_role.id, Permission.name == permission_name)
-            .first()
-        )
-
-        if not permission_exists:
+        if permission_name not in user_role.permissions:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Missing permission: {permission_name} for role {user_role.name}"
+                detail=f"Access denied. Missing permission: {permission_name} for role {user_role.role_name}"
             )
 
-        print(f"✅ Access granted: {current_user.email} with role '{user_role.name}' has permission '{permission_name}'")
+        print(f"✅ Access granted: {current_user.email} with role '{user_role.role_name}' has permission '{permission_name}'")
         return current_user
 
     return permission_dependency
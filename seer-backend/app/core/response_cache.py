@@ -0,0 +1,134 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from fastapi import Request, Response
+from app.config.settings import settings
+from app.core.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+
+# ✅ Backends: anything with get/set/incr
+class MemoryCacheBackend:
+    """In-process LRU with per-entry TTL (counters are kept outside the LRU)."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key in self._counters:
+                return str(self._counters[key]).encode()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl if ttl else None, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class RedisCacheBackend:
+    """Redis (or any Redis-compatible server); shared by every API process."""
+
+    def __init__(self, url: str):
+        import redis  # Optional dependency, only needed for this backend
+
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        self._client.set(key, value, px=int(ttl * 1000) if ttl else None)
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(key)
+
+
+class ResponseCache:
+    """Read-through cache for JSON read endpoints, with ETag / 304 support.
+
+    Entries live under a namespace whose version is part of every key, so
+    ``invalidate(namespace)`` drops all of its entries at once by bumping the
+    version. With the Redis backend that invalidation is seen by every process;
+    with the in-process backend other processes catch up within the TTL.
+    """
+
+    def __init__(self, backend, default_ttl: float = 30.0):
+        self.backend = backend
+        self.default_ttl = default_ttl
+
+    def _version(self, namespace: str) -> str:
+        version = self.backend.get(f"cache-version:{namespace}")
+        return version.decode() if version else "0"
+
+    def invalidate(self, *namespaces: str):
+        for namespace in namespaces:
+            try:
+                self.backend.incr(f"cache-version:{namespace}")
+            except Exception:
+                logger.exception("❌ Failed to invalidate response cache namespace %s", namespace)
+
+    def respond(self, request: Request, namespace: str, produce: Callable[[], Any], ttl: Optional[float] = None) -> Response:
+        """Serve ``produce()`` as JSON from the cache (304 when the client's ETag still matches).
+
+        Entries are keyed by namespace version, path and query string.
+        """
+        body = None
+        try:
+            key = f"cache:{namespace}:{self._version(namespace)}:{request.url.path}?{request.url.query}"
+            body = self.backend.get(key)
+        except Exception:
+            key = None
+            logger.exception("❌ Response cache read failed, serving uncached")
+
+        if body is None:
+            body = dumps(produce())
+            if key is not None:
+                try:
+                    self.backend.set(key, body, ttl or self.default_ttl)
+                except Exception:
+                    logger.exception("❌ Response cache write failed")
+
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+def create_backend():
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        try:
+            return RedisCacheBackend(settings.RESPONSE_CACHE_REDIS_URL)
+        except ImportError:
+            print("⚠️ RESPONSE_CACHE_BACKEND=redis but the redis package is not installed; using memory")
+    return MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+response_cache = ResponseCache(create_backend(), default_ttl=settings.RESPONSE_CACHE_TTL)
+
+# Namespaces invalidated by the mutation routes
+RBAC_NAMESPACE = "rbac"  # Roles, permissions and user counts (admin.py / iam.py / registration)
+THREAT_STATS_NAMESPACE = "threat-stats"
@@ -0,0 +1,248 @@
+import logging
+import math
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from sqlalchemy import delete, select, update, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.config.settings import settings
+from app.database.database import engine
+from app.models.threat_log import ThreatLog
+from app.models.threat_rollup import ThreatRollup
+
+logger = logging.getLogger(__name__)
+
+# Bucket width of each stored resolution, finest first
+RESOLUTIONS = {"minute": 60, "hour": 3600, "day": 86400}
+# Row field each rollup dimension is keyed on
+DIMENSIONS = {"severity": "severity", "type": "type", "source": "source_ip"}
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def floor_time(timestamp: datetime, seconds: int) -> datetime:
+    """Start of the ``seconds``-wide bucket containing ``timestamp`` (naive UTC)."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    offset = int((timestamp - _EPOCH).total_seconds()) // seconds * seconds
+    return _EPOCH + timedelta(seconds=offset)
+
+
+def pick_resolution(span_seconds: float, max_points: int) -> str:
+    """Finest stored resolution that covers ``span_seconds`` in at most ``max_points`` buckets."""
+    for resolution, width in RESOLUTIONS.items():
+        if span_seconds / width <= max_points:
+            return resolution
+    return "day"
+
+
+class ThreatRollupAggregator:
+    """Per-minute/hour/day threat counts by severity, type and source.
+
+    Registered as an ingest listener: incoming rows only bump an in-memory
+    counter, which a background thread upserts into ``threat_rollups`` every
+    ``flush_interval`` seconds. Reads merge the not-yet-flushed deltas so the
+    time series is current without waiting for a flush.
+    """
+
+    def __init__(self, engine: Engine, flush_interval: float = 5.0, retention_days: Dict[str, int] = None):
+        self.engine = engine
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days or {}
+        self._pending: Counter = Counter()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ✅ Incremental updates
+    def record(self, rows: List[Dict]):
+        """Ingest listener: add each row to every resolution/dimension bucket."""
+        deltas = Counter()
+        for row in rows:
+            timestamp = row.get("timestamp") or datetime.utcnow()
+            for resolution, width in RESOLUTIONS.items():
+                bucket = floor_time(timestamp, width)
+                for dimension, field in DIMENSIONS.items():
+                    deltas[(resolution, dimension, bucket, str(row[field]))] += 1
+        with self._lock:
+            self._pending.update(deltas)
+
+    def flush(self) -> int:
+        """Upsert the pending deltas; returns the number of buckets written."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, Counter()
+            if not pending:
+                return 0
+            try:
+                with self.engine.begin() as conn:
+                    self._upsert(conn, pending)
+            except Exception:
+                with self._lock:
+                    self._pending.update(pending)  # Retry on the next flush
+                raise
+            return len(pending)
+
+    def _upsert(self, conn, pending: Counter):
+        rows = [
+            {"resolution": resolution, "dimension": dimension, "bucket": bucket, "value": value, "count": count}
+            for (resolution, dimension, bucket, value), count in pending.items()
+        ]
+        dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(conn.dialect.name)
+        if dialect is None:
+            # Portable fallback: update, then insert whatever didn't exist yet
+            table = ThreatRollup.__table__
+            for row in rows:
+                result = conn.execute(
+                    update(table)
+                    .where(table.c.resolution == row["resolution"], table.c.dimension == row["dimension"],
+                           table.c.bucket == row["bucket"], table.c.value == row["value"])
+                    .values(count=table.c.count + row["count"])
+                )
+                if result.rowcount == 0:
+                    conn.execute(insert(table), row)
+            return
+
+        statement = dialect.insert(ThreatRollup.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=["resolution", "dimension", "bucket", "value"],
+            set_={"count": ThreatRollup.__table__.c.count + statement.excluded.count},
+        )
+        conn.execute(statement, rows)
+
+    def prune(self, now: datetime = None) -> int:
+        """Delete buckets older than each resolution's retention."""
+        now = now or datetime.utcnow()
+        deleted = 0
+        with self.engine.begin() as conn:
+            for resolution, days in self.retention_days.items():
+                if days:
+                    deleted += conn.execute(
+                        delete(ThreatRollup).where(
+                            ThreatRollup.resolution == resolution,
+                            ThreatRollup.bucket < now - timedelta(days=days),
+                        )
+                    ).rowcount
+        return deleted
+
+    def backfill(self, db: Session, since: datetime) -> int:
+        """Rebuild rollups from raw ``threat_logs`` rows newer than ``since`` (aligned to the day)."""
+        since = floor_time(since, RESOLUTIONS["day"])
+        db.execute(delete(ThreatRollup).where(ThreatRollup.bucket >= since))
+        db.commit()
+        query = (
+            db.query(ThreatLog.severity, ThreatLog.type, ThreatLog.source_ip, ThreatLog.timestamp)
+            .filter(ThreatLog.timestamp >= since)
+            .yield_per(1000)
+        )
+        replayed = 0
+        for severity, threat_type, source_ip, timestamp in query:
+            self.record([{"severity": severity, "type": threat_type, "source_ip": source_ip, "timestamp": timestamp}])
+            replayed += 1
+        self.flush()
+        return replayed
+
+    # ✅ Background flusher
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="threat-rollups", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        last_prune = datetime.min
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+                if datetime.utcnow() - last_prune > timedelta(hours=1):
+                    self.prune()
+                    last_prune = datetime.utcnow()
+            except Exception:
+                logger.exception("❌ Threat rollup flush failed")
+
+    # ✅ Reads
+    def series(
+        self,
+        db: Session,
+        dimension: str,
+        start: datetime,
+        end: datetime,
+        max_points: int = 200,
+        resolution: str = None,
+        values: List[str] = None,
+        top: int = 10,
+    ) -> Dict:
+        """Time series of counts per ``dimension`` value, downsampled to about ``max_points`` buckets.
+
+        ``resolution`` defaults to the finest stored one that fits; buckets are
+        then merged into steps that are whole multiples of it. Only the ``top``
+        values by total count are returned unless ``values`` is given.
+        """
+        span = (end - start).total_seconds()
+        resolution = resolution or pick_resolution(span, max_points)
+        width = RESOLUTIONS[resolution]
+        step = width * max(1, math.ceil(span / width / max_points))
+        first = floor_time(start, step)
+        lowest = floor_time(start, width)
+
+        counts = Counter()
+        buckets_query = select(ThreatRollup.bucket, ThreatRollup.value, ThreatRollup.count).where(
+            ThreatRollup.resolution == resolution,
+            ThreatRollup.dimension == dimension,
+            ThreatRollup.bucket >= lowest,
+            ThreatRollup.bucket <= end,
+        )
+        if values:
+            buckets_query = buckets_query.where(ThreatRollup.value.in_(values))
+        # ✅ Read the table and the unflushed deltas together so a concurrent flush isn't counted twice
+        with self._flush_lock:
+            stored = db.execute(buckets_query).all()
+            with self._lock:
+                pending = list(self._pending.items())
+        for bucket, value, count in stored:
+            counts[(floor_time(bucket, step), value)] += count
+        for (key_resolution, key_dimension, bucket, value), count in pending:
+            if key_resolution == resolution and key_dimension == dimension and lowest <= bucket <= end:
+                if not values or value in values:
+                    counts[(floor_time(bucket, step), value)] += count
+
+        buckets = []
+        current = first
+        while current <= end:
+            buckets.append(current)
+            current += timedelta(seconds=step)
+
+        totals = Counter()
+        for (_, value), count in counts.items():
+            totals[value] += count
+        selected = values or [value for value, _ in totals.most_common(top)]
+
+        return {
+            "dimension": dimension,
+            "resolution": resolution,
+            "step_seconds": step,
+            "buckets": [bucket.isoformat() for bucket in buckets],
+            "series": {value: [counts.get((bucket, value), 0) for bucket in buckets] for value in selected},
+        }
+
+
+threat_rollups = ThreatRollupAggregator(
+    engine,
+    flush_interval=settings.ROLLUP_FLUSH_INTERVAL,
+    retention_days={
+        "minute": settings.ROLLUP_MINUTE_RETENTION_DAYS,
+        "hour": settings.ROLLUP_HOUR_RETENTION_DAYS,
+    },
+)
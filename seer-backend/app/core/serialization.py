@@ -0,0 +1,45 @@
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, Sequence
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # ✅ Safety net only: orjson is a listed requirement
+    orjson = None
+
+
+def _default(value: Any):
+    # orjson handles datetimes, dataclasses and UUIDs natively; anything else
+    # (enums, Decimal, Pydantic models) goes through FastAPI's encoder
+    return jsonable_encoder(value)
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ``content`` to JSON bytes with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=lambda value: value.isoformat() if isinstance(value, (date, datetime)) else _default(value),
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (or the stdlib encoder when orjson is missing)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def rows_response(columns: Sequence[str], rows: Iterable[Sequence[Any]], **kwargs) -> FastJSONResponse:
+    """Serialize projected row tuples straight to a JSON array of objects.
+
+    Skips building one ORM object and one Pydantic model per row, which
+    dominates the cost of large list responses.
+    """
+    return FastJSONResponse([dict(zip(columns, row)) for row in rows], **kwargs)
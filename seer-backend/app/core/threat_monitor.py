@@ -1,39 +1,180 @@
-import random
+import logging
+import threading
 import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
 from sqlalchemy.orm import Session
+from app.config.settings import settings
 from app.database.database import SessionLocal
 from app.models.threat import ThreatLog
 
+logger = logging.getLogger(__name__)
+
 # Thresholds for Automated Alerts
 CRITICAL_THRESHOLD = 5  # If 5+ critical threats occur in 10 minutes, trigger an alert
 HIGH_THRESHOLD = 10      # If 10+ high threats occur in 10 minutes, trigger an alert
 
-def analyze_threats():
-    """Analyzes recent threats & triggers alerts if needed."""
-    db: Session = SessionLocal()
+ALERT_THRESHOLDS = {"Critical": CRITICAL_THRESHOLD, "High": HIGH_THRESHOLD}
+ALERT_MESSAGES = {
+    "Critical": "🚨 ALARM: Multiple Critical Threats Detected!",
+    "High": "⚠️ WARNING: High Number of Threats Detected!",
+}
+
+
+def _epoch_seconds(timestamp: Optional[datetime]) -> int:
+    """Whole seconds since the epoch; naive timestamps are treated as UTC."""
+    if timestamp is None:
+        return int(time.time())
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return int(timestamp.timestamp())
+
+
+class SlidingWindowCounter:
+    """Event count over the last ``window_seconds`` using a ring of 1-second buckets.
+
+    Adding an event and reading the total are O(1) amortised; expired buckets
+    are cleared lazily as time advances.
+    """
+
+    def __init__(self, window_seconds: int):
+        self.window_seconds = window_seconds
+        self._counts = [0] * window_seconds
+        self._head = 0  # Newest second the ring has been advanced to
+        self._total = 0
+
+    def _advance(self, now: int):
+        if now <= self._head:
+            return
+        for second in range(max(self._head + 1, now - self.window_seconds + 1), now + 1):
+            slot = second % self.window_seconds
+            self._total -= self._counts[slot]
+            self._counts[slot] = 0
+        self._head = now
+
+    def add(self, second: int, count: int = 1, now: Optional[int] = None):
+        now = int(time.time()) if now is None else now
+        self._advance(now)
+        second = min(second, now)  # Clock skew: never count into the future
+        if second <= now - self.window_seconds:
+            return  # Older than the window
+        self._counts[second % self.window_seconds] += count
+        self._total += count
+
+    def total(self, now: Optional[int] = None) -> int:
+        self._advance(int(time.time()) if now is None else now)
+        return self._total
+
 
-    # Get latest 10-minute threat logs
-    recent_threats = db.query(ThreatLog).filter(ThreatLog.timestamp >= func.now() - func.interval("10 minutes")).all()
+class SlidingWindowDetector:
+    """Streaming replacement for the old 10-minute polling loop.
 
-    # Count threats by severity
-    critical_count = sum(1 for threat in recent_threats if threat.severity == "Critical")
-    high_count = sum(1 for threat in recent_threats if threat.severity == "High")
+    Fed directly by the ingest path, it keeps a sliding-window counter per
+    alerting severity and fires as soon as a threshold is crossed. An alert
+    re-arms once the count falls back under its threshold.
+    """
 
-    if critical_count >= CRITICAL_THRESHOLD:
-        print("🚨 ALARM: Multiple Critical Threats Detected!")
-        # Potential Future Enhancement: Send an automated alert (Email, Slack, etc.)
+    def __init__(self, thresholds: Dict[str, int] = None, window_seconds: int = 600):
+        self.thresholds = dict(thresholds or ALERT_THRESHOLDS)
+        self.window_seconds = window_seconds
+        self._counters = {severity: SlidingWindowCounter(window_seconds) for severity in self.thresholds}
+        self._armed = {severity: True for severity in self.thresholds}
+        self._handlers: List[Callable[[Dict], None]] = [_print_alert]
+        self._lock = threading.Lock()
+        self.recent_alerts = deque(maxlen=100)
 
-    if high_count >= HIGH_THRESHOLD:
-        print("⚠️ WARNING: High Number of Threats Detected!")
+    def add_handler(self, handler: Callable[[Dict], None]):
+        if handler not in self._handlers:
+            self._handlers.append(handler)
 
-    db.close()
+    def observe(self, rows: List[Dict], now: Optional[int] = None):
+        """Ingest listener: count new threats and fire any crossed thresholds (``now`` in epoch seconds)."""
+        now = int(time.time()) if now is None else now
+        with self._lock:
+            self._evaluate(now)  # Re-arm anything whose window drained since the last event
+            for row in rows:
+                counter = self._counters.get(row.get("severity"))
+                if counter is not None:
+                    counter.add(_epoch_seconds(row.get("timestamp")), now=now)
+            fired = self._evaluate(now)
+        self._dispatch(fired)
+
+    def check(self, now: Optional[int] = None) -> List[Dict]:
+        """Evaluate thresholds without new events (re-arms alerts whose window drained)."""
+        now = int(time.time()) if now is None else now
+        with self._lock:
+            fired = self._evaluate(now)
+        self._dispatch(fired)
+        return fired
+
+    def counts(self, now: Optional[int] = None) -> Dict[str, int]:
+        now = int(time.time()) if now is None else now
+        with self._lock:
+            return {severity: counter.total(now) for severity, counter in self._counters.items()}
+
+    def prime(self, db: Session):
+        """Load the current window from the database (e.g. at startup)."""
+        since = datetime.utcnow() - timedelta(seconds=self.window_seconds)
+        recent = (
+            db.query(ThreatLog.severity, ThreatLog.timestamp)
+            .filter(ThreatLog.timestamp >= since, ThreatLog.severity.in_(list(self.thresholds)))
+            .all()
+        )
+        now = int(time.time())
+        with self._lock:
+            for severity, timestamp in recent:
+                self._counters[severity].add(_epoch_seconds(timestamp), now=now)
+        return self.check()
+
+    def _evaluate(self, now: int) -> List[Dict]:
+        fired = []
+        for severity, counter in self._counters.items():
+            count = counter.total(now)
+            threshold = self.thresholds[severity]
+            if count < threshold:
+                self._armed[severity] = True
+            elif self._armed[severity]:
+                self._armed[severity] = False
+                alert = {
+                    "severity": severity,
+                    "count": count,
+                    "threshold": threshold,
+                    "window_seconds": self.window_seconds,
+                    "triggered_at": datetime.utcnow().isoformat(),
+                }
+                self.recent_alerts.append(alert)
+                fired.append(alert)
+        return fired
+
+    def _dispatch(self, alerts: List[Dict]):
+        for alert in alerts:
+            for handler in self._handlers:
+                try:
+                    handler(alert)
+                except Exception:
+                    logger.exception("Threat alert handler %r failed", handler)
+
+
+def _print_alert(alert: Dict):
+    print(f"{ALERT_MESSAGES.get(alert['severity'], '⚠️ Threat threshold exceeded!')} "
+          f"({alert['count']} in {alert['window_seconds'] // 60} minutes)")
+    # Potential Future Enhancement: Send an automated alert (Email, Slack, etc.)
+
+
+threat_detector = SlidingWindowDetector(window_seconds=settings.ALERT_WINDOW_SECONDS)
+
+
+def analyze_threats():
+    """One-off check of the last window straight from the database."""
+    db: Session = SessionLocal()
+    try:
+        return SlidingWindowDetector(window_seconds=settings.ALERT_WINDOW_SECONDS).prime(db)
+    finally:
+        db.close()
 
-def monitor_threats():
-    """Continuously runs threat detection in real-time."""
-    while True:
-        analyze_threats()
-        time.sleep(600)  # Run every 10 minutes
 
 if __name__ == "__main__":
-    print("🚀 Threat Monitoring System Started...")
-    monitor_threats()
+    # Continuous detection now runs inside the API process (fed by the ingest path)
+    print("🚀 Checking the current threat window...")
+    analyze_threats()
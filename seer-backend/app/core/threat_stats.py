@@ -0,0 +1,147 @@
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config.settings import settings
+from app.database.database import SessionLocal
+from app.models.threat_log import ThreatLog
+
+logger = logging.getLogger(__name__)
+
+
+def _hour_bucket(timestamp: datetime) -> datetime:
+    return timestamp.replace(minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+class ThreatStatsCounters:
+    """Incrementally maintained aggregates behind ``GET /threats/stats``.
+
+    Counters are bumped by the ingest path and by resolves, so reading them is
+    O(1). Each API process only sees its own writes, so ``reconcile`` reloads
+    the authoritative numbers from the database periodically.
+    """
+
+    def __init__(self, bucket_hours: int = 24):
+        self.bucket_hours = bucket_hours
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._reset()
+        self.ready = False
+        self.reconciled_at: Optional[datetime] = None
+
+    def _reset(self):
+        self.total = 0
+        self.active_alerts = 0
+        self.by_severity = Counter()
+        self.by_type = Counter()
+        self.by_hour = Counter()
+
+    # ✅ Incremental updates
+    def record(self, rows: List[Dict]):
+        """Ingest listener: count newly accepted threat rows."""
+        with self._lock:
+            for row in rows:
+                self.total += 1
+                if row.get("is_alert"):
+                    self.active_alerts += 1
+                self.by_severity[row["severity"]] += 1
+                self.by_type[row["type"]] += 1
+                self.by_hour[_hour_bucket(row.get("timestamp") or datetime.utcnow())] += 1
+            self._trim_buckets()
+
+    def resolve(self, was_alert: bool):
+        """A threat was marked resolved."""
+        if was_alert:
+            with self._lock:
+                self.active_alerts = max(self.active_alerts - 1, 0)
+
+    # ✅ Periodic reconciliation against the database
+    def reconcile(self, db: Session):
+        """Replace every counter with the values currently stored in ``threat_logs``."""
+        since = _hour_bucket(datetime.utcnow()) - timedelta(hours=self.bucket_hours - 1)
+        if db.get_bind().dialect.name == "postgresql":
+            hour_column = func.date_trunc("hour", ThreatLog.timestamp)
+        else:
+            hour_column = func.strftime("%Y-%m-%d %H:00:00", ThreatLog.timestamp)
+
+        total = db.query(func.count(ThreatLog.id)).scalar()
+        active_alerts = db.query(func.count(ThreatLog.id)).filter(ThreatLog.is_alert == True).scalar()
+        by_severity = db.query(ThreatLog.severity, func.count(ThreatLog.id)).group_by(ThreatLog.severity).all()
+        by_type = db.query(ThreatLog.type, func.count(ThreatLog.id)).group_by(ThreatLog.type).all()
+        by_hour = (
+            db.query(hour_column, func.count(ThreatLog.id))
+            .filter(ThreatLog.timestamp >= since)
+            .group_by(hour_column)
+            .all()
+        )
+
+        with self._lock:
+            self._reset()
+            self.total = total
+            self.active_alerts = active_alerts
+            self.by_severity.update(dict(by_severity))
+            self.by_type.update(dict(by_type))
+            for bucket, count in by_hour:
+                if isinstance(bucket, str):
+                    bucket = datetime.fromisoformat(bucket)
+                self.by_hour[_hour_bucket(bucket)] += count
+            self.ready = True
+            self.reconciled_at = datetime.utcnow()
+
+    def ensure_ready(self):
+        """Load the counters from the database if they have never been reconciled."""
+        if self.ready:
+            return
+        db = SessionLocal()
+        try:
+            self.reconcile(db)
+        finally:
+            db.close()
+
+    def start_reconciler(self, interval: float):
+        """Reconcile every ``interval`` seconds on a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="threat-stats", daemon=True)
+        self._thread.start()
+
+    def stop_reconciler(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self, interval: float):
+        while not self._stop.wait(interval):
+            db = SessionLocal()
+            try:
+                self.reconcile(db)
+            except Exception:
+                logger.exception("❌ Threat stats reconciliation failed")
+            finally:
+                db.close()
+
+    def _trim_buckets(self):
+        oldest = _hour_bucket(datetime.utcnow()) - timedelta(hours=self.bucket_hours - 1)
+        for bucket in [bucket for bucket in self.by_hour if bucket < oldest]:
+            del self.by_hour[bucket]
+
+    # ✅ O(1) read for the stats endpoint
+    def snapshot(self) -> Dict:
+        with self._lock:
+            self._trim_buckets()
+            return {
+                "total_threats": self.total,
+                "active_alerts": self.active_alerts,
+                "severity_distribution": dict(self.by_severity),
+                "type_distribution": dict(self.by_type),
+                "hourly_counts": {bucket.isoformat(): count for bucket, count in sorted(self.by_hour.items())},
+            }
+
+
+threat_stats = ThreatStatsCounters(bucket_hours=settings.STATS_BUCKET_HOURS)
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class PoolSaturated(Exception):
+    """Raised when a bounded executor has no free worker or queue slot."""
+
+
+class BoundedExecutor:
+    """Thread pool with a hard cap on queued work.
+
+    At most ``max_workers`` jobs run and ``max_queue`` more may wait; any
+    further submission fails fast with ``PoolSaturated`` instead of piling up.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, name: str):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Running plus queued jobs."""
+        return self._in_flight
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PoolSaturated(f"{self.name} pool is saturated")
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def run(self, fn, *args, **kwargs):
+        """Run ``fn`` on the pool and block for its result."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    async def run_async(self, fn, *args, **kwargs):
+        """Run ``fn`` on the pool without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
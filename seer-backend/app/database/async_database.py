@@ -0,0 +1,55 @@
+from typing import AsyncIterator, Optional
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from app.config.settings import settings
+from app.core.metrics import instrument_engine
+
+# Sync driver → asyncio driver for the same database
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+def get_async_database_url() -> str:
+    """ASYNC_DATABASE_URL if set, otherwise DATABASE_URL with an asyncio driver."""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    scheme, rest = settings.DATABASE_URL.split("://", 1)
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+def get_async_engine() -> AsyncEngine:
+    """Create the async engine on first use, so asyncpg is only needed when enabled."""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        url = get_async_database_url()
+        engine_options = {}
+        if not url.startswith("sqlite"):
+            engine_options = {
+                "pool_size": settings.DB_POOL_SIZE,
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+                "pool_timeout": settings.DB_POOL_TIMEOUT,
+                "pool_recycle": settings.DB_POOL_RECYCLE,
+                "pool_pre_ping": settings.DB_POOL_PRE_PING,
+            }
+        _async_engine = create_async_engine(url, **engine_options)
+        instrument_engine(_async_engine.sync_engine)  # ✅ Per-request SQL metrics
+        _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False, autoflush=False)
+    return _async_engine
+
+def AsyncSessionLocal() -> AsyncSession:
+    get_async_engine()
+    return _async_session_factory()
+
+# ✅ Async dependency: one AsyncSession per request
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def dispose_async_engine():
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_session_factory = None
@@ -1,11 +1,24 @@
 from sqlalchemy import create_engine, MetaData
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config.settings import settings
+from app.database.pool_metrics import InstrumentedQueuePool
 
 DATABASE_URL = settings.DATABASE_URL
 
+# Pool settings only apply to server databases; SQLite picks its own pool
+engine_options = {}
+if not DATABASE_URL.startswith("sqlite"):
+    engine_options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
 # Create Database Engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **engine_options)
 
 # Create Session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -13,3 +26,11 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Metadata and Base
 metadata = MetaData()
 Base = declarative_base()  # ✅ This is the missing part
+
+# ✅ Shared dependency: one DB session per request
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,18 +1,54 @@
+from typing import Dict, List
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from app.models.user import Role, UserRole
+from app.models.user import Role, Permission, UserRole, role_permissions
+
+def insert_missing(db: Session, table, rows: List[Dict], index_elements: List[str]) -> int:
+    """Set-based ``INSERT ... ON CONFLICT DO NOTHING``; returns the number of rows inserted.
+
+    Other dialects fall back to one SELECT of the existing keys plus a single
+    INSERT of the missing rows. The caller owns the transaction.
+    """
+    if not rows:
+        return 0
+    dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(db.get_bind().dialect.name)
+    if dialect is not None:
+        statement = dialect.insert(table).values(rows).on_conflict_do_nothing(index_elements=index_elements)
+        return max(db.execute(statement).rowcount, 0)
+
+    key_columns = [table.c[name] for name in index_elements]
+    existing = set(db.execute(select(*key_columns)).all())
+    rows = [row for row in rows if tuple(row[name] for name in index_elements) not in existing]
+    if rows:
+        db.execute(insert(table), rows)
+    return len(rows)
 
 def seed_roles(db: Session):
-    """Ensure that default roles exist in the database."""
-    existing_roles = {role.name for role in db.query(Role).all()}
-    
-    roles_to_add = []
-    for role in UserRole:
-        if role.value not in existing_roles:
-            roles_to_add.append(Role(name=role.value))
-
-    if roles_to_add:
-        db.add_all(roles_to_add)
-        db.commit()
+    """Ensure that default roles exist in the database (one idempotent INSERT)."""
+    inserted = insert_missing(db, Role.__table__, [{"name": role} for role in UserRole], ["name"])
+    db.commit()
+
+    if inserted:
         print("✅ Roles seeded successfully!")
     else:
         print("ℹ️ Roles already exist, skipping seeding.")
+
+def seed_role_permissions(db: Session, role_permission_names: Dict[str, List[str]]) -> int:
+    """Idempotently create roles, permissions and their links from ``{role: [permission, ...]}``.
+
+    Issues a fixed number of statements regardless of how many entries are
+    seeded; nothing is committed here.
+    """
+    permission_names = sorted({name for names in role_permission_names.values() for name in names})
+    insert_missing(db, Permission.__table__, [{"name": name} for name in permission_names], ["name"])
+    insert_missing(db, Role.__table__, [{"name": UserRole[name]} for name in role_permission_names], ["name"])
+
+    role_ids = {role_name.name: role_id for role_id, role_name in db.execute(select(Role.id, Role.name))}
+    permission_ids = dict(db.execute(select(Permission.name, Permission.id).where(Permission.name.in_(permission_names))).all())
+    links = [
+        {"role_id": role_ids[UserRole[role_name].name], "permission_id": permission_ids[permission_name]}
+        for role_name, names in role_permission_names.items()
+        for permission_name in names
+    ]
+    return insert_missing(db, role_permissions, links, ["role_id", "permission_id"])
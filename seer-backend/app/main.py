@@ -1,9 +1,25 @@
 from fastapi import FastAPI
 from app.routes import auth, admin
-from app.database.database import SessionLocal
+from app.config.settings import settings
+from app.database.database import SessionLocal, engine
 from app.database.seed import seed_roles
+from app.core.threat_ai import model_registry
+from app.core.ingest import threat_ingestor
+from app.core.audit_logger import audit_writer
+from app.core.threat_stats import threat_stats
+from app.core.threat_monitor import threat_detector
+from app.core.rollups import threat_rollups
+from app.core.ip_index import source_ip_index
+from app.core.feed_sync import feed_sync
+from app.core.indicators import indicator_store, store_feed_indicators
+from app.core.broadcast import threat_broadcaster
+from app.core.metrics import MetricsMiddleware, instrument_engine
+import asyncio
+import threading
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import iam, threats
+from fastapi.concurrency import run_in_threadpool
+from app.database.async_database import dispose_async_engine
+from app.routes import iam, threats, threat_intelligence, metrics
 
 
 app = FastAPI()
@@ -15,13 +31,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # ✅ Allow all HTTP methods (GET, POST, PUT, DELETE, etc.)
     allow_headers=["*"],  # ✅ Allow all headers
+    expose_headers=["X-Next-Cursor", "ETag"],  # ✅ Let the dashboard read the pagination cursor and ETags
 )
 
+# ✅ Per-route latency and SQL statement metrics, scraped from /metrics
+if settings.METRICS_ENABLED:
+    instrument_engine(engine)
+    app.add_middleware(MetricsMiddleware)
+
+# ✅ Async handlers are registered first so they take precedence over their sync twins
+if settings.DB_ASYNC_ENABLED:
+    from app.routes import auth_async, threats_async
+    app.include_router(auth_async.router)
+    app.include_router(threats_async.router)
+
 app.include_router(auth.router, prefix="")
 app.include_router(admin.router, prefix="")
 
 app.include_router(iam.router)
 app.include_router(threats.router)
+app.include_router(threat_intelligence.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -34,5 +64,44 @@ def on_startup():
     db = SessionLocal()
     try:
         seed_roles(db)
+        threat_detector.prime(db)  # ✅ Start the sliding window from the last 10 minutes
+        indicator_store.load(db)  # ✅ Known-bad indicators for ingest-time matching
     finally:
         db.close()
+
+    # ✅ Train or load the risk-scoring model once, not per request (and off the startup path)
+    if settings.THREAT_MODEL_PRELOAD == "eager":
+        model_registry.load()
+    elif settings.THREAT_MODEL_PRELOAD == "background":
+        threading.Thread(target=model_registry.get, name="threat-model-preload", daemon=True).start()
+
+    # ✅ Start the buffered threat ingestion pipeline; it keeps the stats counters current
+    threat_ingestor.add_enricher(indicator_store.enrich)
+    threat_ingestor.add_listener(threat_stats.record)
+    threat_ingestor.add_listener(threat_detector.observe)
+    threat_ingestor.add_listener(threat_rollups.record)
+    threat_ingestor.add_listener(source_ip_index.record)
+    threat_ingestor.add_listener(threat_broadcaster.publish)
+    threat_ingestor.start()
+    threat_rollups.start()
+    audit_writer.start()
+    threat_stats.start_reconciler(settings.STATS_RECONCILE_INTERVAL)
+    source_ip_index.start_reloader(settings.IP_INDEX_RELOAD_INTERVAL)
+
+# ✅ Event-loop services: external feed sync and the SSE broadcaster
+@app.on_event("startup")
+async def on_async_startup():
+    threat_broadcaster.attach(asyncio.get_running_loop())  # ✅ SSE fan-out runs on this loop
+    feed_sync.add_listener(store_feed_indicators)
+    feed_sync.start()
+
+# ✅ Flush buffered threat logs before the worker exits
+@app.on_event("shutdown")
+async def on_shutdown():
+    await feed_sync.stop()
+    await run_in_threadpool(threat_ingestor.stop)
+    await run_in_threadpool(audit_writer.stop)  # ✅ Queued audit entries reach the DB (or the fallback file)
+    await run_in_threadpool(threat_rollups.stop)
+    await run_in_threadpool(threat_stats.stop_reconciler)
+    await run_in_threadpool(source_ip_index.stop_reloader)
+    await dispose_async_engine()
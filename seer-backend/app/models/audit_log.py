@@ -9,9 +9,9 @@ class AuditLog(Base):
     id = Column(Integer, primary_key=True, index=True)
     admin_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     action = Column(String, nullable=False)
-    target_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    target_role_id = Column(Integer, ForeignKey("roles.id"), nullable=True)
-    target_permission_id = Column(Integer, ForeignKey("permissions.id"), nullable=True)
+    target_user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    target_role_id = Column(Integer, ForeignKey("roles.id", ondelete="SET NULL"), nullable=True)
+    target_permission_id = Column(Integer, ForeignKey("permissions.id", ondelete="SET NULL"), nullable=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
 
     admin = relationship("User", foreign_keys=[admin_id])
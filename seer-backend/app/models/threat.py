@@ -1,13 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
-from sqlalchemy.sql import func
-from app.database.database import Base
+# ✅ `threat_logs` is mapped once, in app.models.threat_log. Mapping it twice on the
+# same metadata fails as soon as both modules are imported by the app.
+from app.models.threat_log import ThreatLog
 
-class ThreatLog(Base):
-    __tablename__ = "threat_logs"
-
-    id = Column(Integer, primary_key=True, index=True)
-    type = Column(String, nullable=False)
-    severity = Column(String, nullable=False)
-    source_ip = Column(String, nullable=False)
-    is_alert = Column(Boolean, default=False)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+__all__ = ["ThreatLog"]
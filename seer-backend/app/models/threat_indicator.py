@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from app.database.database import Base
+
+class ThreatIndicator(Base):
+    __tablename__ = "threat_indicators"
+
+    id = Column(Integer, primary_key=True, index=True)
+    value = Column(String, nullable=False, unique=True)  # Indicator value, e.g. a known-bad IP address
+    source = Column(String, nullable=True)  # Feed URL it was last seen in
+    first_seen = Column(DateTime, default=datetime.utcnow)
+    last_seen = Column(DateTime, default=datetime.utcnow)
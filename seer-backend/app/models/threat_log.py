@@ -1,14 +1,31 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Index, text
 from sqlalchemy.sql import func
 from app.database.database import Base
+from app.core.ipv4 import ip_to_int
+
+def _source_ip_num(context):
+    return ip_to_int(context.get_current_parameters().get("source_ip"))
 
 class ThreatLog(Base):
     __tablename__ = "threat_logs"
+    __table_args__ = (
+        # ✅ Covers the time-range/severity filters and the keyset-paginated listing
+        Index("ix_threat_logs_timestamp_severity", "timestamp", "severity"),
+        Index("ix_threat_logs_type_timestamp", "type", "timestamp"),
+        Index("ix_threat_logs_timestamp_id", "timestamp", "id"),
+        # ✅ Partial index: only active alerts are indexed
+        Index(
+            "ix_threat_logs_active_alerts", "timestamp",
+            postgresql_where=text("is_alert"), sqlite_where=text("is_alert"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     type = Column(String, nullable=False)  # Threat type (e.g., DDoS, Phishing, etc.)
     severity = Column(String, nullable=False)  # Severity level (Critical, High, Medium, Low)
     source_ip = Column(String, nullable=False)  # Attacker's IP address
+    source_ip_num = Column(BigInteger, default=_source_ip_num, index=True)  # IPv4 as an integer, for CIDR range scans
     is_alert = Column(Boolean, default=True)  # Whether the threat is active
     timestamp = Column(DateTime, default=func.now())  # Time of detection
     resolved = Column(Boolean, default=False)  # Whether it has been marked as resolved
+    indicator_match = Column(Boolean, default=False)  # Source IP is a known indicator from a threat feed
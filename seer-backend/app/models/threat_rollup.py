@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from app.database.database import Base
+
+class ThreatRollup(Base):
+    __tablename__ = "threat_rollups"
+    __table_args__ = (
+        # ✅ One row per bucket and dimension value; also serves the time-series range scans
+        UniqueConstraint("resolution", "dimension", "bucket", "value", name="uq_threat_rollups_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    resolution = Column(String, nullable=False)  # minute, hour or day
+    dimension = Column(String, nullable=False)  # severity, type or source
+    bucket = Column(DateTime, nullable=False)  # Start of the time bucket (UTC)
+    value = Column(String, nullable=False)  # e.g. "Critical", "DDoS Attack", "10.0.0.1"
+    count = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, Enum, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Enum, Boolean, DateTime
 from sqlalchemy.orm import relationship
 from app.database.database import Base
 import enum
@@ -24,6 +24,7 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
     role_id = Column(Integer, ForeignKey("roles.id"), nullable=False, default=2)  # Default to USER role
+    tokens_valid_after = Column(DateTime, nullable=True)  # Set on logout; older tokens are rejected
 
     role = relationship("Role", back_populates="users")
 
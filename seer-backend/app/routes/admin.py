@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session, joinedload
-from app.database.database import SessionLocal
-from app.models.user import User, Role, Permission
+from app.database.database import get_db
+from app.models.user import User, Role, Permission, UserRole
+from app.schemas.user import AdminUserSchema
 from app.core.permissions import require_permission
+from app.core.permission_cache import permission_cache
+from app.core.auth import invalidate_user
+from app.core.response_cache import response_cache, RBAC_NAMESPACE
+from app.core.audit_logger import log_audit_action
 from pydantic import BaseModel
+from typing import List
 import logging
 
 # ✅ Initialize Router
@@ -13,15 +19,6 @@ router = APIRouter(prefix="/admin", tags=["Admin"])
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# ✅ Dependency to get DB session
-def get_db():
-    """Provides a database session."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # ✅ Schema for creating roles
 class RoleCreateRequest(BaseModel):
     name: str
@@ -32,51 +29,66 @@ class PermissionAssignRequest(BaseModel):
     permission_name: str
 
 # ✅ Admin Dashboard Statistics
-@router.get("/stats", dependencies=[Depends(require_permission("VIEW_ADMIN_STATS"))])
-def get_admin_stats(db: Session = Depends(get_db)):
-    """Fetch admin dashboard stats"""
-
-    total_users = db.query(User).count()
-    total_admins = db.query(User).join(Role).filter(Role.name == "ADMIN").count()
-    total_roles = db.query(Role).count()
-    total_permissions = db.query(Permission).count()
-
-    stats = {
-        "total_users": total_users,
-        "total_admins": total_admins,
-        "total_roles": total_roles,
-        "total_permissions": total_permissions,
-        "message": "Admin stats fetched successfully"
-    }
-    
-    logger.info(f"✅ Admin Stats Retrieved: {stats}")  # ✅ Logging
-    
-    return stats
+@router.get("/stats", dependencies=[Depends(require_permission("VIEW_ADMIN_STATS", stateless=True))])
+def get_admin_stats(request: Request, db: Session = Depends(get_db)):
+    """Fetch admin dashboard stats (served from the response cache until an RBAC change)"""
+
+    def load_stats():
+        total_users = db.query(User).count()
+        total_admins = db.query(User).join(Role).filter(Role.name == "ADMIN").count()
+        total_roles = db.query(Role).count()
+        total_permissions = db.query(Permission).count()
+
+        stats = {
+            "total_users": total_users,
+            "total_admins": total_admins,
+            "total_roles": total_roles,
+            "total_permissions": total_permissions,
+            "message": "Admin stats fetched successfully"
+        }
+
+        logger.info(f"✅ Admin Stats Retrieved: {stats}")  # ✅ Logging
+        return stats
+
+    return response_cache.respond(request, RBAC_NAMESPACE, load_stats)
 
 # ✅ Get all users (requires "MANAGE_USERS" permission)
-@router.get("/users", dependencies=[Depends(require_permission("MANAGE_USERS"))])
+@router.get("/users", response_model=List[AdminUserSchema], dependencies=[Depends(require_permission("MANAGE_USERS", stateless=True))])
 def get_all_users(
     db: Session = Depends(get_db),
     role: str = Query(None, description="Filter users by role")
 ):
-    """Fetch all users, optionally filter by role."""
+    """Fetch all users, optionally filter by role (password hashes are never selected)."""
     
-    query = db.query(User).options(joinedload(User.role))
+    query = (
+        db.query(User.id, User.username, User.email, User.is_active, User.role_id, Role.name)
+        .join(Role, User.role_id == Role.id)
+        .order_by(User.id)
+    )
 
     if role:
-        role_obj = db.query(Role).filter(Role.name == role.upper()).first()
-        if not role_obj:
+        if role.upper() not in UserRole.__members__:
             raise HTTPException(status_code=400, detail="Invalid role filter")
-        query = query.filter(User.role_id == role_obj.id)
-
-    users = query.all()
+        query = query.filter(Role.name == role.upper())
+
+    users = [
+        {
+            "id": user_id,
+            "username": username,
+            "email": email,
+            "is_active": bool(is_active),
+            "role_id": role_id,
+            "role": {"id": role_id, "name": role_name},
+        }
+        for user_id, username, email, is_active, role_id, role_name in query
+    ]
 
     logger.info(f"✅ Retrieved {len(users)} Users")  # ✅ Logging
     return users
 
 # ✅ Change user role (requires "MANAGE_USERS" permission)
-@router.put("/users/{user_id}/role", dependencies=[Depends(require_permission("MANAGE_USERS"))])
-def change_user_role(user_id: int, new_role: str, db: Session = Depends(get_db)):
+@router.put("/users/{user_id}/role")
+def change_user_role(user_id: int, new_role: str, db: Session = Depends(get_db), current_user: User = Depends(require_permission("MANAGE_USERS"))):
     """Update a user's role, ensuring the role exists in DB."""
     
     user = db.query(User).filter(User.id == user_id).first()
@@ -91,13 +103,16 @@ def change_user_role(user_id: int, new_role: str, db: Session = Depends(get_db))
     # ✅ Assign correct role_id
     user.role_id = role.id
     db.commit()
+    invalidate_user(user.id)
+    response_cache.invalidate(RBAC_NAMESPACE)
+    log_audit_action(db, current_user.id, "CHANGE_USER_ROLE", target_user_id=user.id, target_role_id=role.id)
     db.refresh(user)
 
     logger.info(f"✅ User {user.email} role updated to {new_role.upper()}")  # ✅ Logging
     return {"message": f"User {user.email} role updated to {new_role.upper()}"}
 
 # ✅ Get all roles (requires "MANAGE_ROLES" permission)
-@router.get("/roles", dependencies=[Depends(require_permission("MANAGE_ROLES"))])
+@router.get("/roles", dependencies=[Depends(require_permission("MANAGE_ROLES", stateless=True))])
 def get_all_roles(db: Session = Depends(get_db)):
     """Fetch all available roles."""
     roles = db.query(Role).all()
@@ -106,8 +121,8 @@ def get_all_roles(db: Session = Depends(get_db)):
     return roles
 
 # ✅ Create a new role (requires "MANAGE_ROLES" permission)
-@router.post("/roles", dependencies=[Depends(require_permission("MANAGE_ROLES"))])
-def create_role(role_data: RoleCreateRequest, db: Session = Depends(get_db)):
+@router.post("/roles")
+def create_role(role_data: RoleCreateRequest, db: Session = Depends(get_db), current_user: User = Depends(require_permission("MANAGE_ROLES"))):
     """Create a new role if it doesn't exist."""
     
     role_name = role_data.name.upper()  # ✅ Normalize case
@@ -120,13 +135,16 @@ def create_role(role_data: RoleCreateRequest, db: Session = Depends(get_db)):
     db.add(new_role)
     db.commit()
     db.refresh(new_role)
+    permission_cache.invalidate(new_role.id)
+    response_cache.invalidate(RBAC_NAMESPACE)
+    log_audit_action(db, current_user.id, "CREATE_ROLE", target_role_id=new_role.id)
 
     logger.info(f"✅ Role '{new_role.name}' created successfully")  # ✅ Logging
     return {"message": f"Role '{new_role.name}' created successfully"}
 
 # ✅ Delete a role (requires "MANAGE_ROLES" permission)
-@router.delete("/roles/{role_id}", dependencies=[Depends(require_permission("MANAGE_ROLES"))])
-def delete_role(role_id: int, db: Session = Depends(get_db)):
+@router.delete("/roles/{role_id}")
+def delete_role(role_id: int, db: Session = Depends(get_db), current_user: User = Depends(require_permission("MANAGE_ROLES"))):
     """Delete a role if it's not 'ADMIN' and has no users assigned."""
     
     role = db.query(Role).filter(Role.id == role_id).first()
@@ -142,13 +160,16 @@ def delete_role(role_id: int, db: Session = Depends(get_db)):
 
     db.delete(role)
     db.commit()
+    permission_cache.invalidate(role_id)
+    response_cache.invalidate(RBAC_NAMESPACE)
+    log_audit_action(db, current_user.id, f"DELETE_ROLE {role.name}")  # ✅ Row is gone, so no role FK
 
     logger.info(f"✅ Role '{role.name}' deleted successfully")  # ✅ Logging
     return {"message": f"Role '{role.name}' deleted successfully"}
 
 # ✅ Assign a permission to a role (requires "MANAGE_PERMISSIONS" permission)
-@router.post("/permissions", dependencies=[Depends(require_permission("MANAGE_PERMISSIONS"))])
-def assign_permission(request: PermissionAssignRequest, db: Session = Depends(get_db)):
+@router.post("/permissions")
+def assign_permission(request: PermissionAssignRequest, db: Session = Depends(get_db), current_user: User = Depends(require_permission("MANAGE_PERMISSIONS"))):
     """Assign a permission to a role."""
     
     role = db.query(Role).options(joinedload(Role.permissions)).filter(Role.name == request.role_name.upper()).first()
@@ -165,13 +186,16 @@ def assign_permission(request: PermissionAssignRequest, db: Session = Depends(ge
 
     role.permissions.append(permission)
     db.commit()
+    permission_cache.invalidate(role.id)
+    response_cache.invalidate(RBAC_NAMESPACE)
+    log_audit_action(db, current_user.id, "ASSIGN_PERMISSION", target_role_id=role.id, target_permission_id=permission.id)
 
     logger.info(f"✅ Permission '{request.permission_name}' assigned to role '{request.role_name}'")  # ✅ Logging
     return {"message": f"Permission '{request.permission_name}' assigned to role '{request.role_name}'"}
 
 # ✅ Remove a permission from a role (requires "MANAGE_PERMISSIONS" permission)
-@router.delete("/permissions", dependencies=[Depends(require_permission("MANAGE_PERMISSIONS"))])
-def remove_permission(request: PermissionAssignRequest, db: Session = Depends(get_db)):
+@router.delete("/permissions")
+def remove_permission(request: PermissionAssignRequest, db: Session = Depends(get_db), current_user: User = Depends(require_permission("MANAGE_PERMISSIONS"))):
     """Remove a permission from a role."""
     
     role = db.query(Role).options(joinedload(Role.permissions)).filter(Role.name == request.role_name.upper()).first()
@@ -187,6 +211,9 @@ def remove_permission(request: PermissionAssignRequest, db: Session = Depends(ge
 
     role.permissions.remove(permission)
     db.commit()
+    permission_cache.invalidate(role.id)
+    response_cache.invalidate(RBAC_NAMESPACE)
+    log_audit_action(db, current_user.id, "REMOVE_PERMISSION", target_role_id=role.id, target_permission_id=permission.id)
 
     logger.info(f"✅ Permission '{request.permission_name}' removed from role '{request.role_name}'")  # ✅ Logging
     return {"message": f"Permission '{request.permission_name}' removed from role '{request.role_name}'"}
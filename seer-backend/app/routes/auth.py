@@ -1,21 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.database.database import SessionLocal
+from app.database.database import get_db
 from app.models.user import User, Role
-from app.core.auth import hash_password, verify_password, create_access_token, get_current_user
+from app.core.auth import (
+    hash_password, verify_and_update_password, run_password_job, create_access_token, get_current_user, revoke_user_tokens
+)
+from app.core.response_cache import response_cache, RBAC_NAMESPACE
 from pydantic import BaseModel, EmailStr
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-# ✅ Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # ✅ Pydantic Schemas
 class RegisterRequest(BaseModel):
     username: str
@@ -50,8 +45,11 @@ def register_user(user_data: RegisterRequest, db: Session = Depends(get_db)):
     if not user_role:
         raise HTTPException(status_code=500, detail="Default USER role not found. Contact admin.")
 
+    # ✅ Return the pooled connection before the slow bcrypt call (loaded objects stay usable)
+    db.close()
+
     # ✅ Hash password and create new user
-    hashed_pw = hash_password(user_data.password)
+    hashed_pw = run_password_job(hash_password, user_data.password)
     new_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -62,6 +60,7 @@ def register_user(user_data: RegisterRequest, db: Session = Depends(get_db)):
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    response_cache.invalidate(RBAC_NAMESPACE)  # ✅ Admin user counts changed
     
     return {"message": "User registered successfully"}
 
@@ -81,13 +80,22 @@ def login_user(user_data: LoginRequest, db: Session = Depends(get_db)):
 
     print("✅ User Found:", user.email, "| Role ID:", user.role_id)
 
-    if not verify_password(user_data.password, user.hashed_password):
+    # ✅ Return the pooled connection before the slow bcrypt call (loaded objects stay usable)
+    db.close()
+
+    valid, new_hash = run_password_job(verify_and_update_password, user_data.password, user.hashed_password)
+    if not valid:
         print("🚨 Password incorrect for:", user.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
-    
+
+    # ✅ Transparent rehash when the bcrypt cost factor changed
+    if new_hash:
+        db.query(User).filter(User.id == user.id).update({User.hashed_password: new_hash})
+        db.commit()
+
     # ✅ Fetch role details
     role = db.query(Role).filter(Role.id == user.role_id).first()
     if not role:
@@ -97,7 +105,7 @@ def login_user(user_data: LoginRequest, db: Session = Depends(get_db)):
     print("✅ Role Found:", role.name)
 
     access_token = create_access_token(
-        {"sub": user.email, "role": role.name}, 
+        {"sub": user.email, "role": role.name, "uid": user.id, "rid": role.id},
         expires_delta=timedelta(minutes=60)
     )
     
@@ -119,3 +127,18 @@ def get_me(current_user: User = Depends(get_current_user), db: Session = Depends
         email=current_user.email,
         role=role.name if role else "UNKNOWN"
     )
+
+# ✅ Logout: revoke every token issued to the current user so far
+@router.post("/logout", status_code=status.HTTP_200_OK)
+def logout_user(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Revoke the current user's tokens.
+
+    Stored on the user, so every worker and restart rejects them once it
+    checks the DB; a worker that trusted the token's claims or cached the
+    user may keep accepting it for up to `AUTH_USER_CACHE_TTL` seconds.
+    """
+    revoked_at = datetime.utcnow()
+    db.query(User).filter(User.id == current_user.id).update({User.tokens_valid_after: revoked_at})
+    db.commit()
+    revoke_user_tokens(current_user.id, revoked_at.replace(tzinfo=timezone.utc).timestamp())
+    return {"message": "Logged out successfully"}
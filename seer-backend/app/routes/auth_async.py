@@ -0,0 +1,89 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.async_database import get_async_db
+from app.models.user import User, Role
+from app.core.auth import (
+    hash_password, verify_and_update_password, run_password_job_async, create_access_token, get_current_user_async
+)
+from app.core.response_cache import response_cache, RBAC_NAMESPACE
+from app.routes.auth import RegisterRequest, LoginRequest, TokenResponse, UserResponse
+from datetime import timedelta
+
+# ✅ Async twins of app/routes/auth.py, mounted ahead of it when DB_ASYNC_ENABLED is set
+router = APIRouter(prefix="/auth", tags=["Authentication"])
+
+# ✅ Register User (async)
+@router.post("/register", status_code=status.HTTP_201_CREATED)
+async def register_user(user_data: RegisterRequest, db: AsyncSession = Depends(get_async_db)):
+    """Registers a new user and assigns the default USER role"""
+    existing_user = await db.scalar(select(User.id).where(User.email == user_data.email))
+    if existing_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    user_role_id = await db.scalar(select(Role.id).where(Role.name == "USER"))
+    if not user_role_id:
+        raise HTTPException(status_code=500, detail="Default USER role not found. Contact admin.")
+
+    # ✅ bcrypt is CPU-bound; keep it off the event loop and release the connection meanwhile
+    await db.close()
+    hashed_pw = await run_password_job_async(hash_password, user_data.password)
+    db.add(User(
+        username=user_data.username,
+        email=user_data.email,
+        hashed_password=hashed_pw,
+        role_id=user_role_id
+    ))
+    await db.commit()
+    response_cache.invalidate(RBAC_NAMESPACE)  # ✅ Admin user counts changed
+
+    return {"message": "User registered successfully"}
+
+# ✅ Login User (async)
+@router.post("/login", response_model=TokenResponse, status_code=status.HTTP_200_OK)
+async def login_user(user_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    """Login endpoint - Verify user and return JWT token with role"""
+    row = (await db.execute(
+        select(User, Role).join(Role, Role.id == User.role_id).where(User.email == user_data.email)
+    )).first()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+
+    user, role = row.User, row.Role
+    await db.close()
+    valid, new_hash = await run_password_job_async(verify_and_update_password, user_data.password, user.hashed_password)
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+
+    # ✅ Transparent rehash when the bcrypt cost factor changed
+    if new_hash:
+        await db.execute(update(User).where(User.id == user.id).values(hashed_password=new_hash))
+        await db.commit()
+    access_token = create_access_token(
+        {"sub": user.email, "role": role.name, "uid": user.id, "rid": role.id},
+        expires_delta=timedelta(minutes=60)
+    )
+
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "role": role.name
+    }
+
+# ✅ Get Current User Details (async)
+@router.get("/me", response_model=UserResponse, status_code=status.HTTP_200_OK)
+async def get_me(current_user: User = Depends(get_current_user_async)):
+    """Fetch details of the currently authenticated user"""
+    return UserResponse(
+        id=current_user.id,
+        username=current_user.username,
+        email=current_user.email,
+        role=current_user.role_name
+    )
@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from app.database.database import SessionLocal
+from app.database.database import get_db
 from app.models.user import User, Role, Permission
 from app.core.permissions import require_permission
+from app.core.permission_cache import permission_cache
+from app.core.auth import invalidate_user
+from app.core.response_cache import response_cache, RBAC_NAMESPACE
+from app.core.audit_logger import log_audit_action
+from app.schemas.user import IAMUserSchema
 from pydantic import BaseModel
+from typing import List
 import logging
 
 # ✅ Setup Logger
@@ -12,14 +18,6 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/iam", tags=["Identity & Access Management"])
 
-# ✅ Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # ✅ Schema for updating roles & permissions
 class UserRoleUpdateRequest(BaseModel):
     user_id: int
@@ -30,41 +28,48 @@ class PermissionAssignRequest(BaseModel):
     permission_name: str
 
 # ✅ Fetch all users with their roles
-@router.get("/users", dependencies=[Depends(require_permission("MANAGE_USERS"))])
+@router.get("/users", response_model=List[IAMUserSchema], dependencies=[Depends(require_permission("MANAGE_USERS", stateless=True))])
 def get_all_users(db: Session = Depends(get_db)):
-    users = db.query(User).all()
+    # ✅ One joined, column-projected query instead of a lazy Role load per user
+    rows = db.query(User.id, User.email, Role.name).join(Role, User.role_id == Role.id).order_by(User.id).all()
     
-    if not users:
+    if not rows:
         logger.warning("⚠️ No users found in the system.")
     
-    logger.info(f"✅ Retrieved {len(users)} users from IAM")
-    return [{"id": user.id, "email": user.email, "role": user.role.name} for user in users]
+    logger.info(f"✅ Retrieved {len(rows)} users from IAM")
+    return [{"id": user_id, "email": email, "role": role_name} for user_id, email, role_name in rows]
 
 # ✅ Fetch all roles
-@router.get("/roles", dependencies=[Depends(require_permission("MANAGE_ROLES"))])
-def get_all_roles(db: Session = Depends(get_db)):
-    roles = db.query(Role).all()
+@router.get("/roles", dependencies=[Depends(require_permission("MANAGE_ROLES", stateless=True))])
+def get_all_roles(request: Request, db: Session = Depends(get_db)):
+    def load_roles():
+        roles = db.query(Role).all()
+
+        if not roles:
+            logger.warning("⚠️ No roles found in the system.")
 
-    if not roles:
-        logger.warning("⚠️ No roles found in the system.")
+        logger.info(f"✅ Retrieved {len(roles)} IAM Roles")
+        return [{"id": role.id, "name": role.name} for role in roles]
 
-    logger.info(f"✅ Retrieved {len(roles)} IAM Roles")
-    return [{"id": role.id, "name": role.name} for role in roles]
+    return response_cache.respond(request, RBAC_NAMESPACE, load_roles)
 
 # ✅ Fetch all permissions
-@router.get("/permissions", dependencies=[Depends(require_permission("MANAGE_PERMISSIONS"))])
-def get_all_permissions(db: Session = Depends(get_db)):
-    permissions = db.query(Permission).all()
+@router.get("/permissions", dependencies=[Depends(require_permission("MANAGE_PERMISSIONS", stateless=True))])
+def get_all_permissions(request: Request, db: Session = Depends(get_db)):
+    def load_permissions():
+        permissions = db.query(Permission).all()
+
+        if not permissions:
+            logger.warning("⚠️ No permissions found in the system.")
 
-    if not permissions:
-        logger.warning("⚠️ No permissions found in the system.")
+        logger.info(f"✅ Retrieved {len(permissions)} IAM Permissions")
+        return [{"id": perm.id, "name": perm.name} for perm in permissions]
 
-    logger.info(f"✅ Retrieved {len(permissions)} IAM Permissions")
-    return [{"id": perm.id, "name": perm.name} for perm in permissions]
+    return response_cache.respond(request, RBAC_NAMESPACE, load_permissions)
 
 # ✅ Update User Role
-@router.put("/users/role", dependencies=[Depends(require_permission("MANAGE_USERS"))])
-def update_user_role(request: UserRoleUpdateRequest, db: Session = Depends(get_db)):
+@router.put("/users/role")
+def update_user_role(request: UserRoleUpdateRequest, db: Session = Depends(get_db), current_user: User = Depends(require_permission("MANAGE_USERS"))):
     user = db.query(User).filter(User.id == request.user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -75,12 +80,15 @@ def update_user_role(request: UserRoleUpdateRequest, db: Session = Depends(get_d
 
     user.role_id = role.id
     db.commit()
+    invalidate_user(user.id)
+    response_cache.invalidate(RBAC_NAMESPACE)
+    log_audit_action(db, current_user.id, "CHANGE_USER_ROLE", target_user_id=user.id, target_role_id=role.id)
     logger.info(f"✅ User {user.email} role updated to {role.name}")
     return {"message": f"User {user.email} role updated to {role.name}"}
 
 # ✅ Assign a Permission to a Role
-@router.post("/permissions/assign", dependencies=[Depends(require_permission("MANAGE_PERMISSIONS"))])
-def assign_permission_to_role(request: PermissionAssignRequest, db: Session = Depends(get_db)):
+@router.post("/permissions/assign")
+def assign_permission_to_role(request: PermissionAssignRequest, db: Session = Depends(get_db), current_user: User = Depends(require_permission("MANAGE_PERMISSIONS"))):
     role = db.query(Role).filter(Role.name == request.role_name.upper()).first()
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
@@ -94,12 +102,15 @@ def assign_permission_to_role(request: PermissionAssignRequest, db: Session = De
 
     role.permissions.append(permission)
     db.commit()
+    permission_cache.invalidate(role.id)
+    response_cache.invalidate(RBAC_NAMESPACE)
+    log_audit_action(db, current_user.id, "ASSIGN_PERMISSION", target_role_id=role.id, target_permission_id=permission.id)
     logger.info(f"✅ Assigned permission '{request.permission_name}' to role '{request.role_name}'")
     return {"message": f"Permission '{request.permission_name}' assigned to role '{request.role_name}'"}
 
 # ✅ Remove a Permission from a Role
-@router.delete("/permissions/remove", dependencies=[Depends(require_permission("MANAGE_PERMISSIONS"))])
-def remove_permission_from_role(request: PermissionAssignRequest, db: Session = Depends(get_db)):
+@router.delete("/permissions/remove")
+def remove_permission_from_role(request: PermissionAssignRequest, db: Session = Depends(get_db), current_user: User = Depends(require_permission("MANAGE_PERMISSIONS"))):
     role = db.query(Role).filter(Role.name == request.role_name.upper()).first()
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
@@ -113,5 +124,8 @@ def remove_permission_from_role(request: PermissionAssignRequest, db: Session =
 
     role.permissions.remove(permission)
     db.commit()
+    permission_cache.invalidate(role.id)
+    response_cache.invalidate(RBAC_NAMESPACE)
+    log_audit_action(db, current_user.id, "REMOVE_PERMISSION", target_role_id=role.id, target_permission_id=permission.id)
     logger.info(f"✅ Removed permission '{request.permission_name}' from role '{request.role_name}'")
     return {"message": f"Permission '{request.permission_name}' removed from role '{request.role_name}'"}
@@ -0,0 +1,34 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.database.database import engine
+from app.database.pool_metrics import pool_metrics, pool_status
+from app.core.metrics import registry
+from app.core.ingest import threat_ingestor
+from app.core.audit_logger import audit_writer
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+# ✅ Values kept by other components, read at scrape time
+def collect_pipeline_metrics():
+    for key, value in threat_ingestor.stats.items():
+        yield f"seer_ingest_{key}_total", "counter", f"Threat ingestor {key.replace('_', ' ')}.", value
+    yield "seer_ingest_pending", "gauge", "Threat rows waiting in the ingest buffer.", threat_ingestor.pending
+    for key, value in audit_writer.stats.items():
+        yield f"seer_audit_{key}_total", "counter", f"Audit writer {key.replace('_', ' ')}.", value
+    yield "seer_audit_pending", "gauge", "Audit entries waiting to be written.", audit_writer.pending
+    pool = pool_metrics.snapshot()
+    yield "seer_db_pool_checkouts_total", "counter", "Connection pool checkouts.", pool["checkouts"]
+    yield "seer_db_pool_checkout_timeouts_total", "counter", "Connection pool checkout timeouts.", pool["checkout_timeouts"]
+    yield "seer_db_pool_checkout_wait_seconds_total", "counter", "Time spent waiting for a pooled connection.", pool["checkout_wait_seconds_total"]
+
+registry.add_collector(collect_pipeline_metrics)
+
+# ✅ Prometheus text exposition
+@router.get("", response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+# ✅ Connection pool occupancy and checkout latency
+@router.get("/db-pool")
+def get_db_pool_metrics():
+    return pool_status(engine.pool)
@@ -1,50 +1,72 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database.database import SessionLocal
+from app.config.settings import settings
+from app.database.database import get_db
 from app.models.threat import ThreatLog
-from app.core.threat_ai import analyze_threat
-import requests
+from app.schemas.threat import ThreatEventCreate
+from app.core.threat_ai import score_threat, score_threats, risk_severity
+from app.core.ingest import threat_ingestor, IngestBufferFull
+from app.core.feed_sync import feed_sync
+from typing import List
 
 router = APIRouter(prefix="/threats", tags=["Threat Intelligence"])
 
-# ✅ Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-# ✅ Fetch External Threat Intelligence Data
+# ✅ Fetch External Threat Intelligence Data (served from the background feed cache)
 @router.get("/external")
 def fetch_external_threats():
-    sources = [
-        "https://www.virustotal.com/api/v3/intelligence",
-        "https://otx.alienvault.com/api/v1/pulses",
-    ]
-    threats = []
-    
-    for source in sources:
-        try:
-            response = requests.get(source)
-            if response.status_code == 200:
-                threats.extend(response.json())
-        except Exception as e:
-            print(f"Failed to fetch data from {source}: {e}")
-    
-    return {"external_threats": threats}
+    return {"external_threats": feed_sync.cached_threats(), "feeds": feed_sync.status()}
 
 # ✅ Log Cyber Threats and Apply AI Risk Scoring
 @router.post("/log")
-def log_threat(ip_address: str, description: str, db: Session = Depends(get_db)):
-    risk_score = analyze_threat(ip_address, description)
-    new_threat = ThreatLog(ip=ip_address, description=description, risk_score=risk_score)
-    
-    db.add(new_threat)
-    db.commit()
-    db.refresh(new_threat)
-    
-    return {"message": "Threat logged successfully", "risk_score": risk_score}
+def log_threat(ip_address: str, description: str):
+    try:
+        risk_score, model_version = score_threat(ip_address, description)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    severity = risk_severity(risk_score)
+    new_threat = {
+        "type": description,
+        "severity": severity,
+        "source_ip": ip_address,
+        "is_alert": severity in ["Critical", "High"],
+    }
+
+    # ✅ Buffered write; the ingestor flushes rows in batches
+    try:
+        threat_ingestor.submit(new_threat, timeout=settings.INGEST_SUBMIT_TIMEOUT)
+    except IngestBufferFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+    return {"message": "Threat logged successfully", "risk_score": risk_score, "model_version": model_version}
+
+# ✅ Log a burst of Cyber Threats with one scoring call and one bulk write
+@router.post("/log/bulk")
+def log_threats_bulk(events: List[ThreatEventCreate]):
+    ip_addresses = [event.ip_address for event in events]
+    descriptions = [event.description for event in events]
+    try:
+        risk_scores, model_version = score_threats(ip_addresses, descriptions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    rows = []
+    for ip_address, description, risk_score in zip(ip_addresses, descriptions, risk_scores):
+        severity = risk_severity(risk_score)
+        rows.append({
+            "type": description,
+            "severity": severity,
+            "source_ip": ip_address,
+            "is_alert": severity in ["Critical", "High"],
+        })
+
+    # ✅ One COPY (Postgres) or executemany for the whole burst
+    threat_ingestor.write_rows(rows)
+
+    return {
+        "message": f"{len(rows)} threats logged successfully",
+        "risk_scores": risk_scores,
+        "model_version": model_version,
+    }
 
 # ✅ Retrieve Threat Logs
 @router.get("/logs")
@@ -1,33 +1,46 @@
 # app/routes/threats.py
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.database.database import SessionLocal
+from sqlalchemy import tuple_
+from app.database.database import SessionLocal, get_db
 from app.models.threat_log import ThreatLog
 from app.schemas.threat import ThreatLogSchema  # ✅ Import Pydantic schema
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.threat_stats import threat_stats
+from app.core.rollups import threat_rollups
+from app.core.ipv4 import cidr_to_range
+from app.core.ip_index import source_ip_index
+from app.core.broadcast import threat_broadcaster
+from app.core.response_cache import response_cache, THREAT_STATS_NAMESPACE
+from app.core.serialization import rows_response
+from app.config.settings import settings
 from datetime import datetime, timedelta
 from typing import List
+import csv
+import io
+import json
 
 router = APIRouter(prefix="/threats", tags=["Threat Intelligence"])
 
-# ✅ Dependency to get DB session
-def get_db():
-    db = SessionLocal()
+DEFAULT_PAGE_SIZE = 100
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = ["id", "type", "severity", "source_ip", "is_alert", "timestamp"]
+THREAT_LOG_COLUMNS = list(ThreatLogSchema.model_fields)  # ✅ Fast path emits exactly the schema's fields
+THREAT_LOG_FIELDS = [getattr(ThreatLog, column) for column in THREAT_LOG_COLUMNS]
+
+def parse_cidr(cidr: str):
+    """Integer bounds of an IPv4 CIDR query parameter (400 when invalid)."""
     try:
-        yield db
-    finally:
-        db.close()
+        return cidr_to_range(cidr)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=f"Invalid CIDR: {error}")
 
-# ✅ Fetch all threat logs with filtering options
-@router.get("/logs", response_model=List[ThreatLogSchema])  # ✅ Use Pydantic schema
-def get_threat_logs(
-    db: Session = Depends(get_db),
-    severity: str = Query(None, description="Filter by severity"),
-    threat_type: str = Query(None, description="Filter by type"),
-    time_range: int = Query(24, description="Time range in hours")
-):
-    """Fetch threat logs with optional filters."""
-    query = db.query(ThreatLog)
+def apply_threat_filters(query, severity: str = None, threat_type: str = None, time_range: int = None, cidr: str = None):
+    """Apply the shared `/threats/logs` filters to a ThreatLog query."""
+    if cidr:
+        first, last, _ = parse_cidr(cidr)
+        query = query.filter(ThreatLog.source_ip_num.between(first, last))  # ✅ Index range scan
     if severity:
         query = query.filter(ThreatLog.severity == severity)
     if threat_type:
@@ -35,23 +48,156 @@ def get_threat_logs(
     if time_range:
         time_limit = datetime.utcnow() - timedelta(hours=time_range)
         query = query.filter(ThreatLog.timestamp >= time_limit)
+    return query
+
+def apply_keyset_page(query, limit: int, cursor: str = None):
+    """Order newest-first by `(timestamp, id)` and seek past `cursor` (Query or Select)."""
+    query = query.order_by(ThreatLog.timestamp.desc(), ThreatLog.id.desc())
+    if cursor:
+        cursor_timestamp, cursor_id = decode_cursor(cursor)
+        query = query.filter(tuple_(ThreatLog.timestamp, ThreatLog.id) < (cursor_timestamp, cursor_id))
+    return query.limit(limit)
+
+def set_next_cursor(response: Response, threats: List[ThreatLog], limit: int):
+    """Expose the next page's cursor when the current page is full."""
+    if len(threats) == limit:
+        last = threats[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.timestamp, last.id)
+
+# ✅ Fetch all threat logs with filtering options
+@router.get("/logs", response_model=List[ThreatLogSchema])  # ✅ Use Pydantic schema
+def get_threat_logs(
+    response: Response,
+    db: Session = Depends(get_db),
+    severity: str = Query(None, description="Filter by severity"),
+    threat_type: str = Query(None, description="Filter by type"),
+    time_range: int = Query(24, description="Time range in hours"),
+    cidr: str = Query(None, description="Only sources inside this IPv4 network, e.g. 10.0.0.0/8"),
+    limit: int = Query(None, ge=1, le=1000, description="Page size; enables keyset pagination"),
+    cursor: str = Query(None, description="Cursor from the previous page's X-Next-Cursor header")
+):
+    """Fetch threat logs with optional filters.
+
+    When `limit` or `cursor` is given, results are paged newest-first by
+    `(timestamp, id)` and the next page's cursor is returned in `X-Next-Cursor`.
+    """
+    query = db.query(*THREAT_LOG_FIELDS) if settings.JSON_FAST_PATH else db.query(ThreatLog)
+    query = apply_threat_filters(query, severity, threat_type, time_range, cidr)
+    if limit is not None or cursor is not None:
+        limit = limit or DEFAULT_PAGE_SIZE
+        query = apply_keyset_page(query, limit, cursor)
+    threats = query.all()
+
+    if settings.JSON_FAST_PATH:
+        # ✅ Projected row tuples go straight to JSON, skipping ORM objects and per-row schemas
+        response = rows_response(THREAT_LOG_COLUMNS, threats)
+    if limit is not None:
+        set_next_cursor(response, threats, limit)
+    return response if settings.JSON_FAST_PATH else threats  # ✅ Otherwise FastAPI serializes using ThreatLogSchema
+
+# ✅ Stream threat logs as NDJSON or CSV without loading the full result set
+@router.get("/logs/export")
+def export_threat_logs(
+    severity: str = Query(None, description="Filter by severity"),
+    threat_type: str = Query(None, description="Filter by type"),
+    time_range: int = Query(24, description="Time range in hours"),
+    cidr: str = Query(None, description="Only sources inside this IPv4 network, e.g. 10.0.0.0/8"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Export format")
+):
+    """Export threat logs, reading rows in batches with `yield_per`."""
+    if cidr:
+        parse_cidr(cidr)  # ✅ Fail before the response starts streaming
+
+    def generate_rows():
+        # The session lives for the whole stream, so it's owned by the generator
+        db = SessionLocal()
+        try:
+            columns = [getattr(ThreatLog, column) for column in EXPORT_COLUMNS]
+            query = apply_threat_filters(db.query(*columns), severity, threat_type, time_range, cidr)
+            query = query.order_by(ThreatLog.timestamp.desc(), ThreatLog.id.desc()).yield_per(EXPORT_BATCH_SIZE)
+
+            if format == "csv":
+                buf = io.StringIO()
+                writer = csv.writer(buf)
+                writer.writerow(EXPORT_COLUMNS)
+                for index, row in enumerate(query, start=1):
+                    writer.writerow([value.isoformat() if isinstance(value, datetime) else value for value in row])
+                    if index % EXPORT_BATCH_SIZE == 0:
+                        yield buf.getvalue()
+                        buf.seek(0)
+                        buf.truncate()
+                yield buf.getvalue()
+            else:
+                for row in query:
+                    yield json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=datetime.isoformat) + "\n"
+        finally:
+            db.close()
 
-    return query.all()  # ✅ FastAPI now serializes using ThreatLogSchema
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        generate_rows(),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=threat_logs.{format}"}
+    )
 
 # ✅ Fetch threat statistics
 @router.get("/stats")
-def get_threat_stats(db: Session = Depends(get_db)):
-    """Fetch aggregated threat statistics."""
-    total_threats = db.query(ThreatLog).count()
-    active_alerts = db.query(ThreatLog).filter(ThreatLog.is_alert == True).count()
-    severity_counts = db.query(ThreatLog.severity, func.count(ThreatLog.severity)).group_by(ThreatLog.severity).all()
-    severity_distribution = {sev: count for sev, count in severity_counts}
-    
-    return {
-        "total_threats": total_threats,
-        "active_alerts": active_alerts,
-        "severity_distribution": severity_distribution
-    }
+def get_threat_stats(request: Request):
+    """Fetch aggregated threat statistics from the incrementally maintained counters."""
+    threat_stats.ensure_ready()
+    return response_cache.respond(request, THREAT_STATS_NAMESPACE, threat_stats.snapshot, ttl=settings.STATS_CACHE_TTL)
+
+# ✅ Dashboard time series served from the rollup tables
+@router.get("/timeseries")
+def get_threat_timeseries(
+    db: Session = Depends(get_db),
+    dimension: str = Query("severity", pattern="^(severity|type|source)$", description="Group counts by"),
+    time_range: int = Query(24, ge=1, le=24 * 365, description="Time range in hours"),
+    resolution: str = Query(None, pattern="^(minute|hour|day)$", description="Defaults to the finest that fits"),
+    max_points: int = Query(200, ge=1, le=2000, description="Downsample to about this many buckets"),
+    value: List[str] = Query(None, description="Only these values (default: the top ones)"),
+    top: int = Query(10, ge=1, le=100, description="Number of values returned when `value` is omitted")
+):
+    """Threat counts per bucket, e.g. `{"buckets": [...], "series": {"Critical": [...]}}`."""
+    end = datetime.utcnow()
+    start = end - timedelta(hours=time_range)
+    return threat_rollups.series(db, dimension, start, end, max_points, resolution, value, top)
+
+# ✅ Source IP counts from the in-memory prefix index
+@router.get("/sources")
+def get_threat_sources(
+    cidr: str = Query(None, description="Restrict to this IPv4 network"),
+    prefix_len: int = Query(24, ge=0, le=32, description="Group sources into networks of this size"),
+    top: int = Query(10, ge=1, le=1000, description="Number of networks returned")
+):
+    """Event count for `cidr` and its busiest `/prefix_len` networks over the index window."""
+    source_ip_index.ensure_loaded()
+    try:
+        return {
+            "window_hours": source_ip_index.window_hours,
+            "cidr": cidr,
+            "count": source_ip_index.count(cidr or "0.0.0.0/0"),
+            "top_prefixes": source_ip_index.top_prefixes(prefix_len, top, cidr),
+        }
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+# ✅ Push new threats and stats deltas to the dashboard (Server-Sent Events)
+@router.get("/stream")
+async def stream_threats(
+    request: Request,
+    severity: List[str] = Query(None, description="Only these severities"),
+    threat_type: List[str] = Query(None, description="Only these types")
+):
+    """Stream `threat` events matching the filters, plus `stats` deltas for every ingested batch."""
+    subscriber = threat_broadcaster.subscribe(set(severity or []), set(threat_type or []))
+    if subscriber is None:
+        raise HTTPException(status_code=503, detail="Too many stream clients", headers={"Retry-After": "5"})
+    return StreamingResponse(
+        threat_broadcaster.stream(subscriber, request.is_disconnected, settings.STREAM_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 # ✅ Mark a threat as resolved
 @router.put("/logs/{log_id}/resolve")
@@ -60,6 +206,11 @@ def resolve_threat(log_id: int, db: Session = Depends(get_db)):
     threat = db.query(ThreatLog).filter(ThreatLog.id == log_id).first()
     if not threat:
         raise HTTPException(status_code=404, detail="Threat log not found")
+    was_alert = bool(threat.is_alert)
     threat.is_alert = False
     db.commit()
+    threat_stats.resolve(was_alert)
+    response_cache.invalidate(THREAT_STATS_NAMESPACE)
+    if was_alert:
+        threat_broadcaster.publish_stats({"active_alerts": -1})
     return {"message": "Threat resolved successfully"}
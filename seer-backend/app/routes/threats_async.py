@@ -0,0 +1,57 @@
+# app/routes/threats_async.py
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.async_database import get_async_db
+from app.models.threat_log import ThreatLog
+from app.schemas.threat import ThreatLogSchema
+from app.core.threat_stats import threat_stats
+from app.core.response_cache import response_cache, THREAT_STATS_NAMESPACE
+from app.config.settings import settings
+from app.core.serialization import rows_response
+from app.routes.threats import (
+    apply_threat_filters, apply_keyset_page, set_next_cursor, DEFAULT_PAGE_SIZE, THREAT_LOG_COLUMNS, THREAT_LOG_FIELDS,
+)
+from typing import List
+
+# ✅ Async twins of the hot dashboard endpoints in app/routes/threats.py.
+# Mounted ahead of the sync router when DB_ASYNC_ENABLED is set.
+router = APIRouter(prefix="/threats", tags=["Threat Intelligence"])
+
+# ✅ Fetch threat logs (async)
+@router.get("/logs", response_model=List[ThreatLogSchema])
+async def get_threat_logs(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    severity: str = Query(None, description="Filter by severity"),
+    threat_type: str = Query(None, description="Filter by type"),
+    time_range: int = Query(24, description="Time range in hours"),
+    cidr: str = Query(None, description="Only sources inside this IPv4 network, e.g. 10.0.0.0/8"),
+    limit: int = Query(None, ge=1, le=1000, description="Page size; enables keyset pagination"),
+    cursor: str = Query(None, description="Cursor from the previous page's X-Next-Cursor header")
+):
+    """Fetch threat logs with optional filters."""
+    statement = select(*THREAT_LOG_FIELDS) if settings.JSON_FAST_PATH else select(ThreatLog)
+    statement = apply_threat_filters(statement, severity, threat_type, time_range, cidr)
+    if limit is not None or cursor is not None:
+        limit = limit or DEFAULT_PAGE_SIZE
+        statement = apply_keyset_page(statement, limit, cursor)
+    result = await db.execute(statement)
+
+    if settings.JSON_FAST_PATH:
+        threats = result.all()
+        response = rows_response(THREAT_LOG_COLUMNS, threats)
+    else:
+        threats = result.scalars().all()
+    if limit is not None:
+        set_next_cursor(response, threats, limit)
+    return response if settings.JSON_FAST_PATH else threats
+
+# ✅ Fetch threat statistics (async)
+@router.get("/stats")
+async def get_threat_stats(request: Request):
+    """Fetch aggregated threat statistics from the incrementally maintained counters."""
+    if not threat_stats.ready:
+        await run_in_threadpool(threat_stats.ensure_ready)
+    return response_cache.respond(request, THREAT_STATS_NAMESPACE, threat_stats.snapshot, ttl=settings.STATS_CACHE_TTL)
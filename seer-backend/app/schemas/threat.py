@@ -1,5 +1,7 @@
-from pydantic import BaseModel
+import ipaddress
+from pydantic import BaseModel, field_validator
 from datetime import datetime
+from typing import Optional
 
 class ThreatLogSchema(BaseModel):
     id: int
@@ -8,6 +10,17 @@ class ThreatLogSchema(BaseModel):
     source_ip: str
     is_alert: bool
     timestamp: datetime
+    indicator_match: Optional[bool] = False  # Source IP matched a threat-feed indicator
 
     class Config:
         from_attributes = True  # ✅ Converts SQLAlchemy models into Pydantic schemas
+
+class ThreatEventCreate(BaseModel):
+    ip_address: str
+    description: str
+
+    @field_validator("ip_address")
+    @classmethod
+    def validate_ip_address(cls, value: str) -> str:
+        ipaddress.IPv4Address(value)  # ✅ Rejects "1.2.3", "nan.1e9.-5.300", IPv6, ... with a 422
+        return value
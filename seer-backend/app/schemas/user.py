@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+# ✅ Lightweight listing rows (built from projected columns, never from full ORM users)
+class RoleSummarySchema(BaseModel):
+    id: int
+    name: str
+
+class IAMUserSchema(BaseModel):
+    id: int
+    email: str
+    role: str
+
+class AdminUserSchema(BaseModel):
+    id: int
+    username: str
+    email: str
+    is_active: bool
+    role_id: int
+    role: RoleSummarySchema
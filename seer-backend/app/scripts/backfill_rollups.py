@@ -0,0 +1,19 @@
+import argparse
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.database.database import SessionLocal
+from app.core.rollups import threat_rollups
+
+def backfill_rollups(days: int):
+    """Rebuild threat_rollups from raw threat_logs (run while ingestion is quiet)."""
+    db: Session = SessionLocal()
+    try:
+        replayed = threat_rollups.backfill(db, datetime.utcnow() - timedelta(days=days))
+    finally:
+        db.close()
+    print(f"✅ Rebuilt threat rollups from {replayed} threat logs")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild threat rollups from threat_logs")
+    parser.add_argument("--days", type=int, default=7, help="How far back to rebuild")
+    backfill_rollups(parser.parse_args().days)
@@ -0,0 +1,185 @@
+"""Monthly range partitioning and retention for ``threat_logs`` (PostgreSQL).
+
+    python -m app.scripts.threat_log_partitions convert   # one-off, opt-in
+    python -m app.scripts.threat_log_partitions maintain  # run daily (cron)
+
+``maintain`` pre-creates the upcoming monthly partitions and drops whole
+partitions older than ``THREAT_LOG_RETENTION_DAYS``, so expiring data costs a
+``DROP TABLE`` instead of a large ``DELETE``. On an unpartitioned table (or a
+non-Postgres database) it falls back to deleting expired rows in batches.
+"""
+import argparse
+from datetime import date, datetime, timedelta
+from typing import List, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from app.config.settings import settings
+from app.database.database import engine
+from app.models.threat_log import ThreatLog
+
+TABLE = ThreatLog.__tablename__
+DELETE_BATCH_SIZE = 10000
+
+
+# ✅ Partition naming and bounds
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(start: date) -> str:
+    return f"{TABLE}_{start:%Y_%m}"
+
+
+def partition_bounds(start: date) -> Tuple[date, date]:
+    """``[start, end)`` range covered by the monthly partition starting at ``start``."""
+    start = month_start(start)
+    return start, add_months(start, 1)
+
+
+def months_between(first: date, last: date) -> List[date]:
+    months, current = [], month_start(first)
+    while current <= month_start(last):
+        months.append(current)
+        current = add_months(current, 1)
+    return months
+
+
+# ✅ Introspection
+def is_partitioned(conn: Connection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :table"),
+        {"table": TABLE},
+    ).scalar())
+
+
+def list_partitions(conn: Connection) -> List[str]:
+    return list(conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table ORDER BY child.relname"
+        ),
+        {"table": TABLE},
+    ).scalars())
+
+
+# ✅ Partition management
+def create_partition(conn: Connection, start: date):
+    start, end = partition_bounds(start)
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF {TABLE} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+
+
+def create_index_definitions(conn: Connection):
+    """Create the model's indexes on the partitioned parent (propagated to every partition)."""
+    for index in ThreatLog.__table__.indexes:
+        columns = ", ".join(f'"{column.name}"' for column in index.columns)
+        where = index.dialect_options["postgresql"].get("where")
+        clause = f" WHERE {where}" if where is not None else ""
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index.name} ON {TABLE} ({columns}){clause}"))
+
+
+def convert_to_partitioned(conn: Connection, months_ahead: int):
+    """Rebuild ``threat_logs`` as a table partitioned by month on ``timestamp``.
+
+    Runs in a single transaction: the existing rows are copied into the new
+    partitions and the old table is dropped. The id sequence is kept.
+    """
+    if conn.dialect.name != "postgresql":
+        raise RuntimeError("Partitioning is only supported on PostgreSQL")
+    if is_partitioned(conn):
+        print("✅ threat_logs is already partitioned")
+        return
+
+    legacy = f"{TABLE}_unpartitioned"
+    conn.execute(text(f"ALTER TABLE {TABLE} RENAME TO {legacy}"))
+    conn.execute(text(f"UPDATE {legacy} SET timestamp = now() WHERE timestamp IS NULL"))
+    conn.execute(text(
+        f"CREATE TABLE {TABLE} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE (timestamp)"
+    ))
+    conn.execute(text(f"ALTER TABLE {TABLE} ALTER COLUMN timestamp SET NOT NULL"))
+    # ✅ The partition key has to be part of the primary key
+    conn.execute(text(f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id, timestamp)"))
+
+    oldest, newest = conn.execute(text(f"SELECT min(timestamp), max(timestamp) FROM {legacy}")).one()
+    today = datetime.utcnow().date()
+    first = oldest.date() if oldest else today
+    last = max(newest.date() if newest else today, today)
+    for start in months_between(first, add_months(last, months_ahead)):
+        create_partition(conn, start)
+
+    conn.execute(text(f"INSERT INTO {TABLE} SELECT * FROM {legacy}"))
+    conn.execute(text(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id"))
+    conn.execute(text(f"DROP TABLE {legacy}"))
+    create_index_definitions(conn)
+    print(f"✅ threat_logs converted to {len(list_partitions(conn))} monthly partitions")
+
+
+def drop_expired_partitions(conn: Connection, retention_days: int, today: date = None) -> List[str]:
+    """Drop every partition whose whole range is older than the retention cutoff."""
+    cutoff = (today or datetime.utcnow().date()) - timedelta(days=retention_days)
+    dropped = []
+    for name in list_partitions(conn):
+        try:
+            start = datetime.strptime(name[len(TABLE) + 1:], "%Y_%m").date()
+        except ValueError:
+            continue  # Not one of ours (e.g. a manually attached partition)
+        if partition_bounds(start)[1] <= cutoff:
+            conn.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    return dropped
+
+
+def delete_expired_rows(conn: Connection, retention_days: int, batch_size: int = DELETE_BATCH_SIZE) -> int:
+    """Fallback for unpartitioned tables: delete expired rows in bounded batches."""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted = 0
+    while True:
+        result = conn.execute(
+            text(
+                f"DELETE FROM {TABLE} WHERE id IN "
+                f"(SELECT id FROM {TABLE} WHERE timestamp < :cutoff LIMIT :batch_size)"
+            ),
+            {"cutoff": cutoff, "batch_size": batch_size},
+        )
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+
+
+def maintain(conn: Connection, retention_days: int, months_ahead: int):
+    """Pre-create upcoming partitions and enforce retention."""
+    if not is_partitioned(conn):
+        deleted = delete_expired_rows(conn, retention_days)
+        print(f"✅ threat_logs is not partitioned; deleted {deleted} expired rows")
+        return
+
+    today = datetime.utcnow().date()
+    for start in months_between(today, add_months(today, months_ahead)):
+        create_partition(conn, start)
+    dropped = drop_expired_partitions(conn, retention_days, today)
+    print(f"✅ Dropped {len(dropped)} expired threat_logs partitions: {', '.join(dropped) or 'none'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage threat_logs partitions and retention")
+    parser.add_argument("command", choices=["convert", "maintain"])
+    parser.add_argument("--retention-days", type=int, default=settings.THREAT_LOG_RETENTION_DAYS)
+    parser.add_argument("--months-ahead", type=int, default=settings.THREAT_LOG_PARTITIONS_AHEAD)
+    args = parser.parse_args()
+
+    with engine.begin() as connection:
+        if args.command == "convert":
+            convert_to_partitioned(connection, args.months_ahead)
+        else:
+            maintain(connection, args.retention_days, args.months_ahead)
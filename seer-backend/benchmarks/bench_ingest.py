@@ -0,0 +1,109 @@
+"""Threat ingestion throughput: per-row ORM commits vs. the buffered ingestor.
+
+Usage (from seer-backend/):
+    python -m benchmarks.bench_ingest --rows 5000
+    python -m benchmarks.bench_ingest --database-url postgresql+psycopg2://... --rows 100000
+
+Without ``--database-url`` a temporary SQLite file is used. The target table is
+dropped and re-created, so never point this at a database you care about.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.ingest import ThreatIngestor
+from app.models.threat_log import ThreatLog
+
+SEVERITIES = ["Critical", "High", "Medium", "Low"]
+
+
+def make_events(count):
+    return [
+        {
+            "type": "Port Scanning",
+            "severity": random.choice(SEVERITIES),
+            "source_ip": f"10.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}",
+            "is_alert": False,
+        }
+        for _ in range(count)
+    ]
+
+
+def reset_table(engine):
+    ThreatLog.__table__.drop(engine, checkfirst=True)
+    ThreatLog.__table__.create(engine)
+
+
+def bench_per_row(engine, events):
+    """The pre-ingestor path: one ORM add + commit per threat."""
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    start = time.perf_counter()
+    for event in events:
+        db.add(ThreatLog(**event))
+        db.commit()
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed
+
+
+def bench_buffered(engine, events, batch_size):
+    ingestor = ThreatIngestor(engine, batch_size=batch_size, flush_interval=0.05, max_buffer=batch_size * 20)
+    ingestor.start()
+    start = time.perf_counter()
+    for event in events:
+        ingestor.submit(event)
+    ingestor.stop()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--per-row-rows", type=int, default=None, help="Rows for the slow per-row path (default: --rows)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    database_url = args.database_url
+    if not database_url:
+        tmp_dir = tempfile.mkdtemp()
+        database_url = f"sqlite:///{os.path.join(tmp_dir, 'bench_ingest.db')}"
+    engine = create_engine(database_url)
+
+    results = {"database": engine.dialect.name, "batch_size": args.batch_size, "runs": []}
+
+    per_row_events = make_events(args.per_row_rows or args.rows)
+    reset_table(engine)
+    elapsed = bench_per_row(engine, per_row_events)
+    results["runs"].append({"path": "per_row", "rows": len(per_row_events), "seconds": elapsed,
+                            "rows_per_second": len(per_row_events) / elapsed})
+
+    events = make_events(args.rows)
+    reset_table(engine)
+    elapsed = bench_buffered(engine, events, args.batch_size)
+    results["runs"].append({"path": "buffered", "rows": len(events), "seconds": elapsed,
+                            "rows_per_second": len(events) / elapsed})
+
+    for run in results["runs"]:
+        print(f"{run['path']:>10}: {run['rows']:>9} rows in {run['seconds']:.2f}s "
+              f"({run['rows_per_second']:.0f} rows/s)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    ThreatLog.__table__.drop(engine, checkfirst=True)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
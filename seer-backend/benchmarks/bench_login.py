@@ -0,0 +1,122 @@
+"""Login throughput under concurrency, with bcrypt inline vs. on the bounded pool.
+
+Usage (from seer-backend/):
+    python -m benchmarks.bench_login --concurrency 64 --duration 10
+
+A temporary SQLite database is used. While the login storm runs, a probe
+thread keeps calling ``GET /`` to show whether other endpoints are starved.
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_storm(client, concurrency, duration):
+    stop_at = time.perf_counter() + duration
+    login_latencies, probe_latencies, statuses = [], [], {}
+    lock = threading.Lock()
+
+    def login_worker():
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            response = client.post("/auth/login", json={"email": "bench@example.com", "password": "benchpass"})
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                if response.status_code == 200:
+                    login_latencies.append(elapsed)
+
+    def probe_worker():
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            client.get("/")
+            probe_latencies.append(time.perf_counter() - start)
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=login_worker) for _ in range(concurrency)]
+    threads.append(threading.Thread(target=probe_worker))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "successful_logins": len(login_latencies),
+        "logins_per_second": len(login_latencies) / duration,
+        "status_counts": {str(code): count for code, count in sorted(statuses.items())},
+        "login_p50_ms": (percentile(login_latencies, 50) or 0) * 1000,
+        "login_p99_ms": (percentile(login_latencies, 99) or 0) * 1000,
+        "probe_p50_ms": (percentile(probe_latencies, 50) or 0) * 1000,
+        "probe_p99_ms": (percentile(probe_latencies, 99) or 0) * 1000,
+        "probe_max_ms": max(probe_latencies, default=0) * 1000,
+        "probe_mean_ms": statistics.mean(probe_latencies) * 1000 if probe_latencies else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--bcrypt-rounds", type=int, default=10)
+    parser.add_argument("--modes", default="inline,pooled", help="Comma-separated: inline, pooled")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so configure the environment first
+    tmp_dir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp_dir, 'bench_login.db')}"
+    os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    os.environ.setdefault("THREAT_MODEL_PATH", os.path.join(tmp_dir, "threat_model.joblib"))
+
+    from fastapi.testclient import TestClient
+    from app.core import auth as core_auth
+    from app.database.database import Base, SessionLocal, engine
+    from app.main import app
+    from app.models.user import Role, User
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    db.add_all([Role(name="ADMIN"), Role(name="USER")])
+    db.commit()
+    db.add(User(username="bench", email="bench@example.com",
+                hashed_password=core_auth.hash_password("benchpass"), role_id=2))
+    db.commit()
+    db.close()
+
+    pooled_job = core_auth.run_password_job
+    results = {"concurrency": args.concurrency, "duration_seconds": args.duration,
+               "bcrypt_rounds": args.bcrypt_rounds,
+               "hash_workers": core_auth.password_executor.max_workers,
+               "hash_queue": core_auth.password_executor.max_queue, "runs": {}}
+
+    with TestClient(app) as client:
+        for mode in args.modes.split(","):
+            # "inline" reproduces the old behaviour: bcrypt in the request thread
+            core_auth.run_password_job = (lambda fn, *a: fn(*a)) if mode == "inline" else pooled_job
+            from app.routes import auth as auth_routes
+            auth_routes.run_password_job = core_auth.run_password_job
+            results["runs"][mode] = run_storm(client, args.concurrency, args.duration)
+
+    for mode, run in results["runs"].items():
+        print(f"{mode:>7}: {run['logins_per_second']:.1f} logins/s, statuses {run['status_counts']}, "
+              f"login p99 {run['login_p99_ms']:.0f} ms, probe p50/p99 "
+              f"{run['probe_p50_ms']:.1f}/{run['probe_p99_ms']:.1f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
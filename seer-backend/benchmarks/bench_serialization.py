@@ -0,0 +1,81 @@
+"""/threats/logs response cost: ORM objects + ThreatLogSchema vs. projected rows + orjson.
+
+Usage (from seer-backend/):
+    python -m benchmarks.bench_serialization --rows 100000 --repeat 5
+
+A temporary SQLite database is seeded with ``--rows`` threat logs, then the
+unpaginated ``GET /threats/logs`` is timed end to end with ``JSON_FAST_PATH``
+off (the previous behaviour) and on. Response bodies are compared so the fast
+path is known to return the same JSON.
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+
+def time_requests(client, repeat):
+    timings, body = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get("/threats/logs")
+        timings.append(time.perf_counter() - start)
+        body = response.json()
+    return timings, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so configure the environment first
+    tmp_dir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp_dir, 'bench_serialization.db')}"
+    os.environ["THREAT_FEEDS"] = ""
+    os.environ["METRICS_ENABLED"] = "false"
+    os.environ.setdefault("FEED_CACHE_DIR", os.path.join(tmp_dir, "feed_cache"))
+    os.environ.setdefault("AUDIT_FALLBACK_PATH", os.path.join(tmp_dir, "audit_fallback.jsonl"))
+    os.environ.setdefault("THREAT_MODEL_PATH", os.path.join(tmp_dir, "threat_model.joblib"))
+
+    from fastapi.testclient import TestClient
+    from app.config.settings import settings
+    from app.core.ingest import ThreatIngestor
+    from app.database.database import Base, engine
+    from app.main import app
+    from app.scripts.seed_threat_logs import generate_threat_logs
+
+    Base.metadata.create_all(engine)
+    ThreatIngestor(engine).write_rows(generate_threat_logs(args.rows, hours=12))
+
+    results = {"rows": args.rows, "repeat": args.repeat, "runs": {}}
+    bodies = {}
+    with TestClient(app) as client:
+        for mode, fast_path in (("orm_schema", False), ("rows_orjson", True)):
+            settings.JSON_FAST_PATH = fast_path
+            client.get("/threats/logs?limit=10")  # ✅ Warm up
+            timings, bodies[mode] = time_requests(client, args.repeat)
+            results["runs"][mode] = {
+                "median_seconds": statistics.median(timings),
+                "min_seconds": min(timings),
+                "rows_per_second": args.rows / statistics.median(timings),
+            }
+
+    results["identical_output"] = bodies["orm_schema"] == bodies["rows_orjson"]
+    baseline = results["runs"]["orm_schema"]["median_seconds"]
+    for mode, run in results["runs"].items():
+        print(f"{mode:>12}: median {run['median_seconds'] * 1000:8.1f} ms  "
+              f"({run['rows_per_second']:.0f} rows/s, {baseline / run['median_seconds']:.2f}x)")
+    print(f"identical output: {results['identical_output']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""API benchmark suite: latency and throughput of the main endpoints at several table sizes.
+
+Usage (from seer-backend/):
+    python -m benchmarks.run_benchmarks --sizes 1k,100k --output results.json
+    python -m benchmarks.run_benchmarks --database-url postgresql+psycopg2://... --sizes 1k,100k,10M
+    python -m benchmarks.run_benchmarks --compare baseline.json results.json
+
+For every size, ``threat_logs`` is dropped, re-seeded with rows from
+``seed_threat_logs.generate_threat_logs`` (timing the bulk ingestion), and
+each scenario is replayed ``--requests`` times from ``--concurrency`` threads.
+Without ``--database-url`` a temporary SQLite file is used; never point this
+at a database you care about. Results are JSON so runs can be compared
+across releases.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from itertools import islice
+
+from benchmarks.bench_login import percentile
+
+SEED_CHUNK = 50000  # Rows per bulk write while seeding
+
+
+def parse_size(value):
+    """``1k`` -> 1000, ``10M`` -> 10000000."""
+    multiplier = {"k": 1000, "m": 1000000}.get(value[-1].lower(), 1)
+    return int(float(value[:-1] if multiplier > 1 else value) * multiplier)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(latencies, statuses, elapsed):
+    return {
+        "requests": sum(statuses.values()),
+        "status_counts": {str(code): count for code, count in sorted(statuses.items())},
+        "requests_per_second": sum(statuses.values()) / elapsed if elapsed else 0,
+        "p50_ms": (percentile(latencies, 50) or 0) * 1000,
+        "p99_ms": (percentile(latencies, 99) or 0) * 1000,
+        "max_ms": max(latencies, default=0) * 1000,
+    }
+
+
+def run_scenario(call, requests, concurrency):
+    """Issue ``requests`` calls from ``concurrency`` threads; latency counts 2xx/3xx responses only."""
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+    remaining = iter(range(requests))
+
+    def worker():
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            start = time.perf_counter()
+            status_code = call().status_code
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[status_code] = statuses.get(status_code, 0) + 1
+                if status_code < 400:
+                    latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, statuses, time.perf_counter() - start)
+
+
+def seed(engine, size):
+    """Re-create ``threat_logs`` and bulk-load ``size`` rows; returns the ingestion measurements."""
+    from app.core.ingest import ThreatIngestor
+    from app.models.threat_log import ThreatLog
+    from app.scripts.seed_threat_logs import generate_threat_logs
+
+    ThreatLog.__table__.drop(engine, checkfirst=True)
+    ThreatLog.__table__.create(engine)
+
+    ingestor = ThreatIngestor(engine)
+    rows = generate_threat_logs(size)
+    written, write_seconds = 0, 0.0
+    while True:
+        chunk = list(islice(rows, SEED_CHUNK))  # ✅ Row generation is not part of the timing
+        if not chunk:
+            break
+        start = time.perf_counter()
+        written += ingestor.write_rows(chunk)
+        write_seconds += time.perf_counter() - start
+    return {"rows": written, "seconds": write_seconds,
+            "rows_per_second": written / write_seconds if write_seconds else 0}
+
+
+def compare(baseline_path, current_path):
+    """Print the p50/p99 and throughput change of every scenario present in both result files."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(current_path) as f:
+        current = json.load(f)
+    for size, run in current["sizes"].items():
+        before = baseline["sizes"].get(size)
+        if not before:
+            continue
+        for name, result in run["scenarios"].items():
+            old = before["scenarios"].get(name)
+            if not old:
+                continue
+            print(f"{size:>9} {name:<18} p50 {old['p50_ms']:8.1f} -> {result['p50_ms']:8.1f} ms   "
+                  f"p99 {old['p99_ms']:8.1f} -> {result['p99_ms']:8.1f} ms   "
+                  f"{old['requests_per_second']:8.1f} -> {result['requests_per_second']:8.1f} req/s")
+        print(f"{size:>9} {'ingest':<18} {before['ingest']['rows_per_second']:.0f} -> "
+              f"{run['ingest']['rows_per_second']:.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--sizes", default="1k,100k", help="Comma-separated threat_logs sizes, e.g. 1k,100k,10M")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario and size")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--full-logs-max", type=int, default=100000,
+                        help="Skip the unpaginated /threats/logs scenario above this many rows")
+    parser.add_argument("--bcrypt-rounds", type=int, default=10)
+    parser.add_argument("--label", default=None, help="Release or branch name stored with the results")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="Compare two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    # Settings are read at import time, so configure the environment first
+    tmp_dir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tmp_dir, 'bench_api.db')}"
+    os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    os.environ["THREAT_FEEDS"] = ""  # ✅ No outbound feed traffic during a run
+    os.environ.setdefault("FEED_CACHE_DIR", os.path.join(tmp_dir, "feed_cache"))
+    os.environ.setdefault("AUDIT_FALLBACK_PATH", os.path.join(tmp_dir, "audit_fallback.jsonl"))
+    os.environ.setdefault("THREAT_MODEL_PATH", os.path.join(tmp_dir, "threat_model.joblib"))
+
+    from fastapi.testclient import TestClient
+    from app.core import auth as core_auth
+    from app.core.threat_stats import threat_stats
+    from app.database.database import Base, SessionLocal, engine
+    from app.main import app
+    from app.models.user import Permission, Role, User
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    if not db.query(User).filter(User.email == "bench-admin@example.com").first():
+        admin_permissions = ["MANAGE_USERS", "MANAGE_ROLES", "MANAGE_PERMISSIONS", "VIEW_ADMIN_STATS"]
+        existing = {permission.name: permission for permission in db.query(Permission)}
+        admin_role = db.query(Role).filter(Role.name == "ADMIN").first() or Role(name="ADMIN")
+        admin_role.permissions = [existing.get(name) or Permission(name=name) for name in admin_permissions]
+        db.add(admin_role)
+        db.commit()
+        db.add(User(username="bench-admin", email="bench-admin@example.com",
+                    hashed_password=core_auth.hash_password("benchpass"), role_id=admin_role.id))
+        db.commit()
+    db.close()
+
+    credentials = {"email": "bench-admin@example.com", "password": "benchpass"}
+    results = {
+        "label": args.label,
+        "git_commit": git_commit(),
+        "started_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": engine.dialect.name,
+        "requests_per_scenario": args.requests,
+        "concurrency": args.concurrency,
+        "sizes": {},
+    }
+
+    with TestClient(app) as client:
+        token = client.post("/auth/login", json=credentials).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        scenarios = {
+            "login": lambda: client.post("/auth/login", json=credentials),
+            "threats_logs_page": lambda: client.get("/threats/logs?limit=100"),
+            "threats_logs_full": lambda: client.get("/threats/logs"),
+            "threats_stats": lambda: client.get("/threats/stats"),
+            "admin_stats": lambda: client.get("/admin/stats", headers=headers),
+            "admin_users": lambda: client.get("/admin/users", headers=headers),
+            "iam_roles": lambda: client.get("/iam/roles", headers=headers),
+        }
+
+        for size in [parse_size(value) for value in args.sizes.split(",")]:
+            print(f"⏳ Seeding {size} threat logs...")
+            run = {"ingest": seed(engine, size), "scenarios": {}}
+            db = SessionLocal()
+            threat_stats.reconcile(db)  # ✅ Counters match the freshly seeded table
+            db.close()
+
+            for name, call in scenarios.items():
+                if name == "threats_logs_full" and size > args.full_logs_max:
+                    continue
+                run["scenarios"][name] = run_scenario(call, args.requests, args.concurrency)
+
+            results["sizes"][str(size)] = run
+            print(f"{size:>9} rows: ingest {run['ingest']['rows_per_second']:.0f} rows/s")
+            for name, result in run["scenarios"].items():
+                print(f"{'':>9} {name:<18} p50 {result['p50_ms']:8.1f} ms  p99 {result['p99_ms']:8.1f} ms  "
+                      f"{result['requests_per_second']:8.1f} req/s  {result['status_counts']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
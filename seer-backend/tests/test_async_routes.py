@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.config.settings import settings
+from app.core import auth as core_auth
+from app.core.auth import decode_access_token
+from app.core.ingest import ThreatIngestor
+from app.database import async_database
+from app.database.database import Base, get_db
+from app.models.user import Role
+from app.routes import auth, auth_async, threats, threats_async
+
+NOW = datetime.utcnow().replace(microsecond=0)
+
+def make_database(path):
+    """Identical SQLite file for each stack: default roles plus threat logs with tied timestamps."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    db.add_all([Role(name="ADMIN"), Role(name="USER")])
+    db.commit()
+    db.close()
+    ThreatIngestor(engine).write_rows([
+        {"type": "Port Scanning", "severity": "High" if i % 2 else "Low", "source_ip": f"10.0.0.{i}",
+         "timestamp": NOW - timedelta(minutes=i // 3)}
+        for i in range(10)
+    ])
+    return Session
+
+def sync_client(path):
+    Session = make_database(path)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(auth.router)
+    app.include_router(threats.router)
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+def async_client(path, monkeypatch):
+    make_database(path)
+    # ✅ Real get_async_db: the engine is derived from DATABASE_URL (sqlite -> sqlite+aiosqlite)
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite:///{path}")
+    monkeypatch.setattr(settings, "ASYNC_DATABASE_URL", None)
+    monkeypatch.setattr(async_database, "_async_engine", None)
+    monkeypatch.setattr(async_database, "_async_session_factory", None)
+    app = FastAPI()
+    app.include_router(auth_async.router)
+    app.include_router(threats_async.router)
+    return TestClient(app)
+
+def run_scenario(client):
+    """Register, log in, read /auth/me and page through /threats/logs; returns comparable results."""
+    results = {}
+    user = {"username": "alice", "email": "alice@example.com", "password": "s3cret"}
+    response = client.post("/auth/register", json=user)
+    results["register"] = (response.status_code, response.json())
+    response = client.post("/auth/register", json=user)
+    results["register_duplicate"] = (response.status_code, response.json())
+
+    response = client.post("/auth/login", json={"email": user["email"], "password": "wrong"})
+    results["login_bad_password"] = response.status_code
+    response = client.post("/auth/login", json={"email": user["email"], "password": user["password"]})
+    body = response.json()
+    claims = decode_access_token(body["access_token"])
+    results["login"] = (response.status_code, body["role"], body["token_type"],
+                        {key: claims[key] for key in ("sub", "role", "uid", "rid")})
+    response = client.get("/auth/me", headers={"Authorization": f"Bearer {body['access_token']}"})
+    results["me"] = (response.status_code, response.json())
+
+    pages, params = [], {"limit": 4}
+    while True:
+        response = client.get("/threats/logs", params=params)
+        cursor = response.headers.get("X-Next-Cursor")
+        pages.append((response.status_code, response.json(), cursor))
+        if cursor is None:
+            break
+        params = {"limit": 4, "cursor": cursor}
+    results["pages"] = pages
+    response = client.get("/threats/logs", params={"severity": "High"})
+    results["filtered"] = (response.status_code, response.json())
+    return results
+
+# ✅ With DB_ASYNC_ENABLED the async routes take over; they must answer exactly like the sync ones
+@pytest.mark.parametrize("fast_path", [True, False])
+def test_async_routes_match_sync_routes(tmp_path, monkeypatch, fast_path):
+    monkeypatch.setattr(settings, "JSON_FAST_PATH", fast_path)
+    monkeypatch.setattr(core_auth, "pwd_context", core_auth.pwd_context.copy(
+        bcrypt__default_rounds=4, bcrypt__min_rounds=4, bcrypt__max_rounds=4))  # ✅ Fast hashes
+    expected = run_scenario(sync_client(tmp_path / "sync.db"))
+
+    with async_client(tmp_path / "async.db", monkeypatch) as client:
+        actual = run_scenario(client)
+        assert async_database.get_async_engine().url.drivername == "sqlite+aiosqlite"
+        client.portal.call(async_database.dispose_async_engine)
+
+    assert expected["register"] == (201, {"message": "User registered successfully"})
+    assert expected["login"][0] == 200 and expected["me"][0] == 200
+    assert [len(page[1]) for page in expected["pages"]] == [4, 4, 2]
+    assert actual == expected
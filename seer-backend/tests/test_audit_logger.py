@@ -0,0 +1,93 @@
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.pool import StaticPool
+from app.core.audit_logger import AuditWriter
+from app.models.audit_log import AuditLog
+from app.models import user  # noqa: F401  (registers the tables AuditLog references)
+
+def make_engine(create_table=True):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    if create_table:
+        AuditLog.__table__.create(engine)
+    return engine
+
+def count_rows(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(AuditLog.__table__)).scalar()
+
+def make_fk_engine():
+    """Engine enforcing foreign keys, like Postgres does."""
+    engine = make_engine(create_table=False)
+    event.listen(engine, "connect", lambda conn, _: conn.execute("PRAGMA foreign_keys=ON"))
+    engine.dispose()
+    return engine
+
+def create_admin(engine):
+    tables = [user.Role.__table__, user.User.__table__, user.Permission.__table__, AuditLog.__table__]
+    AuditLog.metadata.create_all(engine, tables=tables)
+    with engine.begin() as conn:
+        conn.execute(user.Role.__table__.insert(), {"id": 1, "name": "ADMIN"})
+        conn.execute(user.User.__table__.insert(),
+                     {"id": 1, "username": "a", "email": "a@example.com", "hashed_password": "x", "role_id": 1})
+
+def entry(i=0):
+    return {"admin_id": 1, "action": "ASSIGN_PERMISSION", "target_role_id": i}
+
+# ✅ Entries are queued, written in batches, and stop() drains the rest
+def test_background_flush_and_stop(tmp_path):
+    engine = make_engine()
+    writer = AuditWriter(engine, str(tmp_path / "audit.jsonl"), batch_size=5, flush_interval=0.05)
+    writer.start()
+    for i in range(12):
+        writer.log(entry(i))
+    writer.stop()
+    assert count_rows(engine) == 12
+    assert writer.pending == 0
+
+# ✅ A failing database spills to the fallback file, which is replayed once writes succeed
+def test_fallback_file_is_replayed(tmp_path):
+    engine = make_engine(create_table=False)  # ✅ Inserts fail until the table exists
+    fallback = tmp_path / "audit.jsonl"
+    writer = AuditWriter(engine, str(fallback), batch_size=100, flush_interval=60, max_queue=2)
+    for i in range(3):
+        writer.log(entry(i))  # ✅ Third entry overflows the queue straight to the file
+    assert writer.flush() is False
+    assert len(fallback.read_text().splitlines()) == 3
+
+    AuditLog.__table__.create(engine)
+    assert writer.flush() is True
+    assert count_rows(engine) == 3
+    assert not fallback.exists()
+
+# ✅ An entry the database rejects is dead-lettered instead of blocking the good ones behind it
+def test_rejected_entry_is_dead_lettered(tmp_path):
+    engine = make_fk_engine()
+    create_admin(engine)
+
+    fallback = tmp_path / "audit.jsonl"
+    writer = AuditWriter(engine, str(fallback), batch_size=100, flush_interval=60)
+    writer.log(entry(1))
+    writer.log(entry(99))  # ✅ Role was deleted before the flush: FK violation
+    writer.log(entry(1))
+    assert writer.flush() is True
+    assert count_rows(engine) == 2
+    assert not fallback.exists()
+    assert len((tmp_path / "audit.jsonl.dead").read_text().splitlines()) == 1
+
+    writer.log(entry(1))
+    assert writer.flush() is True
+    assert count_rows(engine) == 3
+    assert writer.stats["dead_lettered"] == 1
+
+# ✅ Replaying the fallback file also isolates rejected entries
+def test_replay_skips_rejected_entry(tmp_path):
+    engine = make_fk_engine()
+    fallback = tmp_path / "audit.jsonl"
+    writer = AuditWriter(engine, str(fallback), batch_size=100, flush_interval=60)
+    writer.log(entry(1))
+    writer.log(entry(99))
+    assert writer.flush() is False  # ✅ Tables are missing: both entries spill
+
+    create_admin(engine)
+    assert writer.flush() is True
+    assert count_rows(engine) == 1
+    assert not fallback.exists()
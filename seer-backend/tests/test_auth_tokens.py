@@ -0,0 +1,131 @@
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.config.settings import settings
+from app.core import auth as core_auth
+from app.core.auth import create_access_token, get_current_user_stateless, invalidate_user
+from app.database.database import Base, get_db
+from app.models.user import Role, User
+from app.routes import auth
+
+def make_client():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    db.add_all([Role(name="ADMIN"), Role(name="USER")])
+    db.commit()
+    db.add(User(username="alice", email="alice@example.com", hashed_password="x", role_id=2))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(auth.router)
+    app.dependency_overrides[get_db] = override_get_db
+
+    @app.get("/whoami")
+    def whoami(user=Depends(get_current_user_stateless)):
+        return {"id": user.id, "email": user.email}
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return TestClient(app), statements
+
+def token_for(user_id=1):
+    return create_access_token({"sub": "alice@example.com", "role": "USER", "uid": user_id, "rid": 2})
+
+def get(client, path, token):
+    return client.get(path, headers={"Authorization": f"Bearer {token}"})
+
+@pytest.fixture(autouse=True)
+def clean_auth_state():
+    for state in (core_auth._validated_users, core_auth._claims_not_before, core_auth._revoked_before):
+        state.clear()
+    yield
+
+# ✅ Fresh tokens with a matching permission version never touch the DB
+def test_claims_trusted_within_ttl_and_matching_version(monkeypatch):
+    client, statements = make_client()
+    assert get(client, "/whoami", token_for()).json() == {"id": 1, "email": "alice@example.com"}
+    assert statements == []
+
+    # ✅ A token minted by another worker or an earlier boot revalidates once
+    monkeypatch.setattr(core_auth, "_PROCESS_EPOCH", "otherpid")
+    token = token_for()
+    monkeypatch.undo()
+    core_auth._validated_users.clear()
+    assert get(client, "/whoami", token).status_code == 200
+    assert statements
+
+# ✅ Past AUTH_USER_CACHE_TTL neither the claims nor the LRU are trusted
+def test_claims_not_trusted_after_ttl(monkeypatch):
+    client, statements = make_client()
+    token = token_for()
+    monkeypatch.setattr(settings, "AUTH_USER_CACHE_TTL", 0)
+    assert get(client, "/whoami", token).status_code == 200
+    first = len(statements)
+    assert first > 0
+    assert get(client, "/whoami", token).status_code == 200
+    assert len(statements) > first
+
+# ✅ After invalidate_user the next request goes back to the DB
+def test_invalidate_user_forces_db_lookup():
+    client, statements = make_client()
+    token = token_for()
+    assert get(client, "/whoami", token).status_code == 200
+    assert statements == []
+
+    invalidate_user(1)
+    assert get(client, "/whoami", token).status_code == 200
+    assert statements
+    count = len(statements)
+    assert get(client, "/whoami", token).status_code == 200  # ✅ Revalidated user is cached again
+    assert len(statements) == count
+
+# ✅ Tokens issued before logout are rejected, also after a restart (revocation is stored on the user)
+def test_logout_revokes_earlier_tokens(monkeypatch):
+    client, _ = make_client()
+    token = token_for()
+    assert client.post("/auth/logout", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+    assert get(client, "/whoami", token).status_code == 401
+    assert get(client, "/auth/me", token).status_code == 401
+
+    # ✅ New process: empty in-memory state and a new permission version
+    core_auth._revoked_before.clear()
+    core_auth._validated_users.clear()
+    monkeypatch.setattr(core_auth, "_PROCESS_EPOCH", "restarted")
+    assert get(client, "/whoami", token).status_code == 401
+
+    time.sleep(0.01)
+    assert get(client, "/whoami", token_for()).status_code == 200
+
+# ✅ The validated-user LRU evicts the least recently used entry
+def test_validated_user_lru_evicts(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_USER_CACHE_SIZE", 2)
+    for user_id in (1, 2):
+        core_auth._remember_user(core_auth.AuthenticatedUser(user_id, f"u{user_id}@example.com", 2, "USER"))
+    assert core_auth._recently_validated(1)  # ✅ 1 is now the most recently used
+    core_auth._remember_user(core_auth.AuthenticatedUser(3, "u3@example.com", 2, "USER"))
+    assert core_auth._recently_validated(2) is None
+    assert core_auth._recently_validated(1) and core_auth._recently_validated(3)
+
+# ✅ Invalidation and revocation marks older than the token lifetime are pruned
+def test_expired_marks_are_pruned():
+    expired = time.time() - core_auth.ACCESS_TOKEN_EXPIRE_MINUTES * 60 - 1
+    core_auth._claims_not_before[7] = expired
+    core_auth._revoked_before[8] = expired
+    invalidate_user(1)
+    assert 7 not in core_auth._claims_not_before and 8 not in core_auth._revoked_before
+    assert 1 in core_auth._claims_not_before
@@ -0,0 +1,50 @@
+import asyncio
+import threading
+from datetime import datetime
+from app.core.broadcast import ThreatBroadcaster
+
+def row(severity, threat_type="Brute Force"):
+    return {"type": threat_type, "severity": severity, "source_ip": "10.0.0.1",
+            "is_alert": severity in ["Critical", "High"], "timestamp": datetime.utcnow()}
+
+def drain(queue):
+    messages = []
+    while not queue.empty():
+        messages.append(queue.get_nowait())
+    return messages
+
+# ✅ Threads publish through the loop; each client only gets threats matching its filters
+def test_publish_from_thread_respects_filters():
+    async def scenario():
+        broadcaster = ThreatBroadcaster(queue_size=10)
+        broadcaster.attach(asyncio.get_running_loop())
+        critical_only = broadcaster.subscribe({"Critical"}, set())
+        everything = broadcaster.subscribe()
+
+        publisher = threading.Thread(target=broadcaster.publish, args=([row("Critical"), row("Low")],))
+        publisher.start()
+        publisher.join()
+        await asyncio.sleep(0.05)
+        return drain(critical_only.queue), drain(everything.queue)
+
+    critical_only, everything = asyncio.run(scenario())
+    assert [m.split("\n")[0] for m in critical_only] == ["event: threat", "event: stats"]
+    assert '"severity": "Critical"' in critical_only[0]
+    assert len(everything) == 3
+    assert '"total_threats": 2' in everything[-1]
+
+# ✅ A slow client's queue stays bounded and drops its oldest messages
+def test_slow_client_is_bounded():
+    async def scenario():
+        broadcaster = ThreatBroadcaster(queue_size=5, max_clients=1)
+        broadcaster.attach(asyncio.get_running_loop())
+        slow = broadcaster.subscribe()
+        assert broadcaster.subscribe() is None  # max_clients reached
+        for _ in range(20):
+            broadcaster.publish([row("High")])
+        await asyncio.sleep(0.05)
+        return slow
+
+    slow = asyncio.run(scenario())
+    assert slow.queue.qsize() == 5
+    assert slow.dropped == 35
@@ -0,0 +1,69 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.core.feed_sync import FeedSync
+
+# ✅ Local stub feed server: /feed supports ETag, /slow hangs, /broken fails
+class StubFeedHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        StubFeedHandler.requests_seen.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/slow":
+            time.sleep(2)
+        if self.path == "/broken":
+            self.send_response(500)
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps([{"indicator": "203.0.113.7"}]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubFeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    StubFeedHandler.requests_seen = []
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+# ✅ Feeds are fetched concurrently; a slow feed times out without delaying the others
+def test_sync_is_concurrent_with_timeouts(stub_server, tmp_path):
+    sync = FeedSync([f"{stub_server}/feed", f"{stub_server}/slow", f"{stub_server}/broken"], str(tmp_path), timeout=0.5)
+    started = time.monotonic()
+    asyncio.run(sync.sync_once())
+    assert time.monotonic() - started < 1.5
+    assert sync.cached_threats() == [{"indicator": "203.0.113.7"}]
+    errors = {feed["url"].rsplit("/", 1)[1]: feed["error"] for feed in sync.status()}
+    assert errors["feed"] is None
+    assert "Timeout" in errors["slow"]
+    assert errors["broken"] == "HTTP 500"
+
+# ✅ Conditional requests reuse the cache, which survives a restart
+def test_etag_and_disk_cache(stub_server, tmp_path):
+    url = f"{stub_server}/feed"
+    sync = FeedSync([url], str(tmp_path))
+    asyncio.run(sync.sync_once())
+    asyncio.run(sync.sync_once())
+    assert StubFeedHandler.requests_seen == [("/feed", None), ("/feed", '"v1"')]
+    assert sync.cached_threats() == [{"indicator": "203.0.113.7"}]
+
+    restarted = FeedSync([url], str(tmp_path))
+    restarted.load_cache()
+    assert restarted.cached_threats() == [{"indicator": "203.0.113.7"}]
+    assert restarted.status()[0]["etag"] == '"v1"'
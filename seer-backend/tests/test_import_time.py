@@ -0,0 +1,37 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Budget for `import app.main` in a fresh interpreter (override with IMPORT_TIME_BUDGET_SECONDS)
+IMPORT_TIME_BUDGET_SECONDS = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", 2.5))
+
+# Loaded on first use only; importing the app must not pull them in
+LAZY_MODULES = ["numpy", "sklearn", "scipy", "joblib", "pandas", "tensorflow", "requests", "httpx"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [name for name in %r if name in sys.modules]}))
+""" % LAZY_MODULES
+
+def measure_import(tmp_path):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'import.db'}")
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    backend_dir = Path(__file__).resolve().parent.parent
+    subprocess.run([sys.executable, "-c", "import app.main"], cwd=backend_dir, env=env, check=True,
+                   capture_output=True)  # ✅ Warm the bytecode cache so only import work is timed
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=backend_dir, env=env, check=True,
+                            capture_output=True, text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+# ✅ ML and HTTP-client libraries stay out of app startup, within the time budget
+def test_app_import_is_lean_and_within_budget(tmp_path):
+    measured = measure_import(tmp_path)
+    assert measured["loaded"] == []
+    assert measured["seconds"] < IMPORT_TIME_BUDGET_SECONDS, (
+        f"import app.main took {measured['seconds']:.2f}s (budget {IMPORT_TIME_BUDGET_SECONDS}s)"
+    )
@@ -0,0 +1,47 @@
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.indicators import BloomFilter, IndicatorStore, extract_indicators
+from app.core.ingest import ThreatIngestor
+from app.models.threat_indicator import ThreatIndicator
+from app.models.threat_log import ThreatLog
+
+# ✅ Bloom filter never misses a member and keeps false positives near the target rate
+def test_bloom_filter_error_rate():
+    bloom = BloomFilter(10000, error_rate=0.01)
+    for i in range(10000):
+        bloom.add(f"10.{i // 256}.{i % 256}.1")
+    assert all(f"10.{i // 256}.{i % 256}.1" in bloom for i in range(10000))
+    false_positives = sum(f"172.16.{i // 256}.{i % 256}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+# ✅ Indicators are pulled out of nested feed payloads
+def test_extract_indicators():
+    payload = {"results": [{"indicators": [{"indicator": "203.0.113.7", "type": "IPv4"},
+                                           {"indicator": "evil.example", "type": "domain"}]}],
+               "ip": "198.51.100.1", "description": "not an ip"}
+    assert extract_indicators(payload) == {"203.0.113.7", "198.51.100.1"}
+    assert extract_indicators(["192.0.2.5", 42]) == {"192.0.2.5"}
+
+# ✅ Feed indicators are persisted, and ingested rows are flagged without a DB lookup
+def test_store_feeds_and_enrich_ingest():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    ThreatIndicator.__table__.create(engine)
+    ThreatLog.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+
+    store = IndicatorStore()
+    assert store.store_feeds(db, {"feed-a": ["203.0.113.7", "198.51.100.1"]}) == 2
+    assert store.store_feeds(db, {"feed-b": [{"ip": "203.0.113.7"}]}) == 1  # Upsert, no duplicate
+    assert db.query(ThreatIndicator).count() == 2
+    assert store.matches("203.0.113.7") and not store.matches("10.0.0.1")
+
+    ingestor = ThreatIngestor(engine)
+    ingestor.add_enricher(store.enrich)
+    ingestor.write_rows([
+        {"type": "Brute Force", "severity": "High", "source_ip": "203.0.113.7"},
+        {"type": "Brute Force", "severity": "High", "source_ip": "10.0.0.1"},
+    ])
+    with engine.connect() as conn:
+        flags = dict(conn.execute(select(ThreatLog.source_ip, ThreatLog.indicator_match)).all())
+    assert flags == {"203.0.113.7": True, "10.0.0.1": False}
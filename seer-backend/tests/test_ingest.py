@@ -0,0 +1,107 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+from app.core.ingest import ThreatIngestor, IngestBufferFull
+from app.models.threat_log import ThreatLog
+
+def make_engine(create_table=True):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    if create_table:
+        ThreatLog.__table__.create(engine)
+    return engine
+
+def count_rows(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(ThreatLog.__table__)).scalar()
+
+def event(i=0):
+    return {"type": "Port Scanning", "severity": "Low", "source_ip": f"10.0.0.{i % 255}", "is_alert": False}
+
+# ✅ Rows are buffered until flushed, then written in one batch
+def test_buffered_rows_are_flushed():
+    engine = make_engine()
+    ingestor = ThreatIngestor(engine, batch_size=100, flush_interval=60)
+    ingestor.submit_many([event(i) for i in range(10)])
+    assert count_rows(engine) == 0
+    assert ingestor.flush() == 10
+    assert count_rows(engine) == 10
+
+# ✅ Background thread flushes by size and stop() drains the rest
+def test_background_flush_and_stop():
+    engine = make_engine()
+    ingestor = ThreatIngestor(engine, batch_size=5, flush_interval=0.05)
+    ingestor.start()
+    ingestor.submit_many([event(i) for i in range(12)])
+    ingestor.stop()
+    assert count_rows(engine) == 12
+    assert ingestor.pending == 0
+
+# ✅ Full buffer applies backpressure and then rejects
+def test_backpressure_rejects_when_full():
+    ingestor = ThreatIngestor(make_engine(), batch_size=100, flush_interval=60, max_buffer=3)
+    ingestor.submit_many([event(i) for i in range(3)])
+    with pytest.raises(IngestBufferFull):
+        ingestor.submit(event(), timeout=0.01)
+    assert ingestor.stats["rejected"] == 1
+
+# ✅ Listeners receive accepted rows
+def test_listeners_receive_rows():
+    ingestor = ThreatIngestor(make_engine())
+    seen = []
+    ingestor.add_listener(seen.extend)
+    ingestor.write_rows([event(1), event(2)])
+    assert [row["source_ip"] for row in seen] == ["10.0.0.1", "10.0.0.2"]
+
+# ✅ Buffered rows reach listeners only once they are written
+def test_listeners_wait_for_flush():
+    ingestor = ThreatIngestor(make_engine(), batch_size=100, flush_interval=60)
+    seen = []
+    ingestor.add_listener(seen.extend)
+    ingestor.submit_many([event(1), event(2)])
+    assert seen == []
+    ingestor.flush()
+    assert len(seen) == 2
+
+# ✅ A row the database rejects is isolated and dead-lettered; the rest of the batch is stored
+def test_rejected_row_is_dead_lettered(tmp_path):
+    engine = make_engine()
+    dead_letter = tmp_path / "dead.jsonl"
+    ingestor = ThreatIngestor(engine, batch_size=100, flush_interval=60, dead_letter_path=str(dead_letter))
+    seen = []
+    ingestor.add_listener(seen.extend)
+    events = [event(i) for i in range(10)]
+    events[6]["type"] = None  # ✅ NOT NULL violation
+    ingestor.submit_many(events)
+    assert ingestor.flush() == 9
+    assert count_rows(engine) == 9
+    assert len(seen) == 9
+    assert ingestor.pending == 0
+    assert [json.loads(line)["source_ip"] for line in dead_letter.read_text().splitlines()] == ["10.0.0.6"]
+
+# ✅ A batch that keeps failing is retried max_retries times, then dead-lettered so the buffer drains
+def test_retry_limit_dead_letters_batch(tmp_path):
+    dead_letter = tmp_path / "dead.jsonl"
+    ingestor = ThreatIngestor(make_engine(create_table=False), batch_size=100, flush_interval=60,
+                              max_retries=1, dead_letter_path=str(dead_letter))
+    ingestor.submit_many([event(i) for i in range(3)])
+    assert ingestor.flush() == 0
+    assert ingestor.pending == 3
+    assert ingestor.flush() == 0
+    assert ingestor.pending == 0
+    assert len(dead_letter.read_text().splitlines()) == 3
+    assert ingestor.stats["dead_lettered"] == 3
+
+# ✅ Rows that cannot be written before shutdown are dead-lettered, not dropped
+def test_stop_dead_letters_unwritten_rows(tmp_path):
+    dead_letter = tmp_path / "dead.jsonl"
+    ingestor = ThreatIngestor(make_engine(create_table=False), batch_size=100, flush_interval=60,
+                              dead_letter_path=str(dead_letter))
+    seen = []
+    ingestor.add_listener(seen.extend)
+    ingestor.submit_many([event(i) for i in range(4)])
+    ingestor.stop()
+    assert ingestor.pending == 0
+    assert len(dead_letter.read_text().splitlines()) == 4
+    assert seen == []
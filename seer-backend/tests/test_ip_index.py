@@ -0,0 +1,55 @@
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.ip_index import PrefixTrie, SourceIPIndex
+from app.core.ipv4 import ip_to_int, cidr_to_range
+from app.models.threat_log import ThreatLog
+
+def row(ip, timestamp=None):
+    return {"type": "Port Scanning", "severity": "Low", "source_ip": ip, "timestamp": timestamp or datetime.utcnow()}
+
+# ✅ IPv4 parsing and CIDR bounds
+def test_ipv4_helpers():
+    assert ip_to_int("10.0.0.1") == 167772161
+    assert ip_to_int("::1") is None
+    assert ip_to_int("not-an-ip") is None
+    assert cidr_to_range("10.1.2.3/8") == (167772160, 184549375, 8)
+    with pytest.raises(ValueError):
+        cidr_to_range("2001:db8::/32")
+
+# ✅ Trie counts and top-N prefixes match a brute-force count
+def test_trie_matches_brute_force():
+    rng = random.Random(7)
+    ips = [rng.choice([0x0A000000, 0xC0A80000, 0x08080800]) | rng.randrange(0, 1 << 12) for _ in range(2000)]
+    trie = PrefixTrie()
+    for ip in ips:
+        trie.add(ip)
+    per_24 = Counter(ip >> 8 << 8 for ip in ips)
+    assert trie.count(0x0A000000, 8) == sum(1 for ip in ips if ip >> 24 == 0x0A)
+    assert [count for _, count in trie.top_prefixes(24, 5)] == [count for _, count in per_24.most_common(5)]
+    for ip in ips[:500]:
+        trie.remove(ip)
+    assert trie.total == 1500
+
+# ✅ Index serves CIDR counts and top networks, and reloads from the database
+def test_source_index_record_and_reload():
+    index = SourceIPIndex(window_hours=24)
+    index.record([row("10.0.0.1"), row("10.0.0.1"), row("10.0.1.9"), row("192.168.1.1"), row("::1")])
+    index.record([row("10.0.0.2", datetime.utcnow() - timedelta(days=2))])  # Outside the window
+    assert index.count("10.0.0.0/8") == 3
+    assert index.count("10.0.0.1") == 2
+    assert index.top_prefixes(24, 2) == [{"prefix": "10.0.0.0/24", "count": 2}, {"prefix": "10.0.1.0/24", "count": 1}]
+    assert index.top_prefixes(32, 1, cidr="192.168.0.0/16") == [{"prefix": "192.168.1.1", "count": 1}]
+
+    engine = create_engine("sqlite://")
+    ThreatLog.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([ThreatLog(**row("172.16.0.5")), ThreatLog(**row("172.16.0.6"))])
+    db.commit()
+    assert db.query(ThreatLog.source_ip_num).first()[0] == ip_to_int("172.16.0.5")
+    index.reload(db)
+    assert index.count("0.0.0.0/0") == 2
+    assert index.top_prefixes(16, 1) == [{"prefix": "172.16.0.0/16", "count": 2}]
@@ -0,0 +1,84 @@
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core import auth as core_auth
+from app.core.worker_pool import BoundedExecutor
+from app.database.database import Base, get_db
+from app.models.user import Role, User
+from app.routes import auth
+
+CREDENTIALS = {"email": "alice@example.com", "password": "s3cret"}
+
+def make_client(monkeypatch, stored_rounds):
+    # ✅ Configured cost is 5; the stored hash may use another one
+    monkeypatch.setattr(core_auth, "pwd_context", CryptContext(
+        schemes=["bcrypt"], bcrypt__default_rounds=5, bcrypt__min_rounds=5, bcrypt__max_rounds=5))
+    stored_hash = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=stored_rounds).hash(CREDENTIALS["password"])
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    db.add_all([Role(name="ADMIN"), Role(name="USER")])
+    db.commit()
+    db.add(User(username="alice", email=CREDENTIALS["email"], hashed_password=stored_hash, role_id=2))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(auth.router)
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app), Session
+
+def stored_hash(Session):
+    db = Session()
+    try:
+        return db.query(User.hashed_password).filter(User.email == CREDENTIALS["email"]).scalar()
+    finally:
+        db.close()
+
+# ✅ A hash made with another cost is rewritten with the configured cost on a successful login
+def test_login_rehashes_outdated_cost(monkeypatch):
+    client, Session = make_client(monkeypatch, stored_rounds=4)
+    assert stored_hash(Session).startswith("$2b$04$")
+
+    assert client.post("/auth/login", json=dict(CREDENTIALS, password="wrong")).status_code == 401
+    assert stored_hash(Session).startswith("$2b$04$")  # ✅ Never rehashed on a failed login
+
+    assert client.post("/auth/login", json=CREDENTIALS).status_code == 200
+    rehashed = stored_hash(Session)
+    assert rehashed.startswith("$2b$05$")
+    assert core_auth.verify_password(CREDENTIALS["password"], rehashed)
+
+    assert client.post("/auth/login", json=CREDENTIALS).status_code == 200
+    assert stored_hash(Session) == rehashed  # ✅ Current-cost hashes are left alone
+
+# ✅ A saturated bcrypt pool turns logins away with 429 and Retry-After
+def test_login_returns_429_when_pool_is_full(monkeypatch):
+    client, _ = make_client(monkeypatch, stored_rounds=5)
+    pool = BoundedExecutor(max_workers=1, max_queue=0, name="bcrypt-test")
+    monkeypatch.setattr(core_auth, "password_executor", pool)
+    release = threading.Event()
+    busy = pool.submit(release.wait)
+
+    response = client.post("/auth/login", json=CREDENTIALS)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert pool.rejected == 1
+
+    release.set()
+    busy.result()
+    assert client.post("/auth/login", json=CREDENTIALS).status_code == 200
+    pool.shutdown()
@@ -0,0 +1,45 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from app.core.metrics import (
+    MetricsMiddleware, MetricsRegistry, http_latency, instrument_engine, registry, request_statements,
+)
+
+# ✅ Histograms render cumulative buckets, sum and count
+def test_histogram_exposition():
+    metrics = MetricsRegistry()
+    latency = metrics.histogram("demo_seconds", "Demo latency.", ["route"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, "/a")
+    output = metrics.render()
+    assert '# TYPE demo_seconds histogram' in output
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in output
+    assert 'demo_seconds_bucket{route="/a",le="1"} 2' in output
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in output
+    assert 'demo_seconds_count{route="/a"} 3' in output
+
+# ✅ Requests are labelled by route template and carry their SQL statement count
+def test_middleware_records_route_and_statements():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    instrument_engine(engine)
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    client = TestClient(app)
+    before = request_statements.count("GET", "/items/{item_id}")
+    client.get("/items/1")
+    client.get("/items/2")
+    assert http_latency.count("GET", "/items/{item_id}") >= 2
+    assert request_statements.count("GET", "/items/{item_id}") == before + 2
+    assert 'seer_http_requests_total{method="GET",route="/items/{item_id}",status="200"}' in registry.render()
+    sums = [line for line in registry.render().splitlines()
+            if line.startswith('seer_http_request_db_statements_sum{method="GET",route="/items/{item_id}"}')]
+    assert sums and float(sums[0].split()[-1]) >= 6
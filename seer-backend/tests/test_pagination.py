@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.config.settings import settings
+from app.core.ingest import ThreatIngestor
+from app.core.pagination import decode_cursor, encode_cursor
+from app.database.database import get_db
+from app.models.threat_log import ThreatLog
+from app.routes import threats
+
+NOW = datetime.utcnow().replace(microsecond=0)
+
+def make_client(monkeypatch, rows):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    ThreatLog.__table__.create(engine)
+    ThreatIngestor(engine).write_rows(rows)
+    Session = sessionmaker(bind=engine)
+    monkeypatch.setattr(threats, "SessionLocal", Session)  # ✅ The export stream opens its own session
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(threats.router)
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app), engine
+
+def all_rows(engine):
+    with engine.connect() as conn:
+        return conn.execute(ThreatLog.__table__.select()).mappings().all()
+
+def tied_rows(count=25):
+    # ✅ Groups of five share a timestamp, so pages must break ties on id
+    return [
+        {"type": "Port Scanning", "severity": "Low", "source_ip": f"10.0.0.{i}", "is_alert": False,
+         "timestamp": NOW - timedelta(minutes=i // 5)}
+        for i in range(count)
+    ]
+
+# ✅ Cursors round-trip, and malformed ones are a 400
+def test_cursor_round_trip_and_malformed(monkeypatch):
+    position = (datetime(2026, 10, 18, 12, 30, 5, 123456), 42)
+    assert decode_cursor(encode_cursor(*position)) == position
+
+    client, _ = make_client(monkeypatch, tied_rows(3))
+    for cursor in ("not-a-cursor", encode_cursor(NOW, 1)[:-3], "fHx8"):
+        assert client.get("/threats/logs", params={"cursor": cursor}).status_code == 400
+
+# ✅ Paging through tied timestamps returns every row exactly once; the last page has no cursor
+@pytest.mark.parametrize("fast_path", [True, False])
+def test_keyset_pages_cover_tied_timestamps(monkeypatch, fast_path):
+    monkeypatch.setattr(settings, "JSON_FAST_PATH", fast_path)
+    client, engine = make_client(monkeypatch, tied_rows(25))
+    expected = [row["id"] for row in sorted(all_rows(engine), key=lambda row: (row["timestamp"], row["id"]), reverse=True)]
+
+    seen, params = [], {"limit": 4}
+    while True:
+        response = client.get("/threats/logs", params=params)
+        assert response.status_code == 200
+        seen.extend(row["id"] for row in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"limit": 4, "cursor": cursor}
+
+    assert seen == expected
+    assert len(response.json()) == 1  # ✅ 25 rows in pages of 4: the short last page carries no cursor
+
+def export_rows():
+    rows = []
+    for i in range(12):
+        rows.append({
+            "type": "Brute Force",
+            "severity": "High" if i % 2 else "Low",
+            "source_ip": f"10.1.0.{i}" if i % 3 else f"192.168.0.{i}",
+            "is_alert": bool(i % 2),
+            "timestamp": NOW - timedelta(hours=30 if i >= 9 else i),
+        })
+    return rows
+
+# ✅ CSV and NDJSON exports apply the cidr, severity and time_range filters
+def test_export_formats_with_filters(monkeypatch):
+    client, engine = make_client(monkeypatch, export_rows())
+    expected = sorted(
+        (row for row in all_rows(engine)
+         if row["source_ip"].startswith("10.") and row["severity"] == "High" and row["timestamp"] >= NOW - timedelta(hours=24)),
+        key=lambda row: (row["timestamp"], row["id"]), reverse=True,
+    )
+    assert [row["source_ip"] for row in expected] == ["10.1.0.1", "10.1.0.5", "10.1.0.7"]
+    params = {"cidr": "10.0.0.0/8", "severity": "High", "time_range": 24}
+
+    response = client.get("/threats/logs/export", params=dict(params, format="ndjson"))
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [
+        {"id": row["id"], "type": row["type"], "severity": row["severity"], "source_ip": row["source_ip"],
+         "is_alert": row["is_alert"], "timestamp": row["timestamp"].isoformat()}
+        for row in expected
+    ]
+
+    response = client.get("/threats/logs/export", params=dict(params, format="csv"))
+    assert response.headers["content-type"].startswith("text/csv")
+    records = list(csv.reader(io.StringIO(response.text)))
+    assert records[0] == threats.EXPORT_COLUMNS
+    assert records[1:] == [
+        [str(row["id"]), row["type"], row["severity"], row["source_ip"], str(row["is_alert"]), row["timestamp"].isoformat()]
+        for row in expected
+    ]
+
+    assert client.get("/threats/logs/export", params={"cidr": "10.0.0.0/33"}).status_code == 400
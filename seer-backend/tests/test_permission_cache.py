@@ -0,0 +1,45 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.database.database import Base
+from app.models.user import Role, Permission
+from app.core.permission_cache import PermissionCache
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Role.__table__, Permission.__table__, Role.permissions.property.secondary])
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    db = sessionmaker(bind=engine)()
+    role = Role(name="ADMIN", permissions=[Permission(name="MANAGE_USERS"), Permission(name="MANAGE_ROLES")])
+    db.add(role)
+    db.commit()
+    db.refresh(role)
+    statements.clear()
+    return db, role, statements
+
+# ✅ Second lookup is served from memory
+def test_cache_hit_skips_database():
+    db, role, statements = make_session()
+    cache = PermissionCache(ttl=60)
+    assert cache.get(db, role.id).permissions == {"MANAGE_USERS", "MANAGE_ROLES"}
+    queries = len(statements)
+    assert queries == 1
+    assert "MANAGE_USERS" in cache.get(db, role.id).permissions
+    assert len(statements) == queries
+
+# ✅ Invalidation reloads the role's permissions
+def test_invalidate_reloads_permissions():
+    db, role, statements = make_session()
+    cache = PermissionCache(ttl=60)
+    cache.get(db, role.id)
+    role.permissions.append(Permission(name="MANAGE_PERMISSIONS"))
+    db.commit()
+    version = cache.version
+    cache.invalidate(role.id)
+    assert cache.version == version + 1
+    assert "MANAGE_PERMISSIONS" in cache.get(db, role.id).permissions
+
+# ✅ Unknown roles are reported as missing
+def test_missing_role_returns_none():
+    db, _, _ = make_session()
+    assert PermissionCache().get(db, 999) is None
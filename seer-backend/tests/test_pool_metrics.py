@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.database.pool_metrics import InstrumentedQueuePool, pool_metrics, pool_status
+from app.routes import metrics
+
+# ✅ An exhausted pool records checkouts, the wait for a released connection and the timeout
+def test_exhausted_pool_reports_timeouts_and_waits(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool,
+        pool_size=2, max_overflow=0, pool_timeout=0.2,
+    )
+    before = pool_metrics.snapshot()
+    held = [engine.connect(), engine.connect()]
+
+    status = pool_status(engine.pool)
+    assert status["pool_class"] == "InstrumentedQueuePool"
+    assert status["pool_size"] == 2 and status["checked_out"] == 2 and status["checked_in"] == 0
+
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+
+    # ✅ A checkout that waits for another thread to give a connection back
+    threading.Timer(0.1, held.pop().close).start()
+    held.append(engine.connect())
+
+    after = pool_status(engine.pool)
+    assert after["checkouts"] - before["checkouts"] == 3
+    assert after["checkout_timeouts"] - before["checkout_timeouts"] == 1
+    waited = after["checkout_wait_seconds_total"] - before["checkout_wait_seconds_total"]
+    assert waited >= 0.2 + 0.1
+    assert after["checkout_wait_seconds_max"] >= 0.2
+    attempts = after["checkouts"] + after["checkout_timeouts"]
+    assert after["checkout_wait_seconds_avg"] == pytest.approx(after["checkout_wait_seconds_total"] / attempts)
+
+    # ✅ GET /metrics/db-pool serves the same numbers
+    monkeypatch.setattr(metrics, "engine", engine)
+    app = FastAPI()
+    app.include_router(metrics.router)
+    assert TestClient(app).get("/metrics/db-pool").json() == pool_status(engine.pool)
+
+    for connection in held:
+        connection.close()
+    engine.dispose()
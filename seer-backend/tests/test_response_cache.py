@@ -0,0 +1,46 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.core.response_cache import MemoryCacheBackend, ResponseCache
+
+def make_app(cache, calls):
+    app = FastAPI()
+
+    @app.get("/roles")
+    def roles(request: Request):
+        def load():
+            calls.append(1)
+            return [{"id": 1, "name": "ADMIN"}, {"id": len(calls), "name": "USER"}]
+        return cache.respond(request, "rbac", load)
+
+    return TestClient(app)
+
+# ✅ LRU evicts the least recently used entry and honours TTLs; counters are never evicted
+def test_memory_backend_lru_and_ttl():
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.incr("cache-version:rbac")
+    backend.set("a", b"1")
+    backend.set("b", b"2")
+    backend.get("a")
+    backend.set("c", b"3")
+    assert backend.get("b") is None and backend.get("a") == b"1"
+    backend.set("short", b"x", ttl=0.000001)
+    assert backend.get("short") is None
+    assert backend.get("cache-version:rbac") == b"1"
+
+# ✅ Hits skip the producer, ETags give 304s, invalidation recomputes
+def test_read_through_etag_and_invalidation():
+    cache, calls = ResponseCache(MemoryCacheBackend()), []
+    client = make_app(cache, calls)
+
+    first = client.get("/roles")
+    assert first.status_code == 200 and len(calls) == 1
+    etag = first.headers["etag"]
+    assert client.get("/roles").json() == first.json() and len(calls) == 1
+
+    not_modified = client.get("/roles", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+
+    cache.invalidate("rbac")
+    changed = client.get("/roles", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and len(calls) == 2
+    assert changed.headers["etag"] != etag
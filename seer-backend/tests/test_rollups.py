@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from app.core.rollups import ThreatRollupAggregator, floor_time, pick_resolution
+from app.models.threat_log import ThreatLog
+from app.models.threat_rollup import ThreatRollup
+
+def row(severity, timestamp, threat_type="Brute Force", source_ip="10.0.0.1"):
+    return {"type": threat_type, "severity": severity, "source_ip": source_ip, "timestamp": timestamp}
+
+def make_aggregator():
+    engine = create_engine("sqlite://")
+    ThreatLog.__table__.create(engine)
+    ThreatRollup.__table__.create(engine)
+    return ThreatRollupAggregator(engine), sessionmaker(bind=engine)()
+
+# ✅ Buckets align to the epoch and the resolution fits the requested points
+def test_floor_time_and_pick_resolution():
+    assert floor_time(datetime(2026, 1, 1, 10, 37, 42), 3600) == datetime(2026, 1, 1, 10)
+    assert pick_resolution(3600, 200) == "minute"
+    assert pick_resolution(24 * 3600, 200) == "hour"
+    assert pick_resolution(365 * 86400, 200) == "day"
+
+# ✅ Repeated flushes add to existing buckets (upsert) instead of duplicating them
+def test_flush_upserts_counts():
+    rollups, db = make_aggregator()
+    now = datetime.utcnow()
+    rollups.record([row("High", now), row("High", now)])
+    rollups.flush()
+    rollups.record([row("High", now), row("Low", now, "Port Scanning")])
+    rollups.flush()
+    minute_high = db.query(ThreatRollup.count).filter(
+        ThreatRollup.resolution == "minute", ThreatRollup.dimension == "severity", ThreatRollup.value == "High"
+    ).scalar()
+    assert minute_high == 3
+    assert db.query(func.count(ThreatRollup.id)).filter(ThreatRollup.resolution == "day").scalar() == 5
+
+# ✅ Series merge flushed and pending deltas and downsample to the requested points
+def test_series_downsamples_and_includes_pending():
+    rollups, db = make_aggregator()
+    end = datetime.utcnow()
+    rollups.record([row("Critical", end - timedelta(minutes=minutes)) for minutes in range(0, 120, 2)])
+    rollups.flush()
+    rollups.record([row("Critical", end)])  # Not flushed yet
+
+    series = rollups.series(db, "severity", end - timedelta(hours=2), end, max_points=12, resolution="minute")
+    assert series["step_seconds"] == 600
+    assert len(series["buckets"]) <= 13
+    assert sum(series["series"]["Critical"]) == 61
+
+    by_type = rollups.series(db, "type", end - timedelta(hours=2), end, max_points=200)
+    assert by_type["resolution"] == "minute"
+    assert list(by_type["series"]) == ["Brute Force"]
+
+# ✅ Backfill rebuilds rollups from raw threat logs
+def test_backfill_from_threat_logs():
+    rollups, db = make_aggregator()
+    now = datetime.utcnow()
+    db.add_all([ThreatLog(is_alert=True, **row("High", now - timedelta(hours=hours))) for hours in range(3)])
+    db.commit()
+    assert rollups.backfill(db, now - timedelta(days=1)) == 3
+    series = rollups.series(db, "source", now - timedelta(hours=4), now, resolution="hour")
+    assert sum(series["series"]["10.0.0.1"]) == 3
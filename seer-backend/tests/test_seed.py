@@ -0,0 +1,35 @@
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database.database import Base
+from app.database.seed import seed_role_permissions, seed_roles
+from app.models.user import Permission, Role, role_permissions
+
+def make_session():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return sessionmaker(bind=engine)(), statements
+
+def count(db, table):
+    return db.execute(select(func.count()).select_from(table)).scalar()
+
+# ✅ Role seeding is one idempotent INSERT and keeps ADMIN=1 / USER=2
+def test_seed_roles_is_idempotent():
+    db, statements = make_session()
+    seed_roles(db)
+    seed_roles(db)
+    assert len([sql for sql in statements if sql.startswith("INSERT")]) == 2
+    assert [(role.id, role.name.name) for role in db.query(Role).order_by(Role.id)] == [(1, "ADMIN"), (2, "USER")]
+
+# ✅ Statement count does not grow with the number of permissions, and re-runs add nothing
+def test_seed_role_permissions_is_set_based():
+    db, statements = make_session()
+    mapping = {"ADMIN": [f"PERMISSION_{i}" for i in range(40)], "USER": ["PERMISSION_0", "VIEW_CONTENT"]}
+    assert seed_role_permissions(db, mapping) == 42
+    db.commit()
+    assert len(statements) == 5
+    assert seed_role_permissions(db, mapping) == 0
+    db.commit()
+    assert (count(db, Permission.__table__), count(db, Role.__table__), count(db, role_permissions)) == (41, 2, 42)
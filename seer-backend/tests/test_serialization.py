@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import List
+from pydantic import TypeAdapter
+from app.core import serialization
+from app.core.serialization import dumps, rows_response
+from app.models.user import UserRole
+from app.routes.threats import THREAT_LOG_COLUMNS
+from app.schemas.threat import ThreatLogSchema
+
+ROW = (7, "DDoS Attack", "Critical", "10.0.0.1", True, datetime(2024, 5, 1, 12, 30, 15, 123456), False)
+
+# ✅ The row-tuple path emits the same JSON as ThreatLogSchema
+def test_rows_response_matches_schema_output():
+    adapter = TypeAdapter(List[ThreatLogSchema])
+    expected = adapter.dump_json(adapter.validate_python([dict(zip(THREAT_LOG_COLUMNS, ROW))]))
+    assert rows_response(THREAT_LOG_COLUMNS, [ROW]).body == expected
+
+# ✅ Without orjson the stdlib encoder produces the same bytes
+def test_stdlib_fallback(monkeypatch):
+    content = {"when": ROW[5], "role": UserRole.ADMIN, "count": 3}
+    fast = dumps(content)
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert dumps(content) == fast == b'{"when":"2024-05-01T12:30:15.123456","role":"admin","count":3}'
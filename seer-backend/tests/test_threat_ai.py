@@ -0,0 +1,57 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.threat_ai import ThreatModelRegistry, extract_features, score_threat, score_threats
+from app.routes import threat_intelligence
+
+# ✅ Model is trained once and reused across calls
+def test_registry_trains_once(tmp_path):
+    registry = ThreatModelRegistry(str(tmp_path / "model.joblib"))
+    model, version = registry.get()
+    again, same_version = registry.get()
+    assert model is again
+    assert version == same_version
+    assert (tmp_path / "model.joblib").exists()
+
+# ✅ Persisted model is loaded instead of retrained
+def test_registry_loads_persisted_model(tmp_path):
+    path = str(tmp_path / "model.joblib")
+    _, version = ThreatModelRegistry(path).get()
+    assert ThreatModelRegistry(path).load() == version
+
+# ✅ Hot-swap replaces the active model and version
+def test_registry_swap(tmp_path):
+    registry = ThreatModelRegistry(str(tmp_path / "model.joblib"))
+    old_model, old_version = registry.get()
+    new_version = registry.retrain()
+    model, version = registry.get()
+    assert version == new_version != old_version
+    assert model is not old_model
+
+# ✅ Batch scoring matches single-event scoring
+def test_score_threats_batch_matches_single():
+    ips = ["10.0.0.1", "192.168.1.20", "8.8.8.8"]
+    descriptions = ["Port scan", "Multiple failed SSH logins", "x" * 250]
+    scores, version = score_threats(ips, descriptions)
+    assert len(scores) == 3
+    assert all(0 <= score <= 100 for score in scores)
+    assert [score_threat(ip, d) for ip, d in zip(ips, descriptions)] == [(s, version) for s in scores]
+
+# ✅ Each address is validated on its own, so features can never shift onto the wrong IP
+@pytest.mark.parametrize("ips", [["1.2.3", "4.5.6.7.8"], ["nan.1e9.-5.300"], ["10.0.0.1", "::1"], ["256.0.0.1"]])
+def test_extract_features_rejects_invalid_addresses(ips):
+    with pytest.raises(ValueError):
+        extract_features(ips, ["x"] * len(ips))
+
+# ✅ Bad addresses are client errors on both the single and the bulk route
+def test_log_routes_reject_invalid_addresses():
+    app = FastAPI()
+    app.include_router(threat_intelligence.router)
+    client = TestClient(app)
+    response = client.post("/threats/log", params={"ip_address": "1.2.3", "description": "Port scan"})
+    assert response.status_code == 400
+    response = client.post("/threats/log/bulk", json=[
+        {"ip_address": "1.2.3", "description": "Port scan"},
+        {"ip_address": "4.5.6.7.8", "description": "Port scan"},
+    ])
+    assert response.status_code == 422
@@ -0,0 +1,42 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy import create_engine, inspect, insert, select, func
+from app.database.database import Base
+from app.models.threat_log import ThreatLog
+from app.scripts.threat_log_partitions import (
+    add_months, months_between, partition_bounds, partition_name, delete_expired_rows, maintain
+)
+
+
+# ✅ Monthly partition bounds roll over the year
+def test_partition_bounds_and_names():
+    assert partition_bounds(date(2025, 12, 17)) == (date(2025, 12, 1), date(2026, 1, 1))
+    assert partition_name(date(2026, 3, 1)) == "threat_logs_2026_03"
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert months_between(date(2025, 11, 20), date(2026, 1, 5)) == [
+        date(2025, 11, 1), date(2025, 12, 1), date(2026, 1, 1)
+    ]
+
+
+# ✅ Model declares the composite and partial indexes
+def test_threat_log_indexes_created():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[ThreatLog.__table__])
+    names = {index["name"] for index in inspect(engine).get_indexes("threat_logs")}
+    assert {"ix_threat_logs_timestamp_severity", "ix_threat_logs_type_timestamp",
+            "ix_threat_logs_timestamp_id", "ix_threat_logs_active_alerts"} <= names
+
+
+# ✅ Unpartitioned tables fall back to batched deletes
+def test_maintain_deletes_expired_rows_without_partitions():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[ThreatLog.__table__])
+    now = datetime.utcnow()
+    rows = [
+        {"type": "DDoS", "severity": "High", "source_ip": "10.0.0.1", "timestamp": now - timedelta(days=days)}
+        for days in (1, 2, 100, 200, 300)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(ThreatLog.__table__), rows)
+        assert delete_expired_rows(conn, retention_days=90, batch_size=2) == 3
+        maintain(conn, retention_days=90, months_ahead=2)
+        assert conn.execute(select(func.count()).select_from(ThreatLog.__table__)).scalar() == 2
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+from app.core.threat_monitor import SlidingWindowCounter, SlidingWindowDetector
+
+def critical(timestamp=None):
+    return {"severity": "Critical", "type": "DDoS Attack", "timestamp": timestamp or datetime.utcnow()}
+
+# ✅ Events fall out of the window as time advances
+def test_counter_expires_old_buckets():
+    counter = SlidingWindowCounter(window_seconds=10)
+    counter.add(100, now=100)
+    counter.add(105, count=2, now=105)
+    assert counter.total(now=105) == 3
+    assert counter.total(now=110) == 2
+    assert counter.total(now=115) == 0
+    counter.add(90, now=115)  # Too old to count
+    assert counter.total(now=115) == 0
+
+# ✅ Alert fires on the event that crosses the threshold, once
+def test_detector_fires_on_threshold():
+    alerts = []
+    detector = SlidingWindowDetector({"Critical": 3}, window_seconds=60)
+    detector.add_handler(alerts.append)
+    detector.observe([critical(), critical()])
+    assert alerts == []
+    detector.observe([critical()])
+    assert [alert["count"] for alert in alerts] == [3]
+    detector.observe([critical()])
+    assert len(alerts) == 1
+
+# ✅ Events older than the window are ignored
+def test_detector_ignores_stale_events():
+    alerts = []
+    detector = SlidingWindowDetector({"Critical": 1}, window_seconds=60)
+    detector.add_handler(alerts.append)
+    detector.observe([critical(datetime.utcnow() - timedelta(minutes=5))])
+    assert alerts == []
+    assert detector.counts() == {"Critical": 0}
+
+# ✅ Alert re-arms after the window drains
+def test_detector_rearms_after_window_drains():
+    alerts = []
+    detector = SlidingWindowDetector({"Critical": 2}, window_seconds=60)
+    detector.add_handler(alerts.append)
+    start = 1_700_000_000
+    at = lambda second: critical(datetime.utcfromtimestamp(second))
+
+    detector.observe([at(start), at(start)], now=start)
+    assert len(alerts) == 1
+    detector.observe([at(start + 30)], now=start + 30)
+    assert len(alerts) == 1  # ✅ Still above the threshold: no repeat alert
+
+    assert detector.check(now=start + 59) == []
+    assert detector.counts(now=start + 60) == {"Critical": 1}
+    assert detector.check(now=start + 90) == []  # ✅ Window drained: re-armed
+    assert detector.counts(now=start + 90) == {"Critical": 0}
+
+    detector.observe([at(start + 95), at(start + 96)], now=start + 96)
+    assert [alert["count"] for alert in alerts] == [2, 2]
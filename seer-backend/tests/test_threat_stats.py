@@ -0,0 +1,39 @@
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.threat_stats import ThreatStatsCounters
+from app.models.threat_log import ThreatLog
+
+def row(severity, threat_type="Brute Force", is_alert=True):
+    return {"type": threat_type, "severity": severity, "source_ip": "10.0.0.1",
+            "is_alert": is_alert, "timestamp": datetime.utcnow()}
+
+# ✅ Ingest and resolve keep the counters current without queries
+def test_record_and_resolve():
+    stats = ThreatStatsCounters()
+    stats.record([row("High"), row("High"), row("Low", "Port Scanning", is_alert=False)])
+    stats.resolve(was_alert=True)
+    snapshot = stats.snapshot()
+    assert snapshot["total_threats"] == 3
+    assert snapshot["active_alerts"] == 1
+    assert snapshot["severity_distribution"] == {"High": 2, "Low": 1}
+    assert snapshot["type_distribution"] == {"Brute Force": 2, "Port Scanning": 1}
+    assert sum(snapshot["hourly_counts"].values()) == 3
+
+# ✅ Reconcile replaces drifted counters with the database totals
+def test_reconcile_matches_database():
+    engine = create_engine("sqlite://")
+    ThreatLog.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([ThreatLog(**row("Critical")), ThreatLog(**row("Medium", is_alert=False))])
+    db.commit()
+
+    stats = ThreatStatsCounters()
+    stats.record([row("High")] * 5)
+    stats.reconcile(db)
+    snapshot = stats.snapshot()
+    assert stats.ready
+    assert snapshot["total_threats"] == 2
+    assert snapshot["active_alerts"] == 1
+    assert snapshot["severity_distribution"] == {"Critical": 1, "Medium": 1}
+    assert sum(snapshot["hourly_counts"].values()) == 2
@@ -0,0 +1,44 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database.database import Base
+from app.models.user import Role, User
+from app.routes import admin, iam
+from app.schemas.user import AdminUserSchema, IAMUserSchema
+
+def make_session(user_count=50):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([Role(name="ADMIN"), Role(name="USER")])
+    db.commit()
+    db.add_all([
+        User(username=f"user{i}", email=f"user{i}@example.com", hashed_password="x", role_id=1 if i % 10 == 0 else 2)
+        for i in range(user_count)
+    ])
+    db.commit()
+    db.expunge_all()  # ✅ Nothing cached in the identity map, so lazy loads would show up as queries
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return db, statements
+
+# ✅ IAM listing is a single joined query, independent of the number of users
+def test_iam_user_listing_uses_one_query():
+    db, statements = make_session()
+    users = iam.get_all_users(db=db)
+    assert len(statements) == 1
+    assert len(users) == 50
+    assert IAMUserSchema(**users[0]).role == "admin"
+
+# ✅ Admin listing is one query (filtered or not) and never exposes password hashes
+def test_admin_user_listing_is_projected():
+    db, statements = make_session()
+    users = admin.get_all_users(db=db, role=None)
+    assert len(statements) == 1
+    assert len(users) == 50
+    assert "hashed_password" not in users[0]
+    assert AdminUserSchema(**users[0]).role.name == "admin"
+
+    admins = admin.get_all_users(db=db, role="admin")
+    assert len(statements) == 2
+    assert {user["role"]["id"] for user in admins} == {1} and len(admins) == 5
@@ -0,0 +1,18 @@
+import threading
+import pytest
+from app.core.worker_pool import BoundedExecutor, PoolSaturated
+
+# ✅ Jobs beyond workers + queue are rejected immediately
+def test_rejects_when_saturated():
+    release = threading.Event()
+    pool = BoundedExecutor(max_workers=1, max_queue=1, name="test")
+    running = [pool.submit(release.wait), pool.submit(release.wait)]
+    with pytest.raises(PoolSaturated):
+        pool.submit(release.wait)
+    assert pool.rejected == 1
+    release.set()
+    for future in running:
+        future.result()
+    assert pool.in_flight == 0
+    assert pool.run(lambda: 42) == 42
+    pool.shutdown()